@@ -4,6 +4,8 @@ import json
 
 from raya.enumerations import ANG_UNIT
 
+from common.arm_checks import ArmValidator
+
 
 class bcolors:
     HEADER = "\033[95m"
@@ -70,7 +72,8 @@ option is true the program just print the list of avaliable arms",
             required=False,
             help='Define the pose that you want to check, the format should be a \
 json like this {"x":0.38661,"y":0.25621,"z":1.18,"r":0,"p":-90,"yaw":0} where xyz are the position\
-and rp,yaw are the orientation value in euler angles representation',
+and rp,yaw are the orientation value in euler angles representation, or a json \
+list of poses like this to check all of them at once',
             default='{"x":0.38661,"y":0.25621,"z":1.18,"r":0,"p":-90,"yaw":0}',
         )
         parser.add_argument(
@@ -85,7 +88,9 @@ and rp,yaw are the orientation value in euler angles representation',
             args = parser.parse_args()
             self.arm_name = args.arm_name
             self.list_arms = args.list_arms
-            self.pose = json.loads(args.pose)
+            self.poses = json.loads(args.pose)
+            if isinstance(self.poses, dict):
+                self.poses = [self.poses]
             self.rad_deg = args.rad_deg
         except:
             self.list_arms = True
@@ -98,36 +103,43 @@ and rp,yaw are the orientation value in euler angles representation',
 
     def check_values(self):
         keys = ["x", "y", "z", "r", "p", "yaw"]
-        for k in self.pose.keys():
-            if not k in keys:
-                raise ValueError(f"invalid key of the json {k}")
+        for pose in self.poses:
+            for k in pose.keys():
+                if not k in keys:
+                    raise ValueError(f"invalid key of the json {k}")
 
-        for k in keys:
-            if not k in self.pose.keys():
-                raise ValueError(f"the key {k} of the json is missing")
+            for k in keys:
+                if not k in pose.keys():
+                    raise ValueError(f"the key {k} of the json is missing")
 
     async def execute_validation(self):
-        print(f"\nPose to validate for the arm {self.arm_name}")
-        print("key\tvalue")
-        for key in self.pose:
-            print(f"{key}\t{self.pose[key]}")
-
         units = ANG_UNIT.DEG
         if self.rad_deg:
             units = ANG_UNIT.RAD
 
-        await self.arms.is_pose_valid(
-            self.arm_name,
-            x = self.pose["x"],
-            y = self.pose["y"],
-            z = self.pose["z"],
-            roll = self.pose["r"],
-            pitch = self.pose["p"],
-            yaw = self.pose["yaw"],
-            units = units,
-            callback_finish = self.callback_finish_srv,
-            wait = True,
-        )
+        targets = []
+        for c, pose in enumerate(self.poses):
+            print(f"\nPose {c} to validate for the arm {self.arm_name}")
+            print("key\tvalue")
+            for key in pose:
+                print(f"{key}\t{pose[key]}")
+            targets.append(
+                dict(
+                    x=pose["x"],
+                    y=pose["y"],
+                    z=pose["z"],
+                    roll=pose["r"],
+                    pitch=pose["p"],
+                    yaw=pose["yaw"],
+                    units=units,
+                )
+            )
+
+        # All the poses are checked at once, results print as they arrive
+        checks = ArmValidator(self.arms)
+        async for c, verdict in checks.as_completed(self.arm_name, targets):
+            print(f"\nPose {c}")
+            self.callback_finish_srv(*verdict)
 
     def callback_finish_srv(self, error, error_msg, distance):
         if distance != "" and error == 0:
@@ -6,6 +6,9 @@ from raya.application_base import RayaApplicationBase
 
 from raya.enumerations import ANG_UNIT
 
+from common.arm_checks import ArmValidator
+from common.arm_info import ArmInfo
+
 
 class bcolors:
     HEADER = "\033[95m"
@@ -30,16 +33,17 @@ class RayaApplication(RayaApplicationBase):
         self.col = bcolors()
         # enable the arm controller
         self.arms = await self.enable_controller("arms")
+        self.arm_info = ArmInfo(self.arms)
         if self.list_arms:
             self.print_list_arms()
         elif self.arm_name:
-            if not self.arm_name in self.arms.get_list_of_arms():
+            if not self.arm_info.has_arm(self.arm_name):
                 self.print_list_arms()
                 raise ValueError(f"the arm name {self.arm_name} is invalid")
             if self.joint_values is not None:
                 self.check_values()
                 await self.execute_validation(
-                    self.joint_values, self.arms.get_state_of_arm(self.arm_name)["name"]
+                    self.joint_values, self.arm_info.joints[self.arm_name]
                 )
             else:
                 print(
@@ -85,7 +89,8 @@ option is true the program just print the list of avaliable arms",
             "--joint-values",
             type=str,
             required=False,
-            help="Define the value of the joints in array format 0,0,0,0,0,0,0",
+            help="Define the value of the joints in array format 0,0,0,0,0,0,0, \
+several arrays separated by ; are checked at once",
         )
         self.rad_deg = False
         try:
@@ -94,7 +99,10 @@ option is true the program just print the list of avaliable arms",
             self.list_arms = args.list_arms
             self.rad_deg = args.rad_deg
             try:
-                self.joint_values = np.fromstring(args.joint_values, sep=",").tolist()
+                self.joint_values = [
+                    np.fromstring(values, sep=",").tolist()
+                    for values in args.joint_values.split(";")
+                ]
             except:
                 self.joint_values = None
         except:
@@ -103,7 +111,7 @@ option is true the program just print the list of avaliable arms",
     def print_list_arms(self):
         print("\n---------------------")
         print(f"{self.col.OKBLUE}List of avaliable arms{self.col.ENDC}")
-        for c, arm_name in enumerate(self.arms.get_list_of_arms()):
+        for c, arm_name in enumerate(self.arm_info.names):
             print(f"{c}. {arm_name}")
 
     def list_joints_values(self):
@@ -115,35 +123,46 @@ option is true the program just print the list of avaliable arms",
         units = ANG_UNIT.DEG
         if self.rad_deg:
             units = ANG_UNIT.RAD
-        limits = self.arms.get_limits_of_joints(self.arm_name, units)
-        name_joints = self.arms.get_state_of_arm(self.arm_name)["name"]
+        limits = self.arm_info.limits_of_joints(self.arm_name, units)
+        name_joints = self.arm_info.joints[self.arm_name]
         for c, joint_name in enumerate(name_joints):
             print(
                 f"{c}.  {joint_name}\t{limits[joint_name][0]:.2f}\t\t{limits[joint_name][1]:.2f}"
             )
 
     def check_values(self):
-        name_joints = self.arms.get_state_of_arm(self.arm_name)["name"]
-        if len(self.joint_values) != len(name_joints):
-            raise ValueError(
-                f"Invalid length of the joint values array must be {len(name_joints)}"
-            )
+        name_joints = self.arm_info.joints[self.arm_name]
+        for joint_values in self.joint_values:
+            if len(joint_values) != len(name_joints):
+                raise ValueError(
+                    f"Invalid length of the joint values array must be {len(name_joints)}"
+                )
 
-    async def execute_validation(self, joints, names):
-        print("\nPosition joints to validate \nname of joint\tvalue")
-        for joint, name in zip(joints, names):
-            print(f"{name}\t{joint}")
+    async def execute_validation(self, joint_values, names):
+        for c, joints in enumerate(joint_values):
+            print(f"\nPosition joints {c} to validate \nname of joint\tvalue")
+            for joint, name in zip(joints, names):
+                print(f"{name}\t{joint}")
         units = ANG_UNIT.DEG
         if self.rad_deg == True:
             units = ANG_UNIT.RAD
-        await self.arms.are_joints_position_valid(
-            self.arm_name,
-            names,
-            joints,
-            units = units,
-            callback_finish = self.callback_finish_srv,
-            wait = True,
+        # Positions out of the limits of the joints are invalid without
+        # asking, the rest are checked at once and print as they arrive
+        inside = self.arm_info.within_limits(
+            self.arm_name, joint_values, names, units
         )
+        for c in np.flatnonzero(~inside):
+            print(f"\nPosition joints {c} (out of the limits of the joints)")
+            self.callback_finish_srv(1, "Joint values out of limits", "")
+        checks = ArmValidator(self.arms)
+        indices = np.flatnonzero(inside)
+        targets = [
+            dict(name_joints=names, angle_joints=joint_values[c], units=units)
+            for c in indices
+        ]
+        async for c, verdict in checks.as_completed(self.arm_name, targets):
+            print(f"\nPosition joints {indices[c]}")
+            self.callback_finish_srv(*verdict)
 
     def callback_finish_srv(self, error, error_msg, distance):
         if distance != "" and error == 0:
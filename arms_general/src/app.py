@@ -1,9 +1,13 @@
 from raya.application_base import RayaApplicationBase
 from raya.controllers.arms_controller import ArmsController
 import time
+import asyncio
 
 from raya.enumerations import ANG_UNIT
 
+from common.arm_checks import ArmValidator
+from common.arm_jobs import ArmScheduler
+
 
 class RayaApplication(RayaApplicationBase):
     async def setup(self):
@@ -44,211 +48,67 @@ class RayaApplication(RayaApplicationBase):
         print("------------")
         print("")
 
-        await self.arms.are_joints_position_valid(
-            "left_arm",
-            ["arm_left_shoulder_FR_joint"],
-            [1.07],
-            units=ANG_UNIT.RAD,
-            callback_finish=self.callback_finish_srv,
-        )
-
-        await self.arms.are_joints_position_valid(
-            "right_arm",
-            ["arm_right_shoulder_FR_joint"],
-            [3.07],
-            units=ANG_UNIT.RAD,
-            wait=True,
-            callback_finish=self.callback_finish_srv,
-        )
-
-        await self.arms.are_joints_position_valid(
-            "left_arm",
-            ["arm_left_shoulder_FR_joint"],
-            [40],
-            callback_finish=self.callback_finish_srv,
-        )
-
-        await self.arms.are_joints_position_valid(
-            "right_arm",
-            ["arm_right_shoulder_FR_joint"],
-            [-40],
-            callback_finish=self.callback_finish_srv,
-        )
-
-        await self.arms.is_pose_valid_q(
-            "left_arm",
-            x=0.38661,
-            y=0.25621,
-            z=1.18,
-            qx=0.48961,
-            qy=0.51048,
-            qz=0.51019,
-            qw=-0.48929,
-            callback_finish=self.callback_finish_srv,
-        )
-
-        await self.arms.is_pose_valid_q(
-            "right_arm",
-            x=0.38661,
-            y=-0.25621,
-            z=1.18,
-            qx=0.48961,
-            qy=0.51048,
-            qz=0.51019,
-            qw=-0.48929,
-            callback_finish=self.callback_finish_srv,
-        )
-
-        while self.arms.are_checkings_in_progress():
-            print("---waiting for checkings finish---")
-            await self.sleep(0.5)
-
-        await self.arms.set_pose_q(
-            "left_arm",
-            x=0.38661,
-            y=0.25621,
-            z=1.18,
-            qx=0.48961,
-            qy=0.51048,
-            qz=0.51019,
-            qw=-0.48929,
-            callback_feedback=self.callback_feedback,
-            callback_finish=self.callback_finish,
-            # wait=True,
-        )
-
-        await self.arms.set_pose_q(
-            "right_arm",
-            x=0.38661,
-            y=-0.25621,
-            z=1.18,
-            qx=0.48961,
-            qy=0.51048,
-            qz=0.51019,
-            qw=-0.48929,
-            callback_feedback=self.callback_feedback,
-            callback_finish=self.callback_finish,
-            # wait=True,
-        )
-
-        while self.arms.is_arm_in_execution("right_arm") or self.arms.is_arm_in_execution(
-            "left_arm"
-        ):
-            await self.sleep(0.1)
-
-        await self.arms.set_pose_q(
-            "left_arm",
-            x=0.28661,
-            y=0.25621,
-            z=1.18,
-            qx=0.48961,
-            qy=0.51048,
-            qz=0.51019,
-            qw=-0.48929,
+        # Every check is submitted at once, verdicts print as they arrive
+        checks = ArmValidator(self.arms, callback_finish=self.callback_finish_srv)
+        quaternion = dict(qx=0.48961, qy=0.51048, qz=0.51019, qw=-0.48929)
+        await asyncio.gather(
+            checks.check(
+                "left_arm",
+                [
+                    dict(name_joints=["arm_left_shoulder_FR_joint"],
+                         angle_joints=[1.07], units=ANG_UNIT.RAD),
+                    dict(name_joints=["arm_left_shoulder_FR_joint"],
+                         angle_joints=[40]),
+                    dict(x=0.38661, y=0.25621, z=1.18, **quaternion),
+                ],
+            ),
+            checks.check(
+                "right_arm",
+                [
+                    dict(name_joints=["arm_right_shoulder_FR_joint"],
+                         angle_joints=[3.07], units=ANG_UNIT.RAD),
+                    dict(name_joints=["arm_right_shoulder_FR_joint"],
+                         angle_joints=[-40]),
+                    dict(x=0.38661, y=-0.25621, z=1.18, **quaternion),
+                ],
+            ),
+        )
+
+        # Both arms run the same sequence, independently of each other
+        jobs = ArmScheduler(
+            self.arms,
             callback_feedback=self.callback_feedback,
             callback_finish=self.callback_finish,
-            cartesian_path=True,
-            wait=True,
         )
-
-        await self.arms.set_pose_q(
-            "right_arm",
-            x=0.28661,
-            y=-0.25621,
-            z=1.18,
-            qx=0.48961,
-            qy=0.51048,
-            qz=0.51019,
-            qw=-0.48929,
-            callback_feedback=self.callback_feedback,
-            callback_finish=self.callback_finish,
-            cartesian_path=True,
-            wait=True,
-        )
-
-        await self.arms.set_pose_q(
-            "left_arm",
-            x=0.28661,
-            y=0.25621,
-            z=1.48,
-            qx=0.48961,
-            qy=0.51048,
-            qz=0.51019,
-            qw=-0.48929,
-            callback_feedback=self.callback_feedback,
-            callback_finish=self.callback_finish,
-            cartesian_path=True,
-            wait=True,
-        )
-
-        await self.arms.set_pose_q(
-            "right_arm",
-            x=0.28661,
-            y=-0.25621,
-            z=1.48,
-            qx=0.48961,
-            qy=0.51048,
-            qz=0.51019,
-            qw=-0.48929,
-            callback_feedback=self.callback_feedback,
-            callback_finish=self.callback_finish,
-            cartesian_path=True,
-            wait=True,
-        )
-
-        await self.arms.set_predefined_pose(
-            "right_arm",
-            "right_arm_home",
-            callback_feedback=self.callback_feedback,
-            callback_finish=self.callback_finish,
-            wait=True,
-        )
-
-        await self.arms.set_predefined_pose(
-            "left_arm",
-            "left_arm_home",
-            callback_feedback=self.callback_feedback,
-            callback_finish=self.callback_finish,
-            wait=True,
-        )
-
-        await self.arms.set_joints_position(
-            "right_arm",
-            ["arm_right_shoulder_FR_joint"],
-            [1.57],
-            units=ANG_UNIT.RAD,
-            callback_feedback=self.callback_feedback,
-            callback_finish=self.callback_finish,
-            wait=True,
-        )
-
-        await self.arms.set_joints_position(
-            "left_arm",
-            ["arm_left_shoulder_FR_joint"],
-            [1.57],
-            units=ANG_UNIT.RAD,
-            callback_feedback=self.callback_feedback,
-            callback_finish=self.callback_finish,
-            wait=True,
-        )
-
-        await self.arms.set_joints_position(
-            "right_arm",
-            ["arm_right_shoulder_FR_joint"],
-            [15],
-            callback_feedback=self.callback_feedback,
-            callback_finish=self.callback_finish,
-            wait=True,
-        )
-
-        await self.arms.set_joints_position(
-            "left_arm",
-            ["arm_left_shoulder_FR_joint"],
-            [15],
-            callback_feedback=self.callback_feedback,
-            callback_finish=self.callback_finish,
-            wait=True,
+        for arm, side, y in (("left_arm", "left", 0.25621),
+                             ("right_arm", "right", -0.25621)):
+            jobs.add(f"{arm}_pose", arm, "set_pose_q",
+                     x=0.38661, y=y, z=1.18,
+                     qx=0.48961, qy=0.51048, qz=0.51019, qw=-0.48929)
+            jobs.add(f"{arm}_back", arm, "set_pose_q",
+                     x=0.28661, y=y, z=1.18,
+                     qx=0.48961, qy=0.51048, qz=0.51019, qw=-0.48929,
+                     cartesian_path=True)
+            jobs.add(f"{arm}_up", arm, "set_pose_q",
+                     x=0.28661, y=y, z=1.48,
+                     qx=0.48961, qy=0.51048, qz=0.51019, qw=-0.48929,
+                     cartesian_path=True)
+            jobs.add(f"{arm}_home", arm, "set_predefined_pose",
+                     f"{arm}_home")
+            jobs.add(f"{arm}_shoulder_rad", arm, "set_joints_position",
+                     [f"arm_{side}_shoulder_FR_joint"], [1.57],
+                     units=ANG_UNIT.RAD)
+            jobs.add(f"{arm}_shoulder_deg", arm, "set_joints_position",
+                     [f"arm_{side}_shoulder_FR_joint"], [15])
+
+        report = await jobs.run()
+        print(
+            f"arms moves: {report['wall_time']:.2f} s wall clock, "
+            f"{report['sum_of_moves']:.2f} s of moves "
+            f"(x{report['speedup']:.2f})"
         )
+        if report["failed"] or report["skipped"]:
+            print(f"failed: {report['failed']} skipped: {report['skipped']}")
 
     async def loop(self):
         self.finish_app()
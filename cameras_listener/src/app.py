@@ -1,10 +1,13 @@
 import time
+import asyncio
 import argparse
 
 from raya.application_base import RayaApplicationBase
 from raya.controllers.cameras_controller import CamerasController
 from raya.tools.image import show_image
 
+from common.frames import FrameBuffer
+
 LOOP_PERIOD = 1.0
 
 class RayaApplication(RayaApplicationBase):
@@ -38,10 +41,9 @@ class RayaApplication(RayaApplicationBase):
         # Enable camera
         await self.cameras.enable_color_camera(self.working_camera)
 
-        # Create listener
-        self.cameras.create_color_frame_listener(
-                                        camera_name=self.working_camera,
-                                        callback=self.callback_color_frame)
+        # Create listener, it only keeps the latest frames so the camera
+        # never waits for the display
+        self.frames = FrameBuffer.listen(self.cameras, self.working_camera)
 
         # If spin parameter was set 
         if self.spin_ena:
@@ -50,13 +52,22 @@ class RayaApplication(RayaApplicationBase):
             await self.motion.set_velocity(x_velocity=0.0, y_velocity=0.0, 
                                            angular_velocity=-20.0, 
                                            duration=self.duration)
-        self.time_counter = 0
+        self.start_time = time.monotonic()
+        self.last_report = self.start_time
 
     async def loop(self):
-        self.log.info('Doing other (non blocking) stuff')
-        await self.sleep(1.0)
-        self.time_counter += 1
-        if self.time_counter>self.duration:
+        # A stalled camera must not keep the duration from being checked
+        try:
+            img, _ = await self.frames.next(timeout=LOOP_PERIOD)
+        except asyncio.TimeoutError:
+            self.log.info(f'No frames in the last {LOOP_PERIOD} s')
+        else:
+            show_image(img, 'Video from Gary\'s camera', scale = 0.4)
+        if time.monotonic() - self.last_report >= LOOP_PERIOD:
+            self.last_report = time.monotonic()
+            self.log.info('Doing other (non blocking) stuff')
+            self.log.info(f'Frames: {self.frames.stats()}')
+        if time.monotonic() - self.start_time > self.duration:
             self.finish_app()
         
 
@@ -68,10 +79,6 @@ class RayaApplication(RayaApplicationBase):
             await self.motion.cancel_motion()
 
 
-    def callback_color_frame(self, img):
-        show_image(img, 'Video from Gary\'s camera', scale = 0.4)
-
-
     def get_args(self):
         # Arguments
         parser = argparse.ArgumentParser()
@@ -1,9 +1,13 @@
+import time
+import asyncio
 import argparse
 
 from raya.application_base import RayaApplicationBase
 from raya.controllers.cameras_controller import CamerasController
 from raya.tools.image import show_image
 
+from common.frames import FrameBuffer
+
 
 LOOP_PERIOD = 1.0
 
@@ -42,6 +46,10 @@ class RayaApplication(RayaApplicationBase):
         await self.cameras.enable_color_camera(self.working_camera)
         self.log.info('Camera enabled')
 
+        # Frames are buffered as they arrive, the loop always shows the
+        # newest one, however long it takes to show it
+        self.frames = FrameBuffer.listen(self.cameras, self.working_camera)
+
         # If spin parameter was set 
         if self.spin_ena:
             # Call motion controller
@@ -49,27 +57,30 @@ class RayaApplication(RayaApplicationBase):
             await self.motion.set_velocity(x_velocity=0.0, y_velocity=0.0, 
                                            angular_velocity=-20.0, 
                                            duration=self.duration)
-        self.time_counter = 0
+        self.start_time = time.monotonic()
 
 
     async def loop(self):
-        # Wait for next frame in Camera
-        img = await self.cameras.get_next_frame(self.working_camera)
-        if img is not None:
-            show_image(img, 'Video from Gary\'s camera', scale = 0.4)
+        # Wait for next frame in Camera, a stalled camera must not keep
+        # the duration and the spin from being checked
+        try:
+            img, _ = await self.frames.next(timeout=LOOP_PERIOD)
+        except asyncio.TimeoutError:
+            self.log.info(f'No frames in the last {LOOP_PERIOD} s')
+        else:
+            if img is not None:
+                show_image(img, 'Video from Gary\'s camera', scale = 0.4)
         if self.spin_ena:
             if not self.motion.is_moving():
                 self.finish_app()
-        else:
-            await self.sleep(1.0)
-            self.time_counter += 1
-            if self.time_counter >= self.duration:
-                self.log.info('Counter Finish...')
-                self.finish_app()
+        elif time.monotonic() - self.start_time >= self.duration:
+            self.log.info('Counter Finish...')
+            self.finish_app()
         
 
     async def finish(self):
         if self.working_camera != None:
+            self.log.info(f'Frames: {self.frames.stats()}')
             self.log.info('Disabling camera...')
             self.cameras.disable_color_camera(self.working_camera)
         if self.spin_ena and self.motion.is_moving():
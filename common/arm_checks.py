@@ -0,0 +1,174 @@
+import math
+import asyncio
+from collections import OrderedDict
+
+from raya.enumerations import ANG_UNIT
+
+from common.completion import Completion
+
+
+class ArmValidator:
+    """Validity checks of arm targets, submitted in batches and cached.
+
+    A target is a dict with the arguments of one check: `x, y, z, qx, qy,
+    qz, qw` for `is_pose_valid_q`, `x, y, z, roll, pitch, yaw` (and
+    optionally `units`) for `is_pose_valid`, or `name_joints,
+    angle_joints` (and optionally `units`) for
+    `are_joints_position_valid`. Every uncached target of a batch is
+    submitted at once (at most `max_in_flight`), and the verdicts
+    `(error, error_msg, distance)` come back as they finish, no polling of
+    `are_checkings_in_progress`. Verdicts are kept in an LRU cache keyed
+    by the arm and the target quantized to `position_step` meters and
+    `angle_step` radians, so validating the same candidates again costs
+    nothing. The distance of a cached verdict is the one from the arm
+    position at the time of the check, `invalidate` after moving the arm
+    if it matters.
+    """
+
+    def __init__(self, arms, callback_finish=None, cache_size=256,
+                 position_step=0.005, angle_step=0.01, max_in_flight=None):
+        self.arms = arms
+        self.callback_finish = callback_finish
+        self.cache_size = cache_size
+        self.position_step = position_step
+        self.angle_step = angle_step
+        self.max_in_flight = max_in_flight
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._semaphore = None
+
+
+    def submit(self, arm, target):
+        """Start the check of `target` (unless cached or already running)
+        and return its `Completion`, whose result is the verdict."""
+        key = self.key(arm, target)
+        completion = Completion(callback_finish=self.callback_finish)
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            completion.finish(*self._cache[key])
+        elif key in self._pending:
+            self.hits += 1
+            asyncio.ensure_future(self._forward(self._pending[key],
+                                                completion))
+        else:
+            self.misses += 1
+            check = Completion()
+            self._pending[key] = check
+            asyncio.ensure_future(self._run(arm, target, key, check,
+                                            completion))
+        return completion
+
+
+    async def as_completed(self, arm, targets):
+        """Check every target of `targets` and yield `(index, verdict)` in
+        the order the verdicts arrive, cached ones first."""
+        completions = [self.submit(arm, target) for target in targets]
+        index = {completion._future: i
+                 for i, completion in enumerate(completions)}
+        pending = set(index)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in sorted(done, key=index.get):
+                yield index[future], future.result()
+
+
+    async def check(self, arm, targets):
+        """Verdicts of every target of `targets`, in the same order."""
+        return list(await asyncio.gather(
+            *[self.submit(arm, target).wait() for target in targets]))
+
+
+    async def valid(self, arm, targets):
+        """Booleans, `True` for the targets without error."""
+        return [verdict[0] == 0 for verdict in await self.check(arm, targets)]
+
+
+    def invalidate(self, arm=None):
+        """Forget the verdicts of `arm`, of every arm if `None`."""
+        if arm is None:
+            self._cache.clear()
+            return
+        for key in [key for key in self._cache if key[0] == arm]:
+            del self._cache[key]
+
+
+    def key(self, arm, target):
+        """Cache key of `target`, equal for targets that round to the same
+        quantized values."""
+        if 'name_joints' in target:
+            angles = _radians(target['angle_joints'],
+                              target.get('units', ANG_UNIT.DEG))
+            return (arm, 'joints', tuple(target['name_joints']),
+                    self._quantize(angles, self.angle_step))
+        position = self._quantize(
+            [target['x'], target['y'], target['z']], self.position_step)
+        if 'qw' in target:
+            q = [target['qx'], target['qy'], target['qz'], target['qw']]
+            norm = math.sqrt(sum(v * v for v in q)) or 1.0
+            # q and -q are the same orientation
+            sign = -1.0 if q[3] < 0.0 else 1.0
+            orientation = [sign * v / norm for v in q]
+            return (arm, 'pose_q', position,
+                    self._quantize(orientation, self.angle_step / 2.0))
+        angles = _radians([target['roll'], target['pitch'], target['yaw']],
+                          target.get('units', ANG_UNIT.DEG))
+        angles = [math.remainder(angle, 2.0 * math.pi) for angle in angles]
+        return (arm, 'pose', position,
+                self._quantize(angles, self.angle_step))
+
+
+    async def _run(self, arm, target, key, check, completion):
+        if self.max_in_flight and self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        try:
+            if self._semaphore is not None:
+                async with self._semaphore:
+                    verdict = await self._request(arm, target, check)
+            else:
+                verdict = await self._request(arm, target, check)
+        except Exception as e:
+            verdict = (-1, str(e), '')
+            check.finish(*verdict)
+        else:
+            self._store(key, verdict)
+        finally:
+            self._pending.pop(key, None)
+        completion.finish(*verdict)
+
+
+    async def _request(self, arm, target, check):
+        kwargs = dict(target)
+        if 'name_joints' in target:
+            action = self.arms.are_joints_position_valid
+        elif 'qw' in target:
+            action = self.arms.is_pose_valid_q
+        else:
+            action = self.arms.is_pose_valid
+        await action(arm, callback_finish=check.finish, wait=False, **kwargs)
+        return await check
+
+
+    async def _forward(self, check, completion):
+        completion.finish(*(await check))
+
+
+    def _store(self, key, verdict):
+        self._cache[key] = verdict
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+    @staticmethod
+    def _quantize(values, step):
+        return tuple(int(round(v / step)) for v in values)
+
+
+def _radians(angles, units):
+    if units == ANG_UNIT.RAD:
+        return [float(angle) for angle in angles]
+    return [math.radians(angle) for angle in angles]
@@ -0,0 +1,68 @@
+import numpy as np
+
+from raya.enumerations import ANG_UNIT
+
+
+class ArmInfo:
+    """Static metadata of the arms, asked to the controller once.
+
+    Keeps the list of arms, the joint names of each arm, their limits in
+    degrees and radians as `(joints, 2)` arrays and the predefined poses
+    as sets, so membership tests and limit checks need no request.
+    `refresh()` asks everything again (after a change of configuration
+    of the robot, for instance).
+    """
+
+    def __init__(self, arms):
+        self.arms = arms
+        self.refresh()
+
+
+    def refresh(self):
+        self.names = list(self.arms.get_list_of_arms())
+        self.joints = {}
+        self.joint_index = {}
+        self.limits = {ANG_UNIT.DEG: {}, ANG_UNIT.RAD: {}}
+        self.predefined_poses = {}
+        for arm in self.names:
+            joints = list(self.arms.get_state_of_arm(arm)['name'])
+            self.joints[arm] = joints
+            self.joint_index[arm] = {name: i for i, name in enumerate(joints)}
+            for units, limits in self.limits.items():
+                arm_limits = self.arms.get_limits_of_joints(arm, units)
+                limits[arm] = np.array([arm_limits[name] for name in joints],
+                                       dtype=float).reshape(-1, 2)
+            self.predefined_poses[arm] = set(
+                self.arms.get_list_predefined_poses(arm))
+
+
+    def has_arm(self, arm):
+        return arm in self.joints
+
+
+    def has_predefined_pose(self, arm, pose):
+        return pose in self.predefined_poses.get(arm, ())
+
+
+    def limits_of_joints(self, arm, units=ANG_UNIT.DEG):
+        """Same as `arms.get_limits_of_joints`, name -> `[lower, upper]`."""
+        return {name: limits.tolist() for name, limits
+                in zip(self.joints[arm], self.limits[units][arm])}
+
+
+    def within_limits(self, arm, angle_joints, name_joints=None,
+                      units=ANG_UNIT.DEG):
+        """Whether joint vectors are inside the limits of the joints.
+
+        `angle_joints` is one vector or an array of vectors (one per row)
+        of the joints `name_joints`, every joint of the arm in order if
+        `None`. Returns a boolean, or an array of booleans for several
+        vectors. Unknown joint names raise `KeyError`.
+        """
+        limits = self.limits[units][arm]
+        if name_joints is not None:
+            index = self.joint_index[arm]
+            limits = limits[[index[name] for name in name_joints]]
+        angles = np.asarray(angle_joints, dtype=float)
+        inside = (angles >= limits[:, 0]) & (angles <= limits[:, 1])
+        return inside.all(axis=-1)
@@ -0,0 +1,125 @@
+import time
+import asyncio
+
+from common.completion import Completion
+
+
+class ArmJob:
+    """One motion of an `ArmScheduler`."""
+
+    def __init__(self, name, arm, action, args, kwargs, after):
+        self.name = name
+        self.arm = arm
+        self.action = action
+        self.args = args
+        self.kwargs = kwargs
+        self.after = list(after)
+        self.start = None
+        self.end = None
+        self.error = None
+        self.error_msg = ''
+        self.skipped = False
+
+
+    @property
+    def duration(self):
+        if self.start is None or self.end is None:
+            return 0.0
+        return self.end - self.start
+
+
+    def __repr__(self):
+        return f'ArmJob({self.name!r}, {self.arm!r}, {self.action!r})'
+
+
+class ArmScheduler:
+    """Runs a graph of arm motions, each arm as soon as it can.
+
+    Jobs are calls to the motion methods of the arms controller
+    (`set_pose`, `set_pose_q`, `set_joints_position`,
+    `set_predefined_pose`, `set_gripper_open`, ...) given by name, with the
+    arm first and the same arguments, `cartesian_path=True` included. A
+    job starts when the jobs in its `after` are finished and the previous
+    job of the same arm too, so the jobs of an arm run in the order they
+    were added while the arms run concurrently. A failed job, also one
+    whose call raised, skips the jobs that depend on it. `run()` waits
+    with completions, no polling.
+    """
+
+    def __init__(self, arms, callback_feedback=None, callback_finish=None):
+        self.arms = arms
+        self.callback_feedback = callback_feedback
+        self.callback_finish = callback_finish
+        self.jobs = {}
+        self._last = {}
+        self.wall_time = 0.0
+
+
+    def add(self, name, arm, action, *args, after=(), **kwargs):
+        """Add the job `name`: `arms.<action>(arm, *args, **kwargs)`."""
+        if name in self.jobs:
+            raise ValueError(f'Job \'{name}\' already added')
+        for dependency in after:
+            if dependency not in self.jobs:
+                raise ValueError(f'Job \'{name}\' depends on unknown job '
+                                 f'\'{dependency}\'')
+        after = list(after)
+        if arm in self._last and self._last[arm] not in after:
+            after.append(self._last[arm])
+        self.jobs[name] = ArmJob(name, arm, action, args, kwargs, after)
+        self._last[arm] = name
+        return name
+
+
+    async def run(self):
+        """Run every job, return the report of `report()`."""
+        done = {name: asyncio.Event() for name in self.jobs}
+        t0 = time.monotonic()
+
+        async def run_job(job):
+            for dependency in job.after:
+                await done[dependency].wait()
+            try:
+                if any(self.jobs[d].error or self.jobs[d].skipped
+                       for d in job.after):
+                    job.skipped = True
+                    return
+                completion = Completion(self.callback_feedback,
+                                        self.callback_finish)
+                kwargs = dict(job.kwargs, callback_finish=completion.finish,
+                              wait=False)
+                if not job.action.startswith('set_gripper'):
+                    # Grippers give no feedback
+                    kwargs['callback_feedback'] = completion.feedback
+                job.start = time.monotonic()
+                try:
+                    await getattr(self.arms, job.action)(job.arm, *job.args,
+                                                         **kwargs)
+                    result = await completion
+                except Exception as e:
+                    # Rejected by the controller (arm in execution, invalid
+                    # pose...), a failure like any other: its dependents
+                    # are skipped and the other jobs go on
+                    result = (-1, f'{type(e).__name__}: {e}')
+                job.end = time.monotonic()
+                job.error, job.error_msg = result[0], result[1]
+            finally:
+                done[job.name].set()
+
+        # Dependencies always come from earlier jobs, there are no cycles
+        await asyncio.gather(*[run_job(job) for job in self.jobs.values()])
+        self.wall_time = time.monotonic() - t0
+        return self.report()
+
+
+    def report(self):
+        """Wall clock vs the sum of the durations of the moves."""
+        moves = sum(job.duration for job in self.jobs.values())
+        return {
+            'wall_time': self.wall_time,
+            'sum_of_moves': moves,
+            'speedup': moves / self.wall_time if self.wall_time else None,
+            'failed': [name for name, job in self.jobs.items() if job.error],
+            'skipped': [name for name, job in self.jobs.items()
+                        if job.skipped],
+        }
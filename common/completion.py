@@ -0,0 +1,146 @@
+import time
+import asyncio
+import threading
+
+
+POLL_PERIOD = 0.1
+# Seconds the controller must report the action as stopped, without the
+# finish callback, before the action is taken as ended
+SETTLE_TIME = 0.5
+
+
+class Completion:
+    """Awaitable end of a controller action.
+
+    Pass `completion.feedback` and `completion.finish` as the
+    `callback_feedback` and `callback_finish` of a navigation, grasping or
+    arms call (or `completion.finish` as the `callback` of a motion call)
+    and await the completion. The awaiting task resumes as soon as the
+    finish callback fires, with the arguments of the callback as result.
+    The original app callbacks, if any, are still called.
+    """
+
+    def __init__(self, callback_feedback=None, callback_finish=None):
+        self._loop = asyncio.get_event_loop()
+        self._thread = threading.get_ident()
+        self._future = self._loop.create_future()
+        self._callback_feedback = callback_feedback
+        self._callback_finish = callback_finish
+        self.started = time.monotonic()
+        self.finished = None
+
+
+    def feedback(self, *args):
+        if self._callback_feedback is not None:
+            self._callback_feedback(*args)
+
+
+    def finish(self, *args):
+        self.finished = time.monotonic()
+        try:
+            if self._callback_finish is not None:
+                self._callback_finish(*args)
+        finally:
+            if threading.get_ident() == self._thread:
+                self._set_result(args)
+            else:
+                self._loop.call_soon_threadsafe(self._set_result, args)
+
+
+    def done(self):
+        return self._future.done()
+
+
+    def cancel(self):
+        return self._future.cancel()
+
+
+    @property
+    def duration(self):
+        if self.finished is None:
+            return None
+        return self.finished - self.started
+
+
+    async def wait(self, timeout=None, active=None, poll_period=POLL_PERIOD):
+        """Wait for the finish callback and return its arguments. Raises
+        `asyncio.TimeoutError` after `timeout` seconds, without canceling
+        the action.
+
+        `active` is the `is_moving`/`is_navigating` of the controller
+        running the action. It is polled every `poll_period` seconds, and
+        if it reports the action as stopped for `SETTLE_TIME` seconds
+        without the finish callback (the action was canceled), the wait
+        returns `None`."""
+        if active is None:
+            return await asyncio.wait_for(asyncio.shield(self._future),
+                                          timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        stopped = None
+        while True:
+            period = poll_period
+            if deadline is not None:
+                period = max(0.0, min(period, deadline - time.monotonic()))
+            try:
+                return await asyncio.wait_for(asyncio.shield(self._future),
+                                              period)
+            except asyncio.TimeoutError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise
+            now = time.monotonic()
+            if active():
+                stopped = None
+            elif stopped is None:
+                stopped = now
+            elif now - stopped >= SETTLE_TIME:
+                return None
+
+
+    def __await__(self):
+        return self.wait().__await__()
+
+
+    def _set_result(self, args):
+        if not self._future.done():
+            self._future.set_result(args)
+
+
+async def run_until_finished(action, *args, callback_feedback=None,
+                             callback_finish=None, timeout=None, active=None,
+                             **kwargs):
+    """Start a non blocking `action` that reports through
+    `callback_feedback`/`callback_finish` (navigation, grasping, arms) and
+    wait for its finish callback. Returns the finish callback arguments,
+    `None` if `active` reports the action as stopped without it (see
+    `Completion.wait`)."""
+    completion = Completion(callback_feedback, callback_finish)
+    await action(*args, callback_feedback=completion.feedback,
+                 callback_finish=completion.finish, wait=False, **kwargs)
+    return await completion.wait(timeout, active)
+
+
+async def run_until_stopped(action, *args, callback=None, timeout=None,
+                            active=None, **kwargs):
+    """Same as `run_until_finished` for motion commands, which report
+    through a single `callback`."""
+    completion = Completion(callback_finish=callback)
+    await action(*args, callback=completion.finish, wait=False, **kwargs)
+    return await completion.wait(timeout, active)
+
+
+def motion_timeout(amount, speed, margin=2.0):
+    """Timeout for a motion of `amount` (meters or degrees) at `speed`:
+    its duration with 50 % and `margin` seconds of slack."""
+    return 1.5 * abs(amount / speed) + margin
+
+
+async def wait_first(*completions, timeout=None):
+    """Wait until one of `completions` finishes and return it, `None` if
+    `timeout` expires first. The other completions are left pending."""
+    futures = {completion._future: completion for completion in completions}
+    done, _ = await asyncio.wait(list(futures), timeout=timeout,
+                                 return_when=asyncio.FIRST_COMPLETED)
+    for future in futures:
+        if future in done:
+            return futures[future]
+    return None
@@ -0,0 +1,322 @@
+import math
+import time
+import asyncio
+
+import numpy as np
+
+
+class DetectorScheduler:
+    """Runs a detector only while there is something new to see.
+
+    The model of the SDK runs at its own rate on the whole stream for as
+    long as it's enabled, the only way to save inferences is to disable
+    it. `enable()` enables the model like `cv.enable_model` and a task
+    then pauses it (`disable_model`) once the robot has been still and
+    the scene unchanged for `idle_after` seconds, and enables it again
+    as soon as the robot moves (`motion.is_moving()` or the velocity of
+    the `poses` stream) or the camera frames change.
+
+    Reloading a model isn't free, on an accelerator it can cost more
+    than the inferences saved. The time `enable_model` and
+    `disable_model` take is measured, and the model is only paused when
+    the idle time to come is expected to be longer than `pause_factor`
+    times that reload cost. The idle time to come is expected to be
+    as long as the current idle stretch has lasted, or as the past ones
+    did on average, whichever is longer. A model that can't be paused for
+    long enough keeps running.
+
+    The frame gate is `on_frame(img)`, to call from the frame listener of
+    the source: a frame changed when more than `min_fraction` of its
+    pixels (one every `stride`) differ in more than `pixel_threshold`
+    from the last frame that changed, so slow changes add up until they
+    count. With `roi` (`x_min, y_min, x_max, y_max` in pixels) only that
+    region of the frames is compared and only the detections centered in
+    it are given, the model itself can't be cropped. A static scene keeps
+    its last detections while paused.
+
+    Errors of the controller while pausing or resuming are logged to
+    `log` (raised in `disable()` without it) and retried after
+    `retry_period` seconds, the scheduling goes on.
+
+    `get_current_detections`, `find_objects`, `cancel_find_objects` and
+    `get_objects_names` work like the ones of the detector, finding
+    waits across pauses.
+    """
+
+    def __init__(self, cv, motion=None, poses=None, roi=None,
+                 idle_after=2.0, pause_factor=2.0, stride=4,
+                 pixel_threshold=25, min_fraction=0.001, min_speed=0.02,
+                 min_angular=0.05, tick=0.1, retry_period=1.0, log=None):
+        self.cv = cv
+        self.motion = motion
+        self.poses = poses
+        self.roi = roi
+        self.idle_after = idle_after
+        self.pause_factor = pause_factor
+        self.stride = stride
+        self.pixel_threshold = pixel_threshold
+        self.min_fraction = min_fraction
+        self.min_speed = min_speed
+        self.min_angular = min_angular
+        self.tick = tick
+        self.retry_period = retry_period
+        self.log = log
+        self.handler = None
+        self.detections = []
+        self.frames = 0
+        self.changed_frames = 0
+        self.pauses = 0
+        self.active_time = 0.0
+        self.paused_time = 0.0
+        self.enable_time = None
+        self.disable_time = None
+        self.mean_pause = None
+        self.errors = 0
+        self.error = None
+        self._model = None
+        self._names = []
+        self._find = None
+        self._reference = None
+        self._last_activity = None
+        self._paused_at = None
+        self._accounted = None
+        self._resumed = asyncio.Event()
+        self._task = None
+        self._lock = asyncio.Lock()
+
+
+    async def enable(self, model, type, name, source, model_params={}):
+        """Enable the model (same arguments as `cv.enable_model`) and
+        start scheduling it. Returns the scheduler."""
+        self._model = dict(model=model, type=type, name=name, source=source,
+                           model_params=model_params)
+        await self._resume()
+        self._names = self.handler.get_objects_names()
+        self._last_activity = time.monotonic()
+        self._task = asyncio.ensure_future(self._run())
+        return self
+
+
+    async def disable(self):
+        """Stop scheduling and disable the model if it's enabled. Without
+        `log`, raises the first error of the scheduling task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        async with self._lock:
+            if self.handler is not None:
+                self._account()
+                self.handler = None
+                await self.cv.disable_model(model=self._model['model'],
+                                            type=self._model['type'])
+        if self.error is not None and self.log is None:
+            raise self.error
+
+
+    @property
+    def reload_cost(self):
+        """Seconds to disable and enable the model again, the enabling
+        time counted twice until a disabling was measured."""
+        if self.enable_time is None:
+            return 0.0
+        disable_time = (self.enable_time if self.disable_time is None
+                        else self.disable_time)
+        return self.enable_time + disable_time
+
+
+    def on_frame(self, img):
+        """Frame gate, returns `True` if the frame changed."""
+        self.frames += 1
+        if self.roi is not None:
+            x_min, y_min, x_max, y_max = self.roi
+            img = img[y_min:y_max, x_min:x_max]
+        small = np.asarray(img[::self.stride, ::self.stride], dtype=np.int16)
+        if small.ndim == 3:
+            small = small.mean(axis=2)
+        if self._reference is not None and self._reference.shape == small.shape:
+            changed = np.count_nonzero(np.abs(small - self._reference)
+                                       > self.pixel_threshold)
+            if changed <= self.min_fraction * small.size:
+                return False
+        self._reference = small
+        self.changed_frames += 1
+        self._last_activity = time.monotonic()
+        return True
+
+
+    def is_active(self):
+        return self.handler is not None
+
+
+    def moving(self):
+        """Whether the robot is moving, by the motion controller or the
+        velocity of the pose stream."""
+        if self.motion is not None and self.motion.is_moving():
+            return True
+        if self.poses is not None:
+            vx, vy, angular = self.poses.velocity()
+            return (math.hypot(vx, vy) > self.min_speed
+                    or abs(angular) > self.min_angular)
+        return False
+
+
+    def stats(self):
+        self._account()
+        total = self.active_time + self.paused_time
+        return {
+            'frames': self.frames,
+            'changed_frames': self.changed_frames,
+            'pauses': self.pauses,
+            'active_time': self.active_time,
+            'paused_time': self.paused_time,
+            'duty': self.active_time / total if total else 1.0,
+            'reload_cost': self.reload_cost,
+            'errors': self.errors,
+        }
+
+
+    ## Detector interface
+    def get_current_detections(self):
+        if self.handler is not None:
+            self.detections = self._in_roi(
+                self.handler.get_current_detections())
+        return self.detections
+
+
+    async def find_objects(self, objects, callback=None, wait=False,
+                           timeout=0.0):
+        if not wait:
+            self._find = (list(objects), callback)
+            if self.handler is not None:
+                await self._register_find()
+            return None
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            remaining = None if deadline is None else \
+                deadline - time.monotonic()
+            if remaining is not None and remaining <= 0.0:
+                return []
+            if self.handler is None:
+                try:
+                    await asyncio.wait_for(self._resumed.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return []
+                continue
+            found = self._in_roi(await self.handler.find_objects(
+                objects, wait=True, timeout=remaining or 0.0))
+            if found:
+                return found
+
+
+    def cancel_find_objects(self):
+        self._find = None
+        if self.handler is not None:
+            self.handler.cancel_find_objects()
+
+
+    def get_objects_names(self):
+        return list(self._names)
+
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.tick)
+            now = time.monotonic()
+            if self.moving():
+                self._last_activity = now
+            idle = now - self._last_activity
+            try:
+                if self.handler is not None:
+                    if idle > self.idle_after and self._worth_pausing(idle):
+                        await self._pause()
+                elif idle <= self.idle_after:
+                    await self._resume()
+            except Exception as e:
+                self.errors += 1
+                if self.error is None:
+                    self.error = e
+                if self.log is not None:
+                    self.log.error(f'Detector scheduling failed: {e!r}')
+                await asyncio.sleep(self.retry_period)
+
+
+    def _worth_pausing(self, idle):
+        # Still as long as it has been, or as the past pauses lasted
+        expected = max(idle, self.mean_pause or 0.0)
+        return expected > self.pause_factor * self.reload_cost
+
+
+    async def _pause(self):
+        async with self._lock:
+            if self.handler is None:
+                return
+            handler = self.handler
+            self.detections = self._in_roi(handler.get_current_detections())
+            self._account()
+            self.handler = None
+            self._resumed.clear()
+            t0 = time.monotonic()
+            try:
+                await self.cv.disable_model(model=self._model['model'],
+                                            type=self._model['type'])
+            except Exception:
+                # Taken as still enabled
+                self._account()
+                self.handler = handler
+                self._resumed.set()
+                raise
+            self.disable_time = time.monotonic() - t0
+            self._paused_at = time.monotonic()
+            self.pauses += 1
+
+
+    async def _resume(self):
+        async with self._lock:
+            if self.handler is not None:
+                return
+            self._account()
+            t0 = time.monotonic()
+            self.handler = await self.cv.enable_model(**self._model)
+            self.enable_time = time.monotonic() - t0
+            if self._paused_at is not None:
+                pause = time.monotonic() - self._paused_at
+                self.mean_pause = (pause if self.mean_pause is None
+                                   else 0.7 * self.mean_pause + 0.3 * pause)
+            self._paused_at = None
+            if self._find is not None:
+                await self._register_find()
+            self._resumed.set()
+
+
+    async def _register_find(self):
+        objects, callback = self._find
+
+        def found(detection):
+            if self._in_roi([detection]):
+                callback(detection)
+
+        await self.handler.find_objects(objects, callback=found, wait=False)
+
+
+    def _account(self):
+        # Time spent in the current state since the last call
+        now = time.monotonic()
+        if self._accounted is not None:
+            if self.handler is not None:
+                self.active_time += now - self._accounted
+            else:
+                self.paused_time += now - self._accounted
+        self._accounted = now
+
+
+    def _in_roi(self, detections):
+        if self.roi is None or not detections:
+            return list(detections or [])
+        x_min, y_min, x_max, y_max = self.roi
+        return [d for d in detections
+                if x_min <= (d['x_min'] + d['x_max']) / 2.0 <= x_max
+                and y_min <= (d['y_min'] + d['y_max']) / 2.0 <= y_max]
@@ -0,0 +1,164 @@
+import time
+import asyncio
+
+
+class DetectionCache:
+    """Latest result of a detector, stamped and shared by every consumer.
+
+    A new result of the detector is recognized by what the SDK gives:
+    with `set_detections_callback` the detector calls the cache once per
+    inference. Without it, the frame listener of the source calls
+    `on_frame()`, which reads `get_current_detections()` once per frame,
+    and a result is new when its `timestamp` fields, or without them its
+    boxes, differ from the last one. The boxes being equal, an unchanged
+    scene looks older than it is rather than a stale result passing as
+    fresh. Results are stamped with the time they arrived, or without the
+    callback with the time of the frame they came with (the `stamp` given
+    to `on_frame()`, the time it was called by default).
+
+    The drawing, the tracker, the verifications and the grasp
+    pre-checks then read that same result instead of asking the detector
+    each. Freshness is decided per read with `max_age` (seconds since the
+    stamp): a result that is fresh enough is answered right away, an
+    older one waits for the next result of the detector. `invalidate()`
+    makes every result older than now stale, after moving the robot or
+    the camera for instance.
+
+    `get_current_detections`, `find_objects` and `get_objects_names`
+    work like the ones of the detector, so the cache can be passed where
+    a detector is expected (`common.grasp.GraspPipeline`).
+    """
+
+    def __init__(self, detector, max_age=0.5, poll_period=0.02):
+        self.detector = detector
+        self.max_age = max_age
+        self.poll_period = poll_period
+        self.detections = []
+        self.stamp = None
+        self.results = 0
+        self.hits = 0
+        self.misses = 0
+        self._key = None
+        self._frame_results = 0
+        self._valid_from = None
+        # One call per inference, when the SDK has it
+        self.pushed = hasattr(detector, 'set_detections_callback')
+        if self.pushed:
+            detector.set_detections_callback(callback=self._on_result,
+                                             as_dict=True,
+                                             call_without_detections=True)
+
+
+    def on_frame(self, img=None, stamp=None):
+        """Frame listener hook, returns `True` when a new result of the
+        detector arrived since the last frame."""
+        self.poll(stamp)
+        new = self.results != self._frame_results
+        self._frame_results = self.results
+        return new
+
+
+    def poll(self, stamp=None):
+        """Read the detector without the callback, `True` if its result
+        is new. The result is stamped with `stamp`, now by default."""
+        if self.pushed:
+            return False
+        detections = self.detector.get_current_detections()
+        key = _result_key(detections)
+        if key == self._key:
+            return False
+        self._key = key
+        self._record(detections, stamp)
+        return True
+
+
+    def age(self):
+        """Seconds since the current result arrived, `None` without
+        results or after `invalidate()`."""
+        if self.stamp is None or (self._valid_from is not None
+                                  and self.stamp < self._valid_from):
+            return None
+        return time.monotonic() - self.stamp
+
+
+    def latest(self, objects=None, max_age=None):
+        """Detections of the current result (only of `objects` if given)
+        if it's not older than `max_age`, `None` otherwise."""
+        max_age = self.max_age if max_age is None else max_age
+        age = self.age()
+        if age is None or age > max_age:
+            return None
+        return self._select(objects)
+
+
+    async def fresh(self, objects=None, max_age=None, timeout=None):
+        """Detections (of `objects` if given) from a result not older than
+        `max_age`. When the current result is older, or doesn't have any
+        of `objects`, wait up to `timeout` seconds for a result of the
+        detector that does. Returns `[]` on timeout."""
+        found = self.latest(objects, max_age)
+        if found is not None and (found or objects is None):
+            self.hits += 1
+            return found
+        self.misses += 1
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            self.poll()
+            found = self.latest(objects, max_age)
+            if found is not None and (found or objects is None):
+                return found
+            await asyncio.sleep(self.poll_period)
+        return []
+
+
+    def invalidate(self):
+        self._valid_from = time.monotonic()
+
+
+    ## Detector interface
+    def get_current_detections(self):
+        self.poll()
+        return self.detections
+
+
+    async def find_objects(self, objects, callback=None, wait=False,
+                           timeout=0.0):
+        if not wait:
+            return await self.detector.find_objects(objects, callback=callback,
+                                                    wait=False)
+        return await self.fresh(objects, timeout=timeout or None)
+
+
+    def cancel_find_objects(self):
+        self.detector.cancel_find_objects()
+
+
+    def get_objects_names(self):
+        return self.detector.get_objects_names()
+
+
+    def _on_result(self, detections, *args):
+        if isinstance(detections, dict):
+            detections = list(detections.values())
+        self._record(detections)
+
+
+    def _record(self, detections, stamp=None):
+        self.detections = list(detections or [])
+        self.stamp = time.monotonic() if stamp is None else stamp
+        self.results += 1
+
+
+    def _select(self, objects):
+        if objects is None:
+            return list(self.detections)
+        return [d for d in self.detections if d['object_name'] in objects]
+
+
+def _result_key(detections):
+    # What tells two results of the detector apart
+    detections = detections or []
+    if any('timestamp' in d for d in detections):
+        return tuple(d.get('timestamp') for d in detections)
+    return tuple((d['object_name'], d['confidence'], d['x_min'], d['y_min'],
+                  d['x_max'], d['y_max']) for d in detections)
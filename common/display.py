@@ -0,0 +1,137 @@
+import threading
+from collections import deque
+
+import cv2
+
+from raya.tools.image import show_image
+
+
+BOX_COLOR = (0, 255, 0)
+TEXT_COLOR = (0, 0, 255)
+# HighGUI backends whose windows can be driven from a thread other than
+# the main one, Qt and Cocoa can't
+THREADED_UI = ('GTK', 'GTK2', 'GTK3', 'WIN32')
+
+
+def annotate(img, detections, scale=1.0):
+    """Draw the boxes and names of `detections` on `img`, in place.
+    `scale` is the scale of `img` relative to the detections frame."""
+    for detection in detections:
+        x_min = int(detection['x_min'] * scale)
+        y_min = int(detection['y_min'] * scale)
+        x_max = int(detection['x_max'] * scale)
+        y_max = int(detection['y_max'] * scale)
+        cv2.rectangle(img, (x_min, y_min), (x_max, y_max), BOX_COLOR, 2)
+        cv2.putText(img, detection['object_name'], (x_min, y_min - 5),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, TEXT_COLOR, 2)
+    return img
+
+
+def threaded_ui():
+    """Whether the HighGUI backend of OpenCV can show windows from a
+    thread, `False` when it can't be told."""
+    framework = getattr(cv2, 'currentUIFramework', None)
+    return framework is not None and framework().upper() in THREADED_UI
+
+
+class DisplayWorker:
+    """Annotates and shows camera frames in a dedicated thread.
+
+    `submit()` only queues the frame and its detections, so it can be
+    called from the camera callback without delaying the event loop. The
+    queue holds `maxsize` frames, when it is full the oldest frame is
+    dropped. Frames are resized before drawing when `scale < 1`.
+
+    `show` runs in the thread, which needs a HighGUI backend that allows
+    it (GTK, Win32). With other backends (Qt, Cocoa) or when the backend
+    is unknown, `threaded` defaults to `False` and `submit()` draws and
+    shows the frame inline, in the calling thread. Pass `threaded=True`
+    for a `show` that doesn't use HighGUI.
+    """
+
+    def __init__(self, title, scale=1.0, maxsize=2, show=show_image,
+                 threaded=None):
+        self.title = title
+        self.scale = scale
+        self.threaded = threaded_ui() if threaded is None else threaded
+        self.submitted = 0
+        self.shown = 0
+        self.dropped = 0
+        self.errors = 0
+        self._show = show
+        self._queue = deque(maxlen=maxsize)
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = None
+
+
+    def start(self):
+        if self.threaded and self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run,
+                                            name=f'display:{self.title}',
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+
+    def stop(self, timeout=1.0):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+    def submit(self, img, detections=()):
+        if not self.threaded:
+            self.submitted += 1
+            self._render(img, detections)
+            return
+        with self._condition:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append((img, list(detections)))
+            self.submitted += 1
+            self._condition.notify()
+
+
+    def stats(self):
+        return {
+            'submitted': self.submitted,
+            'shown': self.shown,
+            'dropped': self.dropped,
+            'errors': self.errors,
+        }
+
+
+    def render(self, img, detections):
+        if self.scale < 1.0:
+            # Fewer pixels to draw and show, and a new image to draw on
+            img = cv2.resize(img, None, fx=self.scale, fy=self.scale,
+                             interpolation=cv2.INTER_AREA)
+            self._show(annotate(img, detections, self.scale), self.title)
+        else:
+            img = annotate(img.copy(), detections)
+            self._show(img, self.title, scale=self.scale)
+
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and not self._queue:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                img, detections = self._queue.popleft()
+            self._render(img, detections)
+
+
+    def _render(self, img, detections):
+        try:
+            self.render(img, detections)
+            self.shown += 1
+        except Exception:
+            # A broken frame must not stop the display
+            self.errors += 1
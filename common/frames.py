@@ -0,0 +1,129 @@
+import time
+import asyncio
+import threading
+
+import numpy as np
+
+
+class FrameBuffer:
+    """Latest `capacity` frames of a camera.
+
+    Use `append` as the color frame listener: it only stores a reference to
+    the frame and its arrival time in preallocated slots, so the camera
+    callback returns immediately whatever the consumers do. Consumers take
+    the newest frame (`latest`) or wait for one newer than the last they
+    took (`next`). Frames that were never taken are counted as dropped.
+    """
+
+    def __init__(self, capacity=3):
+        self.capacity = capacity
+        self._frames = [None] * capacity
+        self._stamps = np.zeros(capacity)
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self._taken = -1
+        self._waiters = []
+        self._loop = None
+        self._thread = None
+
+
+    @classmethod
+    def listen(cls, cameras, camera_name, capacity=3):
+        """Create a buffer fed by the color frame listener of a camera."""
+        frames = cls(capacity)
+        frames.bind_loop()
+        cameras.create_color_frame_listener(camera_name=camera_name,
+                                            callback=frames.append)
+        return frames
+
+
+    def bind_loop(self):
+        # Frames may come from another thread, waiters live in this loop
+        self._loop = asyncio.get_event_loop()
+        self._thread = threading.get_ident()
+
+
+    def __len__(self):
+        return min(self.received, self.capacity)
+
+
+    def append(self, frame, timestamp=None):
+        seq = self.received
+        i = seq % self.capacity
+        self._frames[i] = frame
+        self._stamps[i] = time.monotonic() if timestamp is None else timestamp
+        self.received += 1
+        if self._waiters:
+            if self._loop is None or threading.get_ident() == self._thread:
+                self._wake()
+            else:
+                self._loop.call_soon_threadsafe(self._wake)
+
+
+    def latest(self):
+        """`(frame, timestamp)` of the newest frame, `(None, None)` if no
+        frame arrived yet."""
+        if not self.received:
+            return None, None
+        return self._take(self.received - 1)
+
+
+    async def next(self, timeout=None):
+        """Wait for a frame newer than the last one taken and return
+        `(frame, timestamp)`. Returns at once if there is one already."""
+        if self.received - 1 > self._taken:
+            return self._take(self.received - 1)
+        if self._loop is None:
+            self.bind_loop()
+        waiter = self._loop.create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        return self._take(self.received - 1)
+
+
+    def window(self, k=None):
+        """Up to `k` newest frames, `[(frame, timestamp), ...]` oldest
+        first. Does not count as taking them."""
+        k = len(self) if k is None else min(k, len(self))
+        slots = [(self.received - k + j) % self.capacity for j in range(k)]
+        return [(self._frames[i], self._stamps[i]) for i in slots]
+
+
+    def age(self):
+        """Seconds since the newest frame arrived, `None` without frames."""
+        if not self.received:
+            return None
+        return time.monotonic() - self._stamps[(self.received - 1)
+                                               % self.capacity]
+
+
+    def stats(self):
+        age = self.age()
+        return {
+            'received': self.received,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'age_ms': None if age is None else age * 1000.0,
+        }
+
+
+    def _take(self, seq):
+        i = seq % self.capacity
+        if seq > self._taken:
+            # Frames between the last taken and this one were skipped
+            self.dropped += max(0, seq - self._taken - 1)
+            self._taken = seq
+            self.delivered += 1
+        return self._frames[i], self._stamps[i]
+
+
+    def _wake(self):
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
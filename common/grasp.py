@@ -0,0 +1,133 @@
+import math
+import time
+import asyncio
+
+from raya.enumerations import POS_UNIT
+from raya.exceptions import RayaGraspingException
+
+from common.completion import run_until_finished
+from common.retry import LatencyHistogram, RetryBudget
+
+
+class GraspPipeline:
+    """Pick attempts with concurrent pre-checks and a budget per target.
+
+    Before each attempt, and at the same time, the object must be seen
+    again by `detector` within `max_age` seconds (a detection that
+    arrives after the check started, or a cached one still fresh when
+    `detector` is a `common.detections.DetectionCache`, no check if
+    `None`), at least one of the arms must be free, and the
+    object must be within `reach` meters of the robot (when `nav` is
+    given, from the fresh detection or else the `position` given to
+    `pick`). An attempt whose pre-checks fail is a failed attempt that
+    costs no pick. Failed attempts are retried with the backoff of
+    `budget` (a `RetryBudget`), the tries of each target counted apart.
+    The latencies of the pre-checks, the picks and the whole attempts go
+    to the `histograms`.
+    """
+
+    def __init__(self, grasp, arms, detector, nav=None, budget=None,
+                 max_age=1.0, reach=1.2, callback_feedback=None,
+                 callback_finish=None):
+        self.grasp = grasp
+        self.arms = arms
+        self.detector = detector
+        self.nav = nav
+        self.budget = RetryBudget() if budget is None else budget
+        self.max_age = max_age
+        self.reach = reach
+        self.callback_feedback = callback_feedback
+        self.callback_finish = callback_finish
+        self.histograms = {'checks': LatencyHistogram(),
+                           'pick': LatencyHistogram(),
+                           'attempt': LatencyHistogram()}
+        self.failures = []
+
+
+    async def pick(self, object_name, detector_model, source, arms,
+                   target=None, position=None):
+        """Pick `object_name` with one of `arms`, retrying within the
+        budget of `target` (the object name by default). Returns the
+        arguments of the pick finish callback of the last attempt,
+        `(error, error_msg, result)`, with `result` `None` when the
+        pre-checks failed."""
+        target = object_name if target is None else target
+        result = (-1, f'No tries left for {target!r}', None)
+        while await self.budget.next_try(target):
+            t0 = time.monotonic()
+            checks = await self.pre_checks(object_name, arms, position)
+            self.histograms['checks'].record(time.monotonic() - t0,
+                                             checks['ok'])
+            if checks['ok']:
+                result = await self._pick(detector_model, source,
+                                          object_name, checks['arms'])
+            else:
+                result = (-1, checks['reason'], None)
+            self.histograms['attempt'].record(time.monotonic() - t0,
+                                              result[0] == 0)
+            if result[0] == 0:
+                return result
+            self.failures.append((target, result[1]))
+        return result
+
+
+    async def pre_checks(self, object_name, arms, position=None):
+        """Run the checks of an attempt concurrently. Returns a dict with
+        `ok`, the failure `reason`, the fresh `detection` and the free
+        `arms`."""
+        detections, robot = await asyncio.gather(
+            self._detections(object_name), self._position())
+        free = [arm for arm in arms if not self.arms.is_arm_in_execution(arm)]
+        checks = {'ok': False, 'reason': '', 'arms': free,
+                  'detection': detections[0] if detections else None}
+        if checks['detection'] is not None:
+            position = checks['detection']['center_point_map']
+        if self.max_age is not None and not detections:
+            checks['reason'] = (f'{object_name} not seen in the last '
+                                f'{self.max_age} s')
+        elif not free:
+            checks['reason'] = 'No free arm'
+        elif self.grasp.is_grasping():
+            checks['reason'] = 'A grasping action is in execution'
+        elif (robot is not None and position is not None
+              and math.hypot(position[0] - robot['x'],
+                             position[1] - robot['y']) > self.reach):
+            checks['reason'] = f'{object_name} out of reach'
+        else:
+            checks['ok'] = True
+        return checks
+
+
+    def report(self):
+        report = {name: histogram.summary()
+                  for name, histogram in self.histograms.items()}
+        report['failures'] = list(self.failures)
+        return report
+
+
+    async def _pick(self, detector_model, source, object_name, arms):
+        t0 = time.monotonic()
+        try:
+            result = await run_until_finished(
+                self.grasp.pick_object, detector_model=detector_model,
+                source=source, object_name=object_name, arms=arms,
+                callback_feedback=self.callback_feedback,
+                callback_finish=self.callback_finish)
+        except RayaGraspingException as e:
+            result = (-1, str(e), None)
+        self.histograms['pick'].record(time.monotonic() - t0, result[0] == 0)
+        return result
+
+
+    async def _detections(self, object_name):
+        if self.max_age is None:
+            return []
+        return await self.detector.find_objects([object_name], wait=True,
+                                                timeout=self.max_age)
+
+
+    async def _position(self):
+        if self.nav is None:
+            return None
+        return await self.nav.get_position(pos_unit=POS_UNIT.METERS)
+
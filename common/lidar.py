@@ -0,0 +1,115 @@
+import math
+
+import numpy as np
+
+from raya.enumerations import ANG_UNIT
+
+
+TWO_PI = 2.0 * math.pi
+
+
+class LidarSectors:
+    """Checks many obstacle sectors over one lidar scan in a single pass.
+
+    Sectors are `(lower_angle, upper_angle, upper_distance)` tuples with the
+    same meaning as the arguments of `LidarController.check_obstacle`. The
+    angle of every ray is computed once from `get_laser_info()` and each
+    sector is turned into index runs of the scan, so evaluating a scan is a
+    couple of `reduceat` calls, regardless of the number of sectors.
+    """
+
+    def __init__(self, laser_info, sectors=(), ang_unit=ANG_UNIT.DEG,
+                 laser_info_unit=ANG_UNIT.DEG):
+        to_rad = math.radians if laser_info_unit == ANG_UNIT.DEG else float
+        self.angle_min = to_rad(laser_info['angle_min'])
+        self.angle_max = to_rad(laser_info['angle_max'])
+        self.ang_unit = ang_unit
+        self._num_points = None
+        self._angles = None
+        self._buffer = None
+        self.set_sectors(sectors)
+
+
+    @classmethod
+    def uniform(cls, laser_info, count, upper_distance,
+                laser_info_unit=ANG_UNIT.DEG):
+        """`count` sectors of the same width covering the whole circle,
+        the first one starting at 0 degrees."""
+        width = 360.0 / count
+        sectors = [(i * width, (i + 1) * width, upper_distance)
+                   for i in range(count)]
+        return cls(laser_info, sectors, ANG_UNIT.DEG, laser_info_unit)
+
+
+    def __len__(self):
+        return len(self.sectors)
+
+
+    def set_sectors(self, sectors):
+        self.sectors = [tuple(sector) for sector in sectors]
+        limits = np.array([s[:2] for s in self.sectors], float).reshape(-1, 2)
+        if self.ang_unit == ANG_UNIT.DEG:
+            limits = np.radians(limits)
+        self._limits = limits
+        self._distances = np.array([s[2] for s in self.sectors], float)
+        if self._num_points is not None:
+            self._build_runs()
+
+
+    def angles(self, num_points):
+        """Angle (radians) of every ray of a scan with `num_points` rays,
+        as `np.linspace(angle_min, angle_max, num_points)`, cached."""
+        if num_points != self._num_points:
+            self._num_points = num_points
+            self._angles = np.linspace(self.angle_min, self.angle_max,
+                                       num_points)
+            self._angles.flags.writeable = False
+            # Extra slot so runs that end at the last ray are valid indices
+            self._buffer = np.full(num_points + 1, np.inf)
+            self._build_runs()
+        return self._angles
+
+
+    def evaluate(self, raw_data):
+        """Return `(min_ranges, hits)`: the closest range inside every
+        sector (`inf` if none) and whether it is within the sector
+        `upper_distance`, as arrays in the order of the sectors."""
+        self.angles(len(raw_data))
+        ranges = self._buffer
+        ranges[:-1] = raw_data
+        min_ranges = np.full(len(self.sectors), np.inf)
+        if self._bounds.size:
+            # fmin ignores the NaN rays some lidars report
+            run_min = np.fmin.reduceat(ranges, self._bounds)[::2]
+            min_ranges[self._owners] = np.fmin.reduceat(run_min,
+                                                        self._first_runs)
+        return min_ranges, min_ranges <= self._distances
+
+
+    def _build_runs(self):
+        # Contiguous index runs [start, end) of the rays of every sector
+        wrapped = np.mod(self._angles, TWO_PI)
+        bounds, owners, first_runs = [], [], []
+        for i, (lower, upper) in enumerate(self._limits):
+            mask = self._sector_mask(wrapped, lower, upper)
+            edges = np.flatnonzero(np.diff(np.concatenate(
+                ([False], mask, [False])).astype(np.int8)))
+            if not edges.size:
+                continue
+            owners.append(i)
+            first_runs.append(len(bounds) // 2)
+            bounds.extend(edges.tolist())
+        self._bounds = np.array(bounds, np.intp)
+        self._owners = np.array(owners, np.intp)
+        self._first_runs = np.array(first_runs, np.intp)
+
+
+    @staticmethod
+    def _sector_mask(wrapped, lower, upper):
+        if upper - lower >= TWO_PI:
+            return np.ones(wrapped.shape, bool)
+        lower %= TWO_PI
+        upper %= TWO_PI
+        if lower <= upper:
+            return (wrapped >= lower) & (wrapped <= upper)
+        return (wrapped >= lower) | (wrapped <= upper)
@@ -0,0 +1,136 @@
+import math
+import time
+
+import numpy as np
+
+from raya.enumerations import ANG_UNIT
+
+
+class ScanHistory:
+    """Last `capacity` lidar scans, with their timestamps and robot poses.
+
+    Every scan is written twice, at `i` and `i + capacity` of buffers twice
+    as long as the history, so the last `k` scans are always contiguous:
+    `append()` copies one scan whatever the capacity, and `window()`
+    returns views, oldest scan first, without copying anything. The
+    buffers are allocated on the first append, sized as that scan.
+    """
+
+    def __init__(self, capacity, num_points=None, ang_unit=ANG_UNIT.DEG):
+        self.capacity = capacity
+        # Unit of the 'angle' of the poses, as returned by get_position
+        self.ang_unit = ang_unit
+        self.count = 0
+        self._next = 0
+        self._ranges = None
+        if num_points is not None:
+            self._allocate(num_points)
+
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+
+    @property
+    def num_points(self):
+        return None if self._ranges is None else self._ranges.shape[1]
+
+
+    def append(self, raw_data, timestamp=None, pose=None):
+        """Record a scan from `get_raw_data()`. `pose` is the dict returned
+        by `nav.get_position()`, or an `(x, y, angle)` tuple. NaN ranges
+        are stored as `inf`."""
+        if self._ranges is None:
+            self._allocate(len(raw_data))
+        i = self._next
+        j = i + self.capacity
+        row = self._ranges[i]
+        row[:] = raw_data
+        np.isnan(row, out=self._nan)
+        np.copyto(row, np.inf, where=self._nan)
+        self._ranges[j] = row
+        self._stamps[i] = self._stamps[j] = (time.monotonic()
+                                             if timestamp is None
+                                             else timestamp)
+        if pose is None:
+            self._poses[i] = self._poses[j] = np.nan
+        else:
+            if isinstance(pose, dict):
+                pose = (pose['x'], pose['y'], pose['angle'])
+            x, y, angle = pose
+            if self.ang_unit == ANG_UNIT.DEG:
+                angle = math.radians(angle)
+            self._poses[i] = self._poses[j] = (x, y, angle)
+        self._next = (i + 1) % self.capacity
+        self.count += 1
+
+
+    def window(self, k=None):
+        """Views `(ranges, timestamps, poses)` of the last `k` scans (all
+        of them by default), oldest first. Poses are `(x, y, yaw)` with the
+        yaw in radians, NaN when the scan was recorded without pose. The
+        views are overwritten by later appends."""
+        if self._ranges is None:
+            return np.empty((0, 0)), np.empty(0), np.empty((0, 3))
+        size = len(self)
+        k = size if k is None else min(k, size)
+        end = self._next + self.capacity
+        window = slice(end - k, end)
+        return self._ranges[window], self._stamps[window], self._poses[window]
+
+
+    def latest(self):
+        """`(ranges, timestamp, pose)` of the newest scan, as views."""
+        if not self.count:
+            raise IndexError('The history is empty')
+        ranges, stamps, poses = self.window(1)
+        return ranges[0], stamps[0], poses[0]
+
+
+    def since(self, timestamp):
+        """Like `window()`, with the scans recorded after `timestamp`."""
+        stamps = self.window()[1]
+        return self.window(len(stamps) - np.searchsorted(stamps, timestamp,
+                                                         side='right'))
+
+
+    def median(self, k, out=None):
+        """Per ray median of the last `k` scans, e.g. to drop obstacles
+        seen in a single scan. Uses preallocated buffers, `out` if given,
+        so it does not allocate when called every loop."""
+        if self._ranges is None:
+            raise IndexError('The history is empty')
+        ranges = self.window(k)[0]
+        k = len(ranges)
+        if out is None:
+            out = self._median
+        if not k:
+            out[:] = np.inf
+            return out
+        # Rays along the rows, so every partition runs on contiguous memory
+        scratch = self._scratch[:, :k]
+        scratch[:] = ranges.T
+        middle = k // 2
+        if k % 2:
+            scratch.partition(middle, axis=1)
+            out[:] = scratch[:, middle]
+        else:
+            scratch.partition((middle - 1, middle), axis=1)
+            np.add(scratch[:, middle - 1], scratch[:, middle], out=out)
+            out *= 0.5
+        return out
+
+
+    def clear(self):
+        self.count = 0
+        self._next = 0
+
+
+    def _allocate(self, num_points):
+        size = 2 * self.capacity
+        self._ranges = np.full((size, num_points), np.inf)
+        self._stamps = np.zeros(size)
+        self._poses = np.full((size, 3), np.nan)
+        self._scratch = np.empty((num_points, self.capacity))
+        self._median = np.empty(num_points)
+        self._nan = np.empty(num_points, bool)
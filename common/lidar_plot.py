@@ -0,0 +1,77 @@
+import math
+
+import numpy as np
+import matplotlib
+import matplotlib.pyplot as plt
+
+
+# Same orientation the examples used with `-theta - 1.578`: front of the
+# robot (theta 0) at the bottom, angles growing clockwise
+THETA_OFFSET = -1.578
+THETA_DIRECTION = -1
+
+
+class LidarPlot:
+    """Real time polar plot of lidar scans.
+
+    The figure and the scatter artist are created once. Every `update()`
+    only moves the points and redraws the scatter over a saved background
+    (blitting), instead of clearing and redrawing the whole figure. Scans
+    with more than `max_points` rays are decimated before drawing. Works
+    with non interactive backends (Agg) too, nothing is shown then.
+    """
+
+    def __init__(self, range_max=10.0, max_points=None, point_size=2,
+                 title=None):
+        self.max_points = max_points
+        self.fig = plt.figure()
+        self.ax = self.fig.add_subplot(111, projection='polar')
+        self.ax.set_theta_offset(THETA_OFFSET)
+        self.ax.set_theta_direction(THETA_DIRECTION)
+        self.ax.set_ylim(0.0, range_max)
+        if title is not None:
+            self.ax.set_title(title)
+        self.scatter = self.ax.scatter([], [], s=point_size, animated=True)
+        self.frames = 0
+        self._background = None
+        self._interactive = (matplotlib.get_backend().lower() not in
+                             ('agg', 'pdf', 'ps', 'svg', 'cairo', 'template'))
+        # The background is saved again whenever the figure is fully
+        # redrawn, e.g. after the window is resized
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+        if self._interactive:
+            plt.show(block=False)
+            plt.pause(0.001)
+        else:
+            self.fig.canvas.draw()
+
+
+    def update(self, theta, ranges):
+        """Draw a scan, `theta` in radians as given by the lidar."""
+        theta = np.asarray(theta)
+        ranges = np.asarray(ranges)
+        if self.max_points and len(ranges) > self.max_points:
+            step = math.ceil(len(ranges) / self.max_points)
+            theta = theta[::step]
+            ranges = ranges[::step]
+        valid = np.isfinite(ranges)
+        self.scatter.set_offsets(np.column_stack((theta[valid],
+                                                  ranges[valid])))
+        canvas = self.fig.canvas
+        if self._background is None:
+            canvas.draw()
+        canvas.restore_region(self._background)
+        self.ax.draw_artist(self.scatter)
+        canvas.blit(self.fig.bbox)
+        if self._interactive:
+            canvas.flush_events()
+        self.frames += 1
+
+
+    def close(self):
+        plt.close(self.fig)
+
+
+    def _on_draw(self, event):
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self.ax.draw_artist(self.scatter)
@@ -0,0 +1,214 @@
+import os
+import json
+import time
+import asyncio
+
+import numpy as np
+
+
+CACHE_DIR = os.environ.get('RAYA_MAP_CACHE',
+                           os.path.join(os.path.expanduser('~'), '.cache',
+                                        'raya_maps'))
+# Seconds a cached map, zones or locations are used before reading them
+# from the controller again
+MAX_AGE = 3600.0
+
+
+class MapCache:
+    """Local copy of the maps of the navigation controller.
+
+    The map image and info from `nav.get_map()` and the zones and locations
+    of a map are stored on disk, in `directory/<map_name>@<version>`. The
+    image is saved as a `.npy` file and loaded memory-mapped (read only),
+    so later launches of the apps neither transfer it again nor read it
+    whole. `version` tells maps with the same name apart, change it when
+    the map is rebuilt. Zones and locations are fetched concurrently with
+    one request each and the lists are derived from them.
+
+    Entries older than `max_age` seconds (`None` to keep them) are read
+    from the controller again, and `refresh` ignores the entries on disk
+    of a previous run. The zones and locations on disk are also checked
+    against `get_zones_list()` and `get_locations_list()` of the
+    controller when loaded, so zones or locations added or deleted by
+    another app or the robot UI are seen at once. Changes made by the app
+    should go through `save_zone()`, `save_location()`, `delete_zone()`
+    and `delete_location()` of the cache, which call the controller and
+    drop the cached metadata of the map.
+    """
+
+    def __init__(self, nav, directory=CACHE_DIR, version='0', max_age=MAX_AGE,
+                 refresh=False):
+        self.nav = nav
+        self.directory = directory
+        self.version = str(version)
+        self.max_age = max_age
+        self.refresh = refresh
+        self._created = time.time()
+        self.hits = 0
+        self.misses = 0
+        self._metadata = {}
+
+
+    ## Map image
+    async def get_map(self, map_name, refresh=False):
+        """`(image, map_info)` as `nav.get_map()`, the image is read only."""
+        path = self._path(map_name)
+        image_file = os.path.join(path, 'map.npy')
+        info_file = os.path.join(path, 'map_info.json')
+        if not refresh and self._fresh(info_file):
+            try:
+                image = np.load(image_file, mmap_mode='r')
+                with open(info_file) as f:
+                    map_info = json.load(f)
+            except (OSError, ValueError):
+                pass
+            else:
+                self.hits += 1
+                return image, map_info
+        self.misses += 1
+        image, map_info = await self.nav.get_map(map_name)
+        os.makedirs(path, exist_ok=True)
+        _replace(image_file, lambda f: np.save(f, image))
+        _replace(info_file, lambda f: f.write(json.dumps(map_info).encode()))
+        return np.load(image_file, mmap_mode='r'), map_info
+
+
+    ## Zones and locations
+    async def get_zones(self, map_name):
+        return (await self._get_metadata(map_name))['zones']
+
+
+    async def get_locations(self, map_name):
+        return (await self._get_metadata(map_name))['locations']
+
+
+    async def get_zones_list(self, map_name):
+        return list(await self.get_zones(map_name))
+
+
+    async def get_locations_list(self, map_name):
+        return list(await self.get_locations(map_name))
+
+
+    async def save_zone(self, zone_name, points, **kwargs):
+        try:
+            return await self.nav.save_zone(zone_name=zone_name,
+                                            points=points, **kwargs)
+        finally:
+            # No map name, it is a zone of the current map
+            self.invalidate(await self._current_map())
+
+
+    async def save_location(self, location_name, x, y, angle, **kwargs):
+        try:
+            return await self.nav.save_location(location_name=location_name,
+                                                x=x, y=y, angle=angle,
+                                                **kwargs)
+        finally:
+            self.invalidate(await self._current_map())
+
+
+    async def delete_zone(self, map_name, location_name):
+        try:
+            return await self.nav.delete_zone(map_name=map_name,
+                                              location_name=location_name)
+        finally:
+            self.invalidate(map_name)
+
+
+    async def delete_location(self, map_name, location_name):
+        try:
+            return await self.nav.delete_location(map_name=map_name,
+                                                  location_name=location_name)
+        finally:
+            self.invalidate(map_name)
+
+
+    def invalidate(self, map_name=None, image=False):
+        """Drop the zones and locations of `map_name` (every map when
+        `None`), and the image too when `image`."""
+        if map_name is None:
+            names = set(self._metadata)
+            try:
+                suffix = f'@{self.version}'
+                names.update(entry[:-len(suffix)]
+                             for entry in os.listdir(self.directory)
+                             if entry.endswith(suffix))
+            except OSError:
+                pass
+        else:
+            names = [map_name]
+        files = ['metadata.json']
+        if image:
+            files += ['map.npy', 'map_info.json']
+        for name in names:
+            self._metadata.pop(name, None)
+            for file in files:
+                try:
+                    os.remove(os.path.join(self._path(name), file))
+                except OSError:
+                    pass
+
+
+    async def _get_metadata(self, map_name):
+        metadata = self._metadata.get(map_name)
+        if metadata is not None:
+            self.hits += 1
+            return metadata
+        metadata_file = os.path.join(self._path(map_name), 'metadata.json')
+        metadata = None
+        if self._fresh(metadata_file):
+            try:
+                with open(metadata_file) as f:
+                    metadata = json.load(f)
+            except (OSError, ValueError):
+                pass
+        if metadata is not None:
+            # Zones or locations added or deleted since it was saved
+            zones_list, locations_list = await asyncio.gather(
+                self.nav.get_zones_list(map_name),
+                self.nav.get_locations_list(map_name))
+            if (set(zones_list) != set(metadata['zones'])
+                    or set(locations_list) != set(metadata['locations'])):
+                metadata = None
+        if metadata is None:
+            self.misses += 1
+            zones, locations = await asyncio.gather(
+                self.nav.get_zones(map_name),
+                self.nav.get_locations(map_name))
+            metadata = {'zones': zones, 'locations': locations}
+            os.makedirs(self._path(map_name), exist_ok=True)
+            _replace(metadata_file,
+                     lambda f: f.write(json.dumps(metadata).encode()))
+        else:
+            self.hits += 1
+        self._metadata[map_name] = metadata
+        return metadata
+
+
+    async def _current_map(self):
+        # `None` (every map) if the status doesn't tell
+        status = await self.nav.get_status()
+        return (status or {}).get('map_name')
+
+
+    def _fresh(self, path):
+        try:
+            saved = os.path.getmtime(path)
+        except OSError:
+            return False
+        if self.refresh and saved < self._created:
+            return False
+        return self.max_age is None or time.time() - saved <= self.max_age
+
+
+    def _path(self, map_name):
+        return os.path.join(self.directory, f'{map_name}@{self.version}')
+
+
+def _replace(path, write):
+    # Readers never see a half written file
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        write(f)
+    os.replace(tmp, path)
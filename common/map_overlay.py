@@ -0,0 +1,78 @@
+import math
+
+import cv2
+
+
+ROBOT_COLOR = (255, 0, 0)
+HEADING_COLOR = (0, 0, 255)
+ARROW_COLOR = (0, 150, 0)
+
+
+class MapOverlay:
+    """Draws the robot and the goal arrow of `nav_to_click` over the map.
+
+    The map is copied once into the frame that is shown. Every `draw()`
+    only restores from the map the rectangles covered by the previous
+    marker and arrow and draws the new ones, instead of copying the whole
+    map, so the cost depends on the size of the overlay and not of the
+    map. With `scale < 1` the map is downscaled once and the frame is a
+    smaller viewport of it, positions are still given in map pixels.
+    """
+
+    def __init__(self, map_image, scale=1.0):
+        self.scale = scale
+        if scale != 1.0:
+            map_image = cv2.resize(map_image, None, fx=scale, fy=scale,
+                                   interpolation=cv2.INTER_AREA)
+        self.base = map_image
+        self.frame = map_image.copy()
+        self._dirty = []
+
+
+    def to_map(self, point):
+        """Map pixel of a point of the frame, e.g. a mouse click."""
+        return (int(round(point[0] / self.scale)),
+                int(round(point[1] / self.scale)))
+
+
+    def to_view(self, point):
+        return (int(round(point[0] * self.scale)),
+                int(round(point[1] * self.scale)))
+
+
+    def draw(self, x, y, angle, arrow=None):
+        """Frame with the robot at map pixel `(x, y)`, heading `angle`
+        (radians), and `arrow` (a pair of map pixels) when given. The
+        returned frame is reused by the next call."""
+        for x_min, y_min, x_max, y_max in self._dirty:
+            self.frame[y_min:y_max, x_min:x_max] = \
+                self.base[y_min:y_max, x_min:x_max]
+        self._dirty = []
+
+        center = self.to_view((x, y))
+        heading = (center[0] + int(7 * math.cos(-angle)),
+                   center[1] + int(7 * math.sin(-angle)))
+        cv2.circle(self.frame, center, 8, ROBOT_COLOR, 2)
+        cv2.line(self.frame, center, heading, HEADING_COLOR, 4)
+        self._mark((center,), 8 + 2)
+        self._mark((center, heading), 4)
+        if arrow is not None:
+            start, end = self.to_view(arrow[0]), self.to_view(arrow[1])
+            cv2.arrowedLine(self.frame, start, end, ARROW_COLOR, 3)
+            # The tip is 10 % of the length long
+            tip = 0.1 * math.hypot(end[0] - start[0], end[1] - start[1])
+            self._mark((start, end), 3 + int(math.ceil(tip)))
+        return self.frame
+
+
+    def _mark(self, points, margin):
+        # Bounding box of the points plus `margin`, clipped to the frame
+        height, width = self.frame.shape[:2]
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        x_min = max(min(xs) - margin, 0)
+        y_min = max(min(ys) - margin, 0)
+        x_max = min(max(xs) + margin + 1, width)
+        y_max = min(max(ys) + margin + 1, height)
+        if x_min < x_max and y_min < y_max:
+            self._dirty.append((x_min, y_min, x_max, y_max))
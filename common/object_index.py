@@ -0,0 +1,124 @@
+import math
+
+
+class MergedObject:
+    """Running mean of the map positions of one object seen many times."""
+
+    __slots__ = ('name', 'position', 'hits', 'cell')
+
+    def __init__(self, name, position, cell):
+        self.name = name
+        self.position = list(position)
+        self.hits = 1
+        self.cell = cell
+
+
+    def merge(self, position):
+        self.hits += 1
+        for i, value in enumerate(position):
+            self.position[i] += (value - self.position[i]) / self.hits
+
+
+    def __repr__(self):
+        return (f'MergedObject({self.name!r}, '
+                f'{[round(v, 3) for v in self.position]}, hits={self.hits})')
+
+
+class ObjectIndex:
+    """Per class spatial hash of object map positions.
+
+    Positions (`center_point_map` of the detections) are bucketed in a grid
+    of `radius` sized cells over x and y, so finding the objects closer than
+    `radius` to a point only looks at the 3x3 cells around it, whatever the
+    number of objects. `add()` merges a detection into the closest object
+    within `radius` of the same class, keeping a running mean of its
+    position and a hit count, or creates a new object.
+    """
+
+    def __init__(self, radius=1.0):
+        self.radius = radius
+        self._cells = {}
+        self._objects = {}
+
+
+    def __len__(self):
+        return sum(len(objects) for objects in self._objects.values())
+
+
+    def __iter__(self):
+        return iter(self._objects)
+
+
+    def __contains__(self, name):
+        return name in self._objects
+
+
+    def __getitem__(self, name):
+        """Mean positions of the objects of a class."""
+        return [obj.position for obj in self._objects[name]]
+
+
+    def add(self, name, position):
+        """Merge an observation, return `(object, is_new)`."""
+        obj = self.nearest(name, position)
+        if obj is None:
+            cell = self._cell(position)
+            obj = MergedObject(name, position, cell)
+            self._objects.setdefault(name, []).append(obj)
+            self._cells.setdefault(name, {}).setdefault(cell, []).append(obj)
+            return obj, True
+        obj.merge(position)
+        cell = self._cell(obj.position)
+        if cell != obj.cell:
+            # The mean moved to another cell
+            cells = self._cells[name]
+            cells[obj.cell].remove(obj)
+            if not cells[obj.cell]:
+                del cells[obj.cell]
+            cells.setdefault(cell, []).append(obj)
+            obj.cell = cell
+        return obj, False
+
+
+    def nearest(self, name, position, radius=None):
+        """Closest object of the class within `radius`, `None` if none."""
+        best = None
+        best_distance = self.radius if radius is None else radius
+        for obj in self.query(name, position, radius):
+            distance = math.dist(obj.position, position)
+            if distance < best_distance:
+                best, best_distance = obj, distance
+        return best
+
+
+    def query(self, name, position, radius=None):
+        """Objects of the class closer than `radius` to `position`."""
+        radius = self.radius if radius is None else radius
+        cells = self._cells.get(name)
+        if not cells:
+            return []
+        reach = math.ceil(radius / self.radius)
+        cx, cy = self._cell(position)
+        found = []
+        for ix in range(cx - reach, cx + reach + 1):
+            for iy in range(cy - reach, cy + reach + 1):
+                for obj in cells.get((ix, iy), ()):
+                    if math.dist(obj.position, position) < radius:
+                        found.append(obj)
+        return found
+
+
+    def objects(self, name=None, min_hits=1):
+        names = self._objects if name is None else [name]
+        return [obj for n in names for obj in self._objects.get(n, ())
+                if obj.hits >= min_hits]
+
+
+    def clear(self):
+        self._cells.clear()
+        self._objects.clear()
+
+
+    def _cell(self, position):
+        return (math.floor(position[0] / self.radius),
+                math.floor(position[1] / self.radius))
@@ -0,0 +1,192 @@
+import time
+import asyncio
+import inspect
+
+import numpy as np
+
+from raya.enumerations import ANG_UNIT
+from raya.exceptions import RayaListenerAlreadyCreated, RayaListenerUnknown
+
+from common.lidar import LidarSectors
+
+
+class ObstacleDispatcher:
+    """Many obstacle listeners checked in a single pass per lidar scan.
+
+    Replaces one `create_obstacle_listener` per sector. Every scan all the
+    sectors are evaluated at once with `LidarSectors`, and each listener
+    goes through a small state machine before its callback is called:
+
+    - debounce: the obstacle must be seen (or gone) in `debounce`
+      consecutive scans before the state changes.
+    - hysteresis: an obstacle closer than `upper_distance` is only
+      considered gone once it is farther than `clear_distance`.
+    - rate limit: `callback` is called when the obstacle appears and then,
+      if `repeat` is set, at most every `min_interval` seconds while it
+      stays. `callback_clear` is called when it is gone.
+
+    Callbacks take no arguments, like the SDK listeners, async callbacks
+    are scheduled as tasks.
+    """
+
+    def __init__(self, lidar, laser_info=None, ang_unit=ANG_UNIT.DEG,
+                 log=None):
+        self.lidar = lidar
+        if laser_info is None:
+            laser_info = lidar.get_laser_info(ang_unit=ANG_UNIT.RAD)
+            laser_info_unit = ANG_UNIT.RAD
+        else:
+            laser_info_unit = ang_unit
+        self.scan_time = laser_info.get('scan_time', 0.1)
+        self.ang_unit = ang_unit
+        self.log = log
+        self.listeners = {}
+        self.sectors = LidarSectors(laser_info, ang_unit=ang_unit,
+                                    laser_info_unit=laser_info_unit)
+        self.evaluations = 0
+        self.callbacks_fired = 0
+        self.callbacks_suppressed = 0
+        self._names = []
+        self._blocked = self._seen = self._gone = self._last_fired = None
+        self._task = None
+        self._t_start = None
+
+
+    def create_obstacle_listener(self, listener_name, callback, lower_angle,
+                                 upper_angle, upper_distance,
+                                 clear_distance=None, debounce=1,
+                                 min_interval=0.0, repeat=False,
+                                 callback_clear=None):
+        if listener_name in self.listeners:
+            raise RayaListenerAlreadyCreated(
+                f'Listener \'{listener_name}\' already exist')
+        self.listeners[listener_name] = {
+            'sector': (lower_angle, upper_angle, upper_distance),
+            'callback': callback,
+            'callback_clear': callback_clear,
+            'clear_distance': (upper_distance if clear_distance is None
+                               else clear_distance),
+            'debounce': debounce,
+            'min_interval': min_interval,
+            'repeat': repeat,
+            'fired': 0,
+        }
+        self._rebuild()
+
+
+    def delete_listener(self, listener_name):
+        if listener_name not in self.listeners:
+            raise RayaListenerUnknown(f'Listener \'{listener_name}\' unknown')
+        del self.listeners[listener_name]
+        self._rebuild()
+
+
+    def start(self):
+        if self._task is None:
+            self._t_start = time.monotonic()
+            self._task = asyncio.ensure_future(self._run())
+
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+    def is_blocked(self, listener_name):
+        return bool(self._blocked[self._names.index(listener_name)])
+
+
+    def counters(self):
+        elapsed = (time.monotonic() - self._t_start) if self._t_start else 0.0
+        return {
+            'listeners': len(self.listeners),
+            'evaluations': self.evaluations,
+            'evaluations_per_s': (self.evaluations / elapsed
+                                  if elapsed else 0.0),
+            'callbacks_fired': self.callbacks_fired,
+            'callbacks_suppressed': self.callbacks_suppressed,
+        }
+
+
+    def process_scan(self, raw_data, now=None):
+        """Evaluate every listener on one scan and fire the callbacks."""
+        if not self._names:
+            return
+        now = time.monotonic() if now is None else now
+        min_ranges, hits = self.sectors.evaluate(raw_data)
+        clear = min_ranges > self._clear_distances
+        # Consecutive scans with / without the obstacle
+        self._seen = np.where(hits, self._seen + 1, 0)
+        self._gone = np.where(clear, self._gone + 1, 0)
+        appeared = ~self._blocked & (self._seen >= self._debounce)
+        vanished = self._blocked & (self._gone >= self._debounce)
+        self._blocked[appeared] = True
+        self._blocked[vanished] = False
+        due = appeared | (self._blocked & self._repeat)
+        self.evaluations += 1
+        for i in np.flatnonzero(due | vanished):
+            listener = self.listeners[self._names[i]]
+            if vanished[i]:
+                self._call(listener['callback_clear'])
+                continue
+            if now - self._last_fired[i] < listener['min_interval']:
+                self.callbacks_suppressed += 1
+                continue
+            self._last_fired[i] = now
+            listener['fired'] += 1
+            self.callbacks_fired += 1
+            self._call(listener['callback'])
+
+
+    async def _run(self):
+        due = time.monotonic()
+        while True:
+            due += self.scan_time
+            await asyncio.sleep(max(0.0, due - time.monotonic()))
+            self.process_scan(self.lidar.get_raw_data())
+
+
+    def _call(self, callback):
+        if callback is None:
+            return
+        try:
+            result = callback()
+            if inspect.isawaitable(result):
+                asyncio.ensure_future(result)
+        except Exception as e:
+            if self.log is None:
+                raise
+            self.log.error(f'Obstacle callback failed: {e!r}')
+
+
+    def _rebuild(self):
+        names = list(self.listeners)
+        old = {name: i for i, name in enumerate(self._names)}
+        self._names = names
+        self.sectors.set_sectors([self.listeners[n]['sector'] for n in names])
+        self._clear_distances = np.array(
+            [self.listeners[n]['clear_distance'] for n in names], float)
+        self._debounce = np.array(
+            [self.listeners[n]['debounce'] for n in names], int)
+        self._repeat = np.array(
+            [self.listeners[n]['repeat'] for n in names], bool)
+        # Keep the state of the listeners that already existed
+        keep = [old.get(n) for n in names]
+        self._blocked = self._carry(keep, self._blocked, False, bool)
+        self._seen = self._carry(keep, self._seen, 0, int)
+        self._gone = self._carry(keep, self._gone, 0, int)
+        self._last_fired = self._carry(keep, self._last_fired, -np.inf, float)
+
+
+    @staticmethod
+    def _carry(keep, previous, default, dtype):
+        values = np.full(len(keep), default, dtype)
+        for i, j in enumerate(keep):
+            if j is not None and previous is not None:
+                values[i] = previous[j]
+        return values
@@ -0,0 +1,150 @@
+import math
+
+import numpy as np
+
+
+# Values of the map images returned by `nav.get_map`
+FREE = 254
+OCCUPIED = 0
+UNKNOWN = 205
+
+
+class OccupancyGrid:
+    """Log-odds occupancy grid built from lidar scans and robot poses.
+
+    The grid has the size, resolution and origin of a `map_info` returned
+    by `nav.get_map`, so cells are addressed in the same pixel frame as the
+    map image: `u = (x - origin_x) / resolution`,
+    `v = height - (y - origin_y) / resolution`. Rays are cast for the whole
+    scan at once: every ray is sampled every `resolution` meters, the
+    samples before the return are updated as free and the return as
+    occupied. Each cell is updated once per scan. Returns count from
+    `min_range` to below `max_range` (`range_min` and `range_max` of the
+    laser info), rays without return (`inf`) clear the space up to
+    `max_range` and the rest (NaN, too close) are ignored.
+    """
+
+    def __init__(self, map_info, max_range=10.0, min_range=0.0, l_free=-0.4,
+                 l_occupied=0.85, l_min=-4.0, l_max=4.0):
+        self.resolution = map_info['resolution']
+        self.origin = tuple(map_info['origin'][:2])
+        self.width = map_info['width']
+        self.height = map_info['height']
+        self.max_range = max_range
+        self.min_range = min_range
+        self.l_free = l_free
+        self.l_occupied = l_occupied
+        self.l_min = l_min
+        self.l_max = l_max
+        self.log_odds = np.zeros((self.height, self.width), np.float32)
+        self.scans = 0
+        self._steps = np.arange(0.0, max_range, self.resolution)
+        # Scratch to keep one sample per cell, see _unique_cells(). A scan
+        # only reaches the cells within `max_range` of the robot, the
+        # scratch covers that square, not the whole grid
+        side = 2 * math.ceil(max_range / self.resolution) + 3
+        self._touched = np.zeros(side * side, bool)
+
+
+    @property
+    def map_info(self):
+        return {
+            'resolution': self.resolution,
+            'origin': list(self.origin),
+            'width': self.width,
+            'height': self.height,
+        }
+
+
+    def meters_to_pixel(self, x, y):
+        """Vectorized, rounded to the nearest cell like the pixel positions
+        of the navigation controller."""
+        u = np.rint((np.asarray(x) - self.origin[0]) / self.resolution)
+        v = np.rint(self.height - (np.asarray(y) - self.origin[1])
+                    / self.resolution)
+        return u.astype(np.intp), v.astype(np.intp)
+
+
+    def pixel_to_meters(self, u, v):
+        x = np.asarray(u) * self.resolution + self.origin[0]
+        y = (self.height - np.asarray(v)) * self.resolution + self.origin[1]
+        return x, y
+
+
+    def integrate(self, ranges, angles, pose):
+        """Fuse one scan. `angles` are the ray angles in radians relative
+        to the robot front, `pose` is `(x, y, yaw)` in meters and radians
+        in the map frame."""
+        x, y, yaw = pose
+        ranges = np.asarray(ranges, float)
+        hit = (np.isfinite(ranges) & (ranges >= self.min_range)
+               & (ranges < self.max_range))
+        # Rays without return clear the space up to the max range, the
+        # invalid ones (NaN, too close) don't touch the grid
+        length = np.where(hit, ranges, 0.0)
+        length[np.isposinf(ranges)] = self.max_range
+        if not length.any():
+            self.scans += 1
+            return
+        beam = np.asarray(angles) + yaw
+        cos = np.cos(beam)
+        sin = np.sin(beam)
+
+        samples = math.ceil(length.max() / self.resolution)
+        steps = self._steps[:samples]
+        # Stop one cell before the return, the return is not free space
+        free = steps < (length - self.resolution)[:, None]
+        t = np.broadcast_to(steps, free.shape)[free]
+        rays = np.nonzero(free)[0]
+        free_cells = self._unique_cells(*self._cells(x + cos[rays] * t,
+                                                     y + sin[rays] * t))
+        hit_cells = self._unique_cells(*self._cells(x + cos[hit] * ranges[hit],
+                                                    y + sin[hit] * ranges[hit]))
+
+        grid = self.log_odds.reshape(-1)
+        grid[free_cells] += self.l_free
+        grid[hit_cells] += self.l_occupied
+        for cells in (free_cells, hit_cells):
+            grid[cells] = np.clip(grid[cells], self.l_min, self.l_max)
+        self.scans += 1
+
+
+    def probabilities(self):
+        return 1.0 - 1.0 / (1.0 + np.exp(self.log_odds))
+
+
+    def to_image(self, occupied_threshold=0.65, free_threshold=0.35):
+        """Grid as a map image, same shape and values as the images of
+        `nav.get_map`: free 254, occupied 0, unknown 205."""
+        probabilities = self.probabilities()
+        image = np.full((self.height, self.width, 3), UNKNOWN, np.uint8)
+        image[probabilities <= free_threshold] = FREE
+        image[probabilities >= occupied_threshold] = OCCUPIED
+        return image
+
+
+    def reset(self):
+        self.log_odds[:] = 0.0
+        self.scans = 0
+
+
+    def _cells(self, x, y):
+        # Pixel positions of the samples inside the grid
+        u, v = self.meters_to_pixel(x, y)
+        inside = (u >= 0) & (u < self.width) & (v >= 0) & (v < self.height)
+        return u[inside], v[inside]
+
+
+    def _unique_cells(self, u, v):
+        # Flat indexes of the cells with samples, each once. The samples
+        # are marked in the scratch over their bounding box, which is read
+        # back in order, without sorting
+        if not len(u):
+            return np.empty(0, np.intp)
+        u0, v0 = u.min(), v.min()
+        width = u.max() - u0 + 1
+        touched = self._touched[:width * (v.max() - v0 + 1)]
+        touched[(v - v0) * width + (u - u0)] = True
+        local = np.flatnonzero(touched)
+        touched[local] = False
+        return (local // width + v0) * self.width + local % width + u0
@@ -0,0 +1,136 @@
+import math
+import time
+import asyncio
+
+from common.completion import run_until_finished
+
+
+class MotionOverlap:
+    """Runs arm predefined poses while the base moves, when it is safe.
+
+    `nav_safe_poses` tells, per arm, the predefined poses the arm can go
+    to while the base is moving (poses that keep the arm and what it
+    holds inside the footprint of the robot). `run()` takes a base motion
+    and the poses to go to afterwards: if every pose is navigation safe
+    the arms start once the base has moved `clearance` meters (to get
+    away from the table first, measured with `get_position`, e.g.
+    `nav.get_position`) and both run at the same time. Otherwise, or when
+    the base stops or fails before getting that far, the poses run after
+    the base motion as before. Each call is a cycle of `cycles`, with the
+    time saved against running one after the other.
+    """
+
+    def __init__(self, arms, nav_safe_poses, clearance=0.0,
+                 get_position=None, poll_period=0.05,
+                 callback_feedback=None, callback_finish=None):
+        if clearance > 0.0 and get_position is None:
+            raise ValueError('A clearance needs get_position')
+        self.arms = arms
+        self.nav_safe_poses = {arm: set(poses)
+                               for arm, poses in nav_safe_poses.items()}
+        self.clearance = clearance
+        self.get_position = get_position
+        self.poll_period = poll_period
+        self.callback_feedback = callback_feedback
+        self.callback_finish = callback_finish
+        self.cycles = []
+
+
+    def is_nav_safe(self, arm, pose):
+        return pose in self.nav_safe_poses.get(arm, ())
+
+
+    async def run(self, base, poses):
+        """Await the coroutine `base` (a navigation or motion command that
+        waits for its end) and move the arms to `poses`, a list of
+        `(arm, predefined_pose)`. Returns the cycle."""
+        overlapped = all(self.is_nav_safe(arm, pose) for arm, pose in poses)
+        timings = {}
+        t0 = time.monotonic()
+        if overlapped:
+            base = asyncio.ensure_future(self._timed(base, 'base', timings))
+            try:
+                overlapped = await self._cleared(base)
+            except BaseException:
+                base.cancel()
+                raise
+        if overlapped:
+            results = await asyncio.gather(
+                base, self._timed(self._poses(poses), 'arms', timings),
+                return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        else:
+            # A failed base raises here, the arms don't move
+            await (base if asyncio.isfuture(base)
+                   else self._timed(base, 'base', timings))
+            await self._timed(self._poses(poses), 'arms', timings)
+        cycle = {
+            'poses': list(poses),
+            'overlapped': overlapped,
+            'base_time': timings['base'],
+            'arms_time': timings['arms'],
+            'wall_time': time.monotonic() - t0,
+        }
+        cycle['saved'] = max(0.0, cycle['base_time'] + cycle['arms_time']
+                                  - cycle['wall_time'])
+        self.cycles.append(cycle)
+        return cycle
+
+
+    def report(self):
+        """Totals of every cycle."""
+        return {
+            'cycles': len(self.cycles),
+            'overlapped': sum(cycle['overlapped'] for cycle in self.cycles),
+            'wall_time': sum(cycle['wall_time'] for cycle in self.cycles),
+            'saved': sum(cycle['saved'] for cycle in self.cycles),
+        }
+
+
+    async def _poses(self, poses, delay=0.0):
+        if delay > 0.0:
+            await asyncio.sleep(delay)
+        # Each arm goes through its poses in order, the arms concurrently
+        by_arm = {}
+        for arm, pose in poses:
+            by_arm.setdefault(arm, []).append(pose)
+
+        async def run_arm(arm, arm_poses):
+            for pose in arm_poses:
+                await run_until_finished(
+                    self.arms.set_predefined_pose, arm, pose,
+                    callback_feedback=self.callback_feedback,
+                    callback_finish=self.callback_finish)
+
+        await asyncio.gather(*[run_arm(arm, arm_poses)
+                               for arm, arm_poses in by_arm.items()])
+
+
+    async def _cleared(self, base):
+        # Whether the base moved `clearance` meters while still running
+        if self.clearance <= 0.0:
+            return not base.done()
+        start = _xy(await self.get_position())
+        while not base.done():
+            x, y = _xy(await self.get_position())
+            if math.hypot(x - start[0], y - start[1]) >= self.clearance:
+                return not base.done()
+            await asyncio.wait([base], timeout=self.poll_period)
+        return False
+
+
+    @staticmethod
+    async def _timed(coroutine, name, timings):
+        t0 = time.monotonic()
+        try:
+            return await coroutine
+        finally:
+            timings[name] = time.monotonic() - t0
+
+
+def _xy(position):
+    if isinstance(position, dict):
+        return position['x'], position['y']
+    return position[0], position[1]
@@ -0,0 +1,163 @@
+import math
+import time
+import asyncio
+
+import numpy as np
+
+from raya.enumerations import ANG_UNIT, POS_UNIT
+
+
+class PoseStream:
+    """Robot pose polled once at `rate` Hz and shared by every consumer.
+
+    The SDK has no pose subscription, so a single task calls
+    `nav.get_position()` at `rate` and keeps the last `capacity` poses
+    with their timestamps. Consumers read the newest pose synchronously
+    (`latest`, or `predict` to extrapolate it with the estimated
+    velocity) or wait for the next one (`next`), without any request of
+    their own. Poses are dicts like the ones of `get_position` plus a
+    `'stamp'` (`time.monotonic()` when the answer arrived).
+    """
+
+    def __init__(self, nav, rate=10.0, pos_unit=POS_UNIT.METERS,
+                 ang_unit=ANG_UNIT.RAD, capacity=10):
+        self.nav = nav
+        self.rate = rate
+        self.pos_unit = pos_unit
+        self.ang_unit = ang_unit
+        self.capacity = capacity
+        self.requests = 0
+        self.errors = 0
+        self.updates = 0
+        # x, y, angle, stamp
+        self._poses = np.zeros((capacity, 4))
+        self._waiters = []
+        self._task = None
+
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+        return self
+
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.cancel()
+
+
+    def latest(self):
+        """Newest pose, `None` before the first one."""
+        if not self.updates:
+            return None
+        return self._pose(self._poses[(self.updates - 1) % self.capacity])
+
+
+    async def next(self, timeout=None):
+        """Wait for the next pose and return it."""
+        waiter = asyncio.get_event_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        return self.latest()
+
+
+    def velocity(self, k=3):
+        """`(vx, vy, angular)` per second, estimated over the `k` newest
+        poses, zeros with less than two."""
+        poses = self.window(k)
+        if len(poses) < 2 or poses[-1, 3] <= poses[0, 3]:
+            return 0.0, 0.0, 0.0
+        dt = poses[-1, 3] - poses[0, 3]
+        vx, vy = (poses[-1, :2] - poses[0, :2]) / dt
+        return float(vx), float(vy), self._angle_diff(poses) / dt
+
+
+    def predict(self, now=None):
+        """Newest pose extrapolated to `now` with the estimated velocity,
+        `None` before the first pose."""
+        pose = self.latest()
+        if pose is None:
+            return None
+        now = time.monotonic() if now is None else now
+        dt = now - pose['stamp']
+        vx, vy, angular = self.velocity()
+        pose['x'] += vx * dt
+        pose['y'] += vy * dt
+        pose['angle'] += angular * dt
+        pose['stamp'] = now
+        return pose
+
+
+    def window(self, k=None):
+        """Up to `k` newest poses as an array of rows
+        `(x, y, angle, stamp)`, oldest first."""
+        n = min(self.updates, self.capacity)
+        k = n if k is None else min(k, n)
+        rows = [(self.updates - k + j) % self.capacity for j in range(k)]
+        return self._poses[rows]
+
+
+    def age(self):
+        """Seconds since the newest pose arrived, `None` without poses."""
+        pose = self.latest()
+        return None if pose is None else time.monotonic() - pose['stamp']
+
+
+    def update(self, position, stamp=None):
+        """Store a pose, also usable to feed poses from elsewhere."""
+        i = self.updates % self.capacity
+        self._poses[i] = (position['x'], position['y'], position['angle'],
+                          time.monotonic() if stamp is None else stamp)
+        self.updates += 1
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+    async def _run(self):
+        period = 1.0 / self.rate
+        due = time.monotonic()
+        while True:
+            self.requests += 1
+            try:
+                position = await self.nav.get_position(
+                    pos_unit=self.pos_unit, ang_unit=self.ang_unit)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+            else:
+                self.update(position)
+            due += period
+            delay = due - time.monotonic()
+            if delay < 0.0:
+                # Late, don't try to catch up
+                due, delay = time.monotonic(), 0.0
+            await asyncio.sleep(delay)
+
+
+    def _angle_diff(self, poses):
+        turn = 360.0 if self.ang_unit == ANG_UNIT.DEG else 2.0 * math.pi
+        diff = np.diff(poses[:, 2])
+        diff = (diff + turn / 2.0) % turn - turn / 2.0
+        return float(diff.sum())
+
+
+    def _pose(self, row):
+        x, y, angle, stamp = (float(v) for v in row)
+        if self.pos_unit == POS_UNIT.PIXEL:
+            x, y = int(round(x)), int(round(y))
+        return {'x': x, 'y': y, 'angle': angle, 'stamp': stamp}
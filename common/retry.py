@@ -0,0 +1,133 @@
+import time
+import asyncio
+import bisect
+from collections import defaultdict
+
+
+class RetriesExhausted(Exception):
+    """Every try of a target failed, the last error is the `__cause__`."""
+
+
+class LatencyHistogram:
+    """Latencies in seconds counted in buckets, cheap enough to record
+    every attempt of a long running app. Percentiles are the upper bound
+    of the bucket they fall in."""
+
+    BOUNDS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self, bounds=BOUNDS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.failed = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+    def record(self, seconds, ok=True):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.failed += not ok
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+
+    def percentile(self, q):
+        """Upper bound of the bucket of the `q` (0-100) percentile, the
+        maximum for the last bucket, `None` without samples."""
+        if not self.count:
+            return None
+        rank = q / 100.0 * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'failed': self.failed,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'max': self.max if self.count else None,
+        }
+
+
+    def buckets(self):
+        """`(upper bound, count)` of every bucket, `inf` for the last."""
+        return list(zip(self.bounds + (float('inf'),), self.counts))
+
+
+class RetryBudget:
+    """Bounded retries with exponential backoff, one budget per target.
+
+    Each target (an object, a place, any hashable key) gets `max_tries`
+    tries. The wait before a retry starts at `base_delay` seconds and is
+    multiplied by `factor` each time up to `max_delay`. The first try
+    does not wait. Targets don't share their budget, a target that used
+    all its tries doesn't leave the next one without them. Every try is
+    recorded in `latency`.
+    """
+
+    def __init__(self, max_tries=3, base_delay=0.25, factor=2.0,
+                 max_delay=4.0, retry_on=(Exception,)):
+        self.max_tries = max_tries
+        self.base_delay = base_delay
+        self.factor = factor
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+        self.tries = defaultdict(int)
+        self.latency = LatencyHistogram()
+
+
+    def remaining(self, target):
+        return max(0, self.max_tries - self.tries[target])
+
+
+    def backoff(self, tries):
+        """Seconds to wait after `tries` failed tries."""
+        return min(self.max_delay, self.base_delay * self.factor ** (tries - 1))
+
+
+    async def next_try(self, target):
+        """Wait the backoff of `target` and return `True`, or `False` if
+        its budget is used up. For loops whose failures are results, not
+        exceptions: `while await budget.next_try(target): ...`."""
+        tries = self.tries[target]
+        if tries >= self.max_tries:
+            return False
+        if tries:
+            await asyncio.sleep(self.backoff(tries))
+        self.tries[target] += 1
+        return True
+
+
+    async def run(self, target, action, *args, **kwargs):
+        """Await `action(*args, **kwargs)` until it doesn't raise one of
+        `retry_on` and return its result. Raises `RetriesExhausted` when
+        the budget of `target` is used up."""
+        error = None
+        while await self.next_try(target):
+            t0 = time.monotonic()
+            try:
+                result = await action(*args, **kwargs)
+            except self.retry_on as e:
+                self.latency.record(time.monotonic() - t0, ok=False)
+                error = e
+            else:
+                self.latency.record(time.monotonic() - t0)
+                return result
+        raise RetriesExhausted(
+            f'{self.max_tries} tries of {target!r} failed') from error
+
+
+    def reset(self, target=None):
+        """Give `target` (every target if `None`) its tries back."""
+        if target is None:
+            self.tries.clear()
+        else:
+            self.tries.pop(target, None)
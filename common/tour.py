@@ -0,0 +1,88 @@
+import numpy as np
+
+
+def distance_matrix(points, cost=None):
+    """Cost of going between every pair of `points`. Straight line distance
+    over x and y by default, `cost(p, q)` (e.g. a path length on the
+    navigation map) otherwise."""
+    if cost is None:
+        # Map positions may come with a z
+        points = np.array([point[:2] for point in points], dtype=float)
+        diff = points[:, None, :] - points[None, :, :]
+        return np.sqrt((diff ** 2).sum(axis=2))
+    n = len(points)
+    matrix = np.zeros((n, n))
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                matrix[i, j] = cost(points[i], points[j])
+    return matrix
+
+
+def tour_length(start, points, order, end=None, cost=None):
+    """Length of visiting `points` in `order` from `start`, then `end`."""
+    stops = [start] + [points[i] for i in order]
+    if end is not None:
+        stops.append(end)
+    if len(stops) < 2:
+        return 0.0
+    matrix = distance_matrix(stops, cost)
+    return float(sum(matrix[i, i + 1] for i in range(len(stops) - 1)))
+
+
+def plan_tour(start, points, end=None, cost=None, max_rounds=100):
+    """Order in which to visit `points` from `start`, optionally finishing
+    at `end`, trying to minimize the total length.
+
+    The tour is built with the nearest neighbour heuristic and improved
+    with 2-opt (reversing stretches of the tour while it gets shorter),
+    which gets within a few percent of the optimum for dozens of points.
+    Returns the indices of `points` in visit order."""
+    n = len(points)
+    if n < 2:
+        return list(range(n))
+    # Nodes: 0 is the start, 1..n the points and n + 1 the end. Without an
+    # end, it costs nothing to get there from anywhere
+    stops = [start] + list(points) + [start if end is None else end]
+    matrix = distance_matrix(stops, cost)
+    if end is None:
+        matrix[:, n + 1] = 0.0
+        matrix[n + 1, :] = 0.0
+
+    tour = _nearest_neighbour(matrix, n)
+    _two_opt(matrix, tour, max_rounds)
+    return [int(node) - 1 for node in tour[1:-1]]
+
+
+def _nearest_neighbour(matrix, n):
+    tour = [0]
+    left = np.ones(n + 2, dtype=bool)
+    left[[0, n + 1]] = False
+    for _ in range(n):
+        costs = np.where(left, matrix[tour[-1]], np.inf)
+        node = int(np.argmin(costs))
+        tour.append(node)
+        left[node] = False
+    tour.append(n + 1)
+    return np.array(tour)
+
+
+def _two_opt(matrix, tour, max_rounds):
+    # Reversing tour[i:j + 1] replaces the edges (a, b) and (c, e) by
+    # (a, c) and (b, e), all the j of a given i are tried at once
+    last = len(tour) - 2
+    for _ in range(max_rounds):
+        improved = False
+        for i in range(1, last):
+            a, b = tour[i - 1], tour[i]
+            c = tour[i + 1:last + 1]
+            e = tour[i + 2:last + 2]
+            gain = matrix[a, b] + matrix[c, e] - matrix[a, c] - matrix[b, e]
+            k = int(np.argmax(gain))
+            if gain[k] > 1e-9:
+                j = i + 1 + k
+                tour[i:j + 1] = tour[i:j + 1][::-1].copy()
+                improved = True
+        if not improved:
+            break
+    return tour
@@ -0,0 +1,200 @@
+import time
+import itertools
+
+import numpy as np
+
+
+class Track:
+    """An object followed across detection frames."""
+
+    def __init__(self, track_id, detection, timestamp):
+        self.id = track_id
+        self.object_name = detection['object_name']
+        self.detection = detection
+        self.box = _box(detection)
+        self.center_point_map = _center(detection)
+        self.hits = 1
+        self.missed = 0
+        self.confirmed = False
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+
+
+    def update(self, detection, timestamp, smoothing):
+        self.detection = detection
+        self.box = _box(detection)
+        center = _center(detection)
+        if center is not None:
+            if self.center_point_map is None:
+                self.center_point_map = center
+            else:
+                self.center_point_map += smoothing * (center
+                                                      - self.center_point_map)
+        self.hits += 1
+        self.missed = 0
+        self.last_seen = timestamp
+
+
+    def as_detection(self):
+        """Last detection of the track, with the smoothed map position."""
+        detection = dict(self.detection)
+        if self.center_point_map is not None:
+            detection['center_point_map'] = self.center_point_map.tolist()
+        detection['track_id'] = self.id
+        return detection
+
+
+    def __repr__(self):
+        return (f'Track({self.id}, {self.object_name!r}, hits={self.hits}, '
+                f'missed={self.missed})')
+
+
+class ObjectTracker:
+    """Gives stable ids to the detections of `get_current_detections()`.
+
+    Every `update()` associates the new detections with the live tracks of
+    the same class, greedily by best score: the box IoU, or when the boxes
+    don't overlap enough, closeness of `center_point_map`. Pairs more than
+    `max_distance` meters apart in the map never match. The IoU and
+    distance matrices of all tracks and detections are computed at once
+    with NumPy. A track is born (confirmed) after `min_hits` detections and
+    dies after `max_missed` updates without one. Only births and deaths
+    are reported, through `on_birth(track)` / `on_death(track)` and the
+    return value of `update()`. The map position of the tracks is an
+    exponential moving average of their detections. The last `max_dead`
+    dead tracks are kept.
+
+    Each result of the detector must be given once: camera frames without
+    a new inference don't count as detections. Callers that can't tell
+    give the timestamp of the result (e.g. `DetectionCache.stamp`), a
+    result with the same timestamp as the last one is ignored.
+    """
+
+    def __init__(self, iou_threshold=0.3, max_distance=0.5, min_hits=3,
+                 max_missed=5, smoothing=0.3, max_dead=100, on_birth=None,
+                 on_death=None):
+        self.iou_threshold = iou_threshold
+        self.max_distance = max_distance
+        self.min_hits = min_hits
+        self.max_missed = max_missed
+        self.smoothing = smoothing
+        self.max_dead = max_dead
+        self.on_birth = on_birth
+        self.on_death = on_death
+        self.live = []
+        self.dead = []
+        self.updates = 0
+        self._ids = itertools.count(1)
+        self._last_stamp = None
+
+
+    def tracks(self, include_dead=False):
+        """Confirmed tracks, the live ones and optionally the dead ones."""
+        live = [track for track in self.live if track.confirmed]
+        return self.dead + live if include_dead else live
+
+
+    def update(self, detections, timestamp=None):
+        """Feed the detections of one result, return `(births, deaths)`.
+        A result with the same `timestamp` as the last one is ignored."""
+        if timestamp is not None and timestamp == self._last_stamp:
+            return [], []
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        self._last_stamp = timestamp
+        self.updates += 1
+
+        matched_tracks, matched_detections = self._associate(detections)
+        for t, d in zip(matched_tracks, matched_detections):
+            self.live[t].update(detections[d], timestamp, self.smoothing)
+        matched = set(matched_tracks)
+        for t, track in enumerate(self.live):
+            if t not in matched:
+                track.missed += 1
+        new = set(range(len(detections))) - set(matched_detections)
+        for d in sorted(new):
+            self.live.append(Track(next(self._ids), detections[d], timestamp))
+
+        births = []
+        for track in self.live:
+            if not track.confirmed and track.hits >= self.min_hits:
+                track.confirmed = True
+                births.append(track)
+        deaths = [track for track in self.live
+                  if track.confirmed and track.missed > self.max_missed]
+        self.live = [track for track in self.live
+                     if track.missed <= self.max_missed]
+        self.dead += deaths
+        del self.dead[:max(0, len(self.dead) - self.max_dead)]
+        for track in births:
+            if self.on_birth is not None:
+                self.on_birth(track)
+        for track in deaths:
+            if self.on_death is not None:
+                self.on_death(track)
+        return births, deaths
+
+
+    def _associate(self, detections):
+        if not self.live or not detections:
+            return [], []
+        track_boxes = np.array([track.box for track in self.live])
+        boxes = np.array([_box(d) for d in detections])
+        iou = _iou(track_boxes, boxes)
+
+        score = iou.copy()
+        score[iou < self.iou_threshold] = 0.0
+        track_centers = np.array([_or_nan(track.center_point_map)
+                                  for track in self.live])
+        centers = np.array([_or_nan(_center(d)) for d in detections])
+        distance = np.linalg.norm(track_centers[:, None, :]
+                                  - centers[None, :, :], axis=2)
+        # Close in the map but not overlapping in the image, e.g. while
+        # the robot turns: scored below any IoU match
+        close = (score == 0.0) & (distance <= self.max_distance)
+        score[close] = (1.0 - distance[close] / self.max_distance) * 0.01 + 1e-6
+        # Overlapping boxes of objects far apart in depth
+        score[distance > self.max_distance] = 0.0
+        names = np.array([track.object_name for track in self.live])
+        labels = np.array([d['object_name'] for d in detections])
+        score[names[:, None] != labels[None, :]] = 0.0
+
+        matched_tracks, matched_detections = [], []
+        used_tracks, used_detections = set(), set()
+        for flat in np.argsort(score, axis=None)[::-1]:
+            t, d = divmod(int(flat), score.shape[1])
+            if score[t, d] <= 0.0:
+                break
+            if t in used_tracks or d in used_detections:
+                continue
+            used_tracks.add(t)
+            used_detections.add(d)
+            matched_tracks.append(t)
+            matched_detections.append(d)
+        return matched_tracks, matched_detections
+
+
+def _box(detection):
+    return (detection['x_min'], detection['y_min'],
+            detection['x_max'], detection['y_max'])
+
+
+def _center(detection):
+    center = detection.get('center_point_map')
+    return None if center is None else np.array(center, float)
+
+
+def _or_nan(center):
+    return np.full(3, np.nan) if center is None else center[:3]
+
+
+def _iou(a, b):
+    # IoU of every box of `a` against every box of `b`
+    x_min = np.maximum(a[:, None, 0], b[None, :, 0])
+    y_min = np.maximum(a[:, None, 1], b[None, :, 1])
+    x_max = np.minimum(a[:, None, 2], b[None, :, 2])
+    y_max = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x_max - x_min, 0, None) * np.clip(y_max - y_min, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
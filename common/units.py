@@ -0,0 +1,82 @@
+import math
+
+import numpy as np
+
+from raya.enumerations import ANG_UNIT, POS_UNIT
+
+
+class MapFrame:
+    """Conversions between map meters and map image pixels.
+
+    Built from the `map_info` returned by `nav.get_map()`, with the pixel
+    frame of the navigation controller: `u = (x - origin_x) / resolution`,
+    `v = height - (y - origin_y) / resolution`. Points are arrays of shape
+    `(..., 2)` (a single point, a polygon, a path, ...), extra columns such
+    as z or an angle are kept as they are. Whole arrays are converted with
+    one NumPy expression instead of a request or a loop per point.
+    """
+
+    def __init__(self, map_info):
+        self.resolution = float(map_info['resolution'])
+        self.origin = np.array(map_info['origin'][:2], dtype=float)
+        self.width = map_info['width']
+        self.height = map_info['height']
+
+
+    def to_pixel(self, points, round=True):
+        """Pixels of `points` in meters, rounded to the nearest pixel like
+        the controller does unless `round` is `False`."""
+        points = np.array(points, dtype=float)
+        points[..., 0] = (points[..., 0] - self.origin[0]) / self.resolution
+        points[..., 1] = self.height - ((points[..., 1] - self.origin[1])
+                                        / self.resolution)
+        if round:
+            return np.rint(points).astype(np.intp)
+        return points
+
+
+    def to_meters(self, points):
+        points = np.array(points, dtype=float)
+        points[..., 0] = points[..., 0] * self.resolution + self.origin[0]
+        points[..., 1] = ((self.height - points[..., 1]) * self.resolution
+                          + self.origin[1])
+        return points
+
+
+    def convert(self, points, from_unit, to_unit):
+        """`points` in `from_unit` to `to_unit` (`POS_UNIT`)."""
+        if from_unit == to_unit:
+            return np.array(points, dtype=float)
+        if to_unit == POS_UNIT.PIXEL:
+            return self.to_pixel(points)
+        return self.to_meters(points)
+
+
+    def contains(self, pixels):
+        """Which of `pixels` are inside the map image."""
+        pixels = np.asarray(pixels)
+        return ((pixels[..., 0] >= 0) & (pixels[..., 0] < self.width)
+                & (pixels[..., 1] >= 0) & (pixels[..., 1] < self.height))
+
+
+def convert_angle(angles, from_unit, to_unit):
+    """`angles` in `from_unit` to `to_unit` (`ANG_UNIT`), scalars stay
+    scalars."""
+    if from_unit == to_unit:
+        return angles
+    if to_unit == ANG_UNIT.RAD:
+        return np.radians(angles) if np.ndim(angles) else math.radians(angles)
+    return np.degrees(angles) if np.ndim(angles) else math.degrees(angles)
+
+
+def wrap_angle(angles, ang_unit=ANG_UNIT.RAD):
+    """`angles` wrapped to [-180, 180) degrees or [-pi, pi) radians."""
+    half = 180.0 if ang_unit == ANG_UNIT.DEG else math.pi
+    wrapped = (np.asarray(angles, dtype=float) + half) % (2.0 * half) - half
+    return wrapped if np.ndim(angles) else float(wrapped)
+
+
+def image_angle(p1, p2):
+    """Map angle in radians of the direction from pixel `p1` to pixel
+    `p2`, the image v axis points down."""
+    return -math.atan2(p2[1] - p1[1], p2[0] - p1[0])
@@ -0,0 +1,89 @@
+import numpy as np
+
+
+class ZoneIndex:
+    """Point in polygon tests against the zones of a map, in the client.
+
+    Built from `nav.get_zones(map_name)` (polygons in meters). The edges
+    of every zone are stacked in flat arrays, so `contains()` tests many
+    points against many zones with a handful of NumPy operations: the
+    bounding boxes of the zones discard most pairs first, then a ray is
+    cast from every remaining point across the edges of its candidate
+    zones (even-odd rule, as `nav.is_in_zone`). `update()` takes the robot
+    position and reports the zones entered and exited since the previous
+    update, through `on_enter(zone)` / `on_exit(zone)` too.
+    """
+
+    def __init__(self, zones, on_enter=None, on_exit=None):
+        self.names = list(zones)
+        self.on_enter = on_enter
+        self.on_exit = on_exit
+        self.current = set()
+        polygons = [np.asarray(zones[name], dtype=float)[:, :2]
+                    for name in self.names]
+        self.boxes = np.array([[p[:, 0].min(), p[:, 1].min(),
+                                p[:, 0].max(), p[:, 1].max()]
+                               for p in polygons]).reshape(-1, 4)
+        # Edge i goes from vertex i to vertex i + 1 of its polygon
+        self._start = np.concatenate(polygons) if polygons else np.zeros((0, 2))
+        self._end = (np.concatenate([np.roll(p, -1, axis=0) for p in polygons])
+                     if polygons else np.zeros((0, 2)))
+        self._zone = np.repeat(np.arange(len(polygons)),
+                               [len(p) for p in polygons])
+
+
+    @classmethod
+    async def from_map(cls, nav, map_name, on_enter=None, on_exit=None):
+        """Index of the zones of `map_name`, `nav` is the navigation
+        controller or a `MapCache`."""
+        return cls(await nav.get_zones(map_name), on_enter, on_exit)
+
+
+    def contains(self, points):
+        """Boolean array `(n_points, n_zones)`, columns in `self.names`."""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        x = points[:, 0:1]
+        y = points[:, 1:2]
+        boxes = self.boxes
+        inside = ((x >= boxes[:, 0]) & (x <= boxes[:, 2])
+                  & (y >= boxes[:, 1]) & (y <= boxes[:, 3]))
+        candidates = np.flatnonzero(inside.any(axis=0))
+        if len(candidates) == 0:
+            return inside
+        edges = np.flatnonzero(np.isin(self._zone, candidates))
+        x1, y1 = self._start[edges, 0], self._start[edges, 1]
+        x2, y2 = self._end[edges, 0], self._end[edges, 1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            crosses = (((y1 > y) != (y2 > y))
+                       & (x < (x2 - x1) * (y - y1) / (y2 - y1) + x1))
+        # Edges of a zone are contiguous, count the crossings per zone
+        zones = self._zone[edges]
+        starts = np.flatnonzero(np.r_[True, zones[1:] != zones[:-1]])
+        counts = np.add.reduceat(crosses, starts, axis=1)
+        inside[:, zones[starts]] &= (counts % 2 == 1)
+        return inside
+
+
+    def zones_at(self, x, y):
+        """Names of the zones containing the point."""
+        row = self.contains((x, y))[0]
+        return [self.names[i] for i in np.flatnonzero(row)]
+
+
+    def is_in_zone(self, zone_name, x, y):
+        return zone_name in self.zones_at(x, y)
+
+
+    def update(self, x, y):
+        """Feed a robot position, return `(entered, exited)` zone names."""
+        zones = set(self.zones_at(x, y))
+        entered = sorted(zones - self.current)
+        exited = sorted(self.current - zones)
+        self.current = zones
+        for zone in exited:
+            if self.on_exit is not None:
+                self.on_exit(zone)
+        for zone in entered:
+            if self.on_enter is not None:
+                self.on_enter(zone)
+        return entered, exited
@@ -12,8 +12,12 @@ import argparse
 from raya.application_base import RayaApplicationBase
 from raya.controllers.cameras_controller import CamerasController
 from raya.controllers.cv_controller import CVController
+from raya.controllers.motion_controller import MotionController
 from raya.tools.image import show_image
 
+# Shared Imports
+from common.cv_scheduler import DetectorScheduler
+
 
 class RayaApplication(RayaApplicationBase):
     async def setup(self):
@@ -57,11 +61,15 @@ class RayaApplication(RayaApplicationBase):
 
         # Enable detector
         self.log.info('Enabling model...')
-        self.detector = await self.cv.enable_model(model='detectors',type='object',
-                                                      name=str(self.model),
-                                                      source=self.working_camera,
-                                                      model_params = {'depth': True}
-                                                     )
+        # The detector is paused while the robot and the scene are still
+        self.motion: MotionController = await self.enable_controller('motion')
+        self.detector = await DetectorScheduler(
+                                        self.cv, motion=self.motion,
+                                        roi=self.roi, log=self.log).enable(
+                                        model='detectors', type='object',
+                                        name=str(self.model),
+                                        source=self.working_camera,
+                                        model_params={'depth': True})
         self.log.info('Model enabled')
 
         # Print objects detectables in the model
@@ -93,13 +101,15 @@ class RayaApplication(RayaApplicationBase):
     async def finish(self):
         if self.working_camera != None:
             self.log.info('Disabling model...')
-            await self.cv.disable_model(model='detectors',type='object')
+            await self.detector.disable()
+            self.log.info(f'Detector: {self.detector.stats()}')
             self.log.info('Disabling camera...')
             self.cameras.disable_color_camera(self.working_camera)
         self.log.info('Ra-Ya application finished')
 
 
     def callback_color_frame(self, img):
+        self.detector.on_frame(img)
         detections = self.detector.get_current_detections()
         detection_names = []
         for detection in detections:
@@ -125,6 +135,8 @@ class RayaApplication(RayaApplicationBase):
         parser.add_argument("-f", "--finish-object",default=['book'],nargs='+', help="list of strings with the objects, when find one of those the program finish")
         parser.add_argument('-d',  '--duration', type=float, default=20.0,
                                                help='Scanning duration')
+        parser.add_argument('-r',  '--roi', type=str, default=None,
+                            help='region of interest of the frames, x_min,y_min,x_max,y_max in pixels')
         parser.add_argument('-s', '--simulation', dest='simulation', action='store_true')
         args = parser.parse_args()
         self.model = args.model
@@ -132,6 +144,9 @@ class RayaApplication(RayaApplicationBase):
         self.finish_object = args.finish_object
         self.duration = args.duration
         self.sim = args.simulation
+        self.roi = None
+        if args.roi is not None:
+            self.roi = [int(value) for value in args.roi.split(',')]
         # If Simulation
         if self.model == None:
             if self.sim:
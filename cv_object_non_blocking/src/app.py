@@ -5,19 +5,23 @@
 
 # Common Imports
 import json
-import cv2
 import argparse
 
 # Raya Imports
 from raya.application_base import RayaApplicationBase
 from raya.controllers.cameras_controller import CamerasController
 from raya.controllers.cv_controller import CVController
-from raya.tools.image import show_image
+from raya.controllers.motion_controller import MotionController
+
+# Shared Imports
+from common.display import DisplayWorker
+from common.cv_scheduler import DetectorScheduler
 
 
 class RayaApplication(RayaApplicationBase):
     async def setup(self):
         self.log.info('Ra-Ya Py - Computer Vision Object Detection Example')
+        self.display = None
 
         # Get Arguments
         self.get_args()
@@ -55,11 +59,15 @@ class RayaApplication(RayaApplicationBase):
 
         # Enable detector
         self.log.info('Enabling model...')
-        self.detector = await self.cv.enable_model(model='detectors',type='object',
-                                                    name=str(self.model),
-                                                    source=str(self.working_camera),
-                                                    model_params = {'depth': True}
-                                                    )
+        # The detector is paused while the robot and the scene are still
+        self.motion: MotionController = await self.enable_controller('motion')
+        self.detector = await DetectorScheduler(
+                                        self.cv, motion=self.motion,
+                                        roi=self.roi, log=self.log).enable(
+                                        model='detectors', type='object',
+                                        name=str(self.model),
+                                        source=str(self.working_camera),
+                                        model_params={'depth': True})
         self.log.info('Model enabled')
         self.log.info(f'Objects labels: {self.detector.get_objects_names()}')
         for object in self.callback_object:
@@ -68,7 +76,8 @@ class RayaApplication(RayaApplicationBase):
                                            ' label for the current model'))
                 self.finish_app()
                 return
-        # Create listeners
+        # Create listeners, frames are drawn and shown in another thread
+        self.display = DisplayWorker('Video from Gary\'s camera').start()
         self.cameras.create_color_frame_listener(
                                         camera_name=self.working_camera,
                                         callback=self.callback_color_frame)
@@ -87,9 +96,13 @@ class RayaApplication(RayaApplicationBase):
     async def finish(self):
         if self.working_camera != None:
             self.log.info('Disabling model...')
-            await self.cv.disable_model(model='detectors',type='object')
+            await self.detector.disable()
+            self.log.info(f'Detector: {self.detector.stats()}')
             self.log.info('Disabling camera...')
             self.cameras.disable_color_camera(self.working_camera)
+        if self.display is not None:
+            self.display.stop()
+            self.log.info(f'Display: {self.display.stats()}')
         self.log.info('Ra-Ya application finished')
 
     
@@ -101,19 +114,9 @@ class RayaApplication(RayaApplicationBase):
 
 
     def callback_color_frame(self, img):
+        self.detector.on_frame(img)
         detections = self.detector.get_current_detections()
-        detection_names = []
-        for detection in detections:
-            img = cv2.rectangle(img, 
-                                (detection['x_min'], detection['y_min']), 
-                                (detection['x_max'], detection['y_max']), 
-                                (0, 255, 0), 
-                                2)
-            img = cv2.putText(img, detection['object_name'], (detection['x_min'], detection['y_min'] - 5), cv2.FONT_HERSHEY_SIMPLEX,
-			0.5, (0, 0, 255), 2)
-            detection_names.append(detection['object_name'])
-        #self.log.info(f'Detections: {detection_names}')
-        show_image(img, 'Video from Gary\'s camera')
+        self.display.submit(img, detections)
 
     
     def get_args(self):
@@ -125,6 +128,8 @@ class RayaApplication(RayaApplicationBase):
         parser.add_argument("-co", "--callback-object",default=['apple', 'book'],nargs='+', help="list of strings with the objects to detect in not blockin mode")
         parser.add_argument('-d',  '--duration', type=float, default=20.0,
                                                help='Scanning duration')
+        parser.add_argument('-r',  '--roi', type=str, default=None,
+                            help='region of interest of the frames, x_min,y_min,x_max,y_max in pixels')
         parser.add_argument('-s',  '--simulation', dest='simulation', action='store_true')
         args = parser.parse_args()
         self.model = args.model
@@ -132,6 +137,9 @@ class RayaApplication(RayaApplicationBase):
         self.callback_object = args.callback_object
         self.duration = args.duration
         self.sim = args.simulation
+        self.roi = None
+        if args.roi is not None:
+            self.roi = [int(value) for value in args.roi.split(',')]
         # If Simulation
         if self.model == None:
             if self.sim:
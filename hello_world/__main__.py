@@ -1,4 +1,9 @@
 import os
+import sys
+
+# Shared helpers (common/) live in the root of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
 from src.app import RayaApplication
 from raya.entry_point import entry_point
 
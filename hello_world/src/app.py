@@ -9,6 +9,10 @@ from raya.controllers.communication_controller import CommunicationController
 from raya.controllers.navigation_controller import ANG_UNIT, POS_UNIT
 from raya.exceptions import *
 
+from common.startup import concurrent_setup
+from common.grasp import GraspPipeline
+from common.retry import RetryBudget
+
 CAMERA = 'head_front'
 AVAILABLE_OBJECTS = ['cup']
 MAP = 'unity_apartment'
@@ -18,34 +22,38 @@ ARM_NAME = 'right_arm'
 class RayaApplication(RayaApplicationBase):
 
     async def setup(self):
-        #1
-        self.motion: MotionController = await self.enable_controller('motion')
-
-        #2
-        self.cameras: CamerasController = await self.enable_controller('cameras')
-        self.arms: ArmsController = await self.enable_controller('arms')
-
-        self.nav: NavigationController = await self.enable_controller('navigation')
-        self.cv: CVController = await self.enable_controller('cv')
-        self.grasp: GraspingController = await self.enable_controller('grasping')
-
-        self.comm: CommunicationController = await self.enable_controller('communication')
+        startup = await concurrent_setup(self,
+                        controllers=['motion', 'cameras', 'arms', 'navigation',
+                                     'cv', 'grasping', 'communication'],
+                        color_cameras=[CAMERA],
+                        map_name=MAP, wait_localization=True, timeout=3.0)
+        startup.log_timings(self.log)
+        self.motion: MotionController = startup['motion']
+        self.cameras: CamerasController = startup['cameras']
+        self.arms: ArmsController = startup['arms']
+        self.nav: NavigationController = startup['navigation']
+        self.cv: CVController = startup['cv']
+        self.grasp: GraspingController = startup['grasping']
+        self.comm: CommunicationController = startup['communication']
 
         self.msg_rcvd = None
         self.comm.create_incoming_msg_listener(callback=self.cb_incoming_msg)
 
-        if not await self.nav.set_map(MAP, wait_localization=True, timeout=3.0):
+        if not startup.localized:
             self.finish_app()
 
-        
-        await self.cameras.enable_color_camera(CAMERA)
-
         self.current_detections = []
         self.detector = await self.cv.enable_model(model='detectors',type='object',
                                                     name=MODEL,
                                                     source=CAMERA,
                                                     model_params={}
                                                     )
+        # The object must be seen again and in reach before each try,
+        # failed tries wait 0.5 s, then 1 s
+        self.picker = GraspPipeline(self.grasp, self.arms, self.detector,
+                                    nav=self.nav,
+                                    budget=RetryBudget(max_tries=3,
+                                                       base_delay=0.5))
 
         
 
@@ -103,16 +111,13 @@ class RayaApplication(RayaApplicationBase):
         await self.comm.send_msg({"action": "picking"})
         ## PICK THE OBJECT
         self.log.info(f'Picking the object')
-        for _ in range(3):
-            try:
-                await self.sleep(0.5)
-                await self.grasp.pick_object(detector_model=MODEL, 
-                        source=CAMERA, object_name=target_object,
-                        wait=True, arms=['right_arm'])
-                break
-            except RayaGraspingException:
-                continue
-        
+        error, error_msg, _ = await self.picker.pick(target_object,
+                                        detector_model=MODEL, source=CAMERA,
+                                        arms=[ARM_NAME])
+        if error:
+            self.log.error(f'Couldn\'t pick the object: {error_msg}')
+        self.log.info(f'Pick attempts: {self.picker.report()["attempt"]}')
+
         await self.comm.send_msg({"action": "done"})
         self.finish_app()
 
@@ -1,11 +1,16 @@
 import argparse
+from functools import partial
 
 from raya.application_base import RayaApplicationBase
 from raya.controllers.lidar_controller import LidarController
 from raya.controllers.lidar_controller import ANG_UNIT
 
+from common.obstacles import ObstacleDispatcher
+
 
 LOOP_PERIOD = 1.0
+RING_SECTORS = 36
+RING_DISTANCE = 0.8
 
 
 class RayaApplication(RayaApplicationBase):
@@ -14,12 +19,29 @@ class RayaApplication(RayaApplicationBase):
         self.get_args()
 
         self.lidar:LidarController = await self.enable_controller('lidar')
-        self.lidar.create_obstacle_listener(listener_name='obstacle',
-                                              callback=self.callback_obstacle,
-                                              lower_angle=260,
-                                              upper_angle=280,
-                                              upper_distance=2.0, 
-                                              ang_unit=ANG_UNIT.DEG)
+        # All the listeners are checked together once per scan
+        self.obstacles = ObstacleDispatcher(self.lidar, ang_unit=ANG_UNIT.DEG,
+                                            log=self.log)
+        self.obstacles.create_obstacle_listener(listener_name='obstacle',
+                                callback=self.callback_obstacle,
+                                lower_angle=260,
+                                upper_angle=280,
+                                upper_distance=2.0,
+                                clear_distance=2.2,
+                                debounce=2,
+                                repeat=True,
+                                min_interval=1.0,
+                                callback_clear=self.callback_obstacle_clear)
+        ring_width = 360.0 / RING_SECTORS
+        for i in range(RING_SECTORS):
+            self.obstacles.create_obstacle_listener(listener_name=f'ring_{i}',
+                                callback=partial(self.callback_ring, i),
+                                lower_angle=i * ring_width,
+                                upper_angle=(i + 1) * ring_width,
+                                upper_distance=RING_DISTANCE,
+                                clear_distance=RING_DISTANCE + 0.2,
+                                debounce=2)
+        self.obstacles.start()
 
         if self.spin_ena:
             self.motion = await self.enable_controller('motion')
@@ -59,8 +81,18 @@ class RayaApplication(RayaApplicationBase):
     async def finish(self):
         if self.spin_ena and self.motion.is_moving():
             await self.motion.cancel_motion()
-        self.lidar.delete_listener(listener_name='obstacle')
+        await self.obstacles.stop()
+        self.log.info(f'Obstacle listeners: {self.obstacles.counters()}')
 
 
     def callback_obstacle(self):
         self.log.warning('Obstacle!')
+
+
+    def callback_obstacle_clear(self):
+        self.log.info('Obstacle cleared')
+
+
+    def callback_ring(self, sector):
+        self.log.info(f'Obstacle closer than {RING_DISTANCE} m in sector '
+                      f'{sector}')
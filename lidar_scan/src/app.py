@@ -1,18 +1,33 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import argparse
+import matplotlib.image
 
 from raya.application_base import RayaApplicationBase
 from raya.controllers.lidar_controller import LidarController
 from raya.controllers.lidar_controller import ANG_UNIT
+from raya.enumerations import POS_UNIT
+
+from common.lidar import LidarSectors
+from common.lidar_plot import LidarPlot
+from common.lidar_history import ScanHistory
+from common.occupancy import OccupancyGrid
 
 
 LOOP_PERIOD = 0.1
+# Front obstacle sector, plus a ring of sectors around the robot
+FRONT_SECTOR = (0, 45, 2.0)
+RING_SECTORS = 36
+RING_DISTANCE = 1.0
+# Obstacles are checked on the median of the last scans, so a single
+# spurious scan doesn't count as an obstacle
+HISTORY_SCANS = 20
+FILTER_SCANS = 3
 
 
 class RayaApplication(RayaApplicationBase):
 
     async def setup(self):
+        self.motion = None
         self.get_args()
 
         self.obstacle_counter = 0
@@ -20,10 +35,35 @@ class RayaApplication(RayaApplicationBase):
         self.lidar_info = self.lidar.get_laser_info(ang_unit = ANG_UNIT.RAD)
         self.log.info('Laser info:')
         self.log.info(self.lidar_info)
+        ring_width = 360.0 / RING_SECTORS
+        self.sectors = LidarSectors(self.lidar_info,
+                            [FRONT_SECTOR] + [
+                                (i * ring_width, (i + 1) * ring_width,
+                                 RING_DISTANCE)
+                                for i in range(RING_SECTORS)],
+                            ang_unit=ANG_UNIT.DEG,
+                            laser_info_unit=ANG_UNIT.RAD)
+        self.blocked_sectors = []
+        self.history = ScanHistory(HISTORY_SCANS)
+
+        self.plot = LidarPlot(range_max=10.0, max_points=self.max_points)
+
+        # With a map, scans are fused with the robot pose in an occupancy
+        # grid in the frame of the map
+        self.grid = None
+        if self.map_name:
+            self.nav = await self.enable_controller('navigation')
+            if not await self.nav.set_map(self.map_name,
+                                          wait_localization=True,
+                                          timeout=3.0):
+                self.log.info(f'Robot couldn\'t localize itself')
+                self.finish_app()
+                return
+            _, map_info = await self.nav.get_map(self.map_name)
+            self.grid = OccupancyGrid(map_info,
+                                      max_range=self.lidar_info['range_max'],
+                                      min_range=self.lidar_info['range_min'])
 
-        fig = plt.figure()
-        self.ax1 = fig.add_subplot(111, projection='polar')
-        
         if self.spin_ena:
             self.motion = await self.enable_controller('motion')
             await self.motion.set_velocity(x_velocity=0.0, y_velocity=0.0, 
@@ -41,28 +81,49 @@ class RayaApplication(RayaApplicationBase):
         parser.add_argument('-d', '--duration',
                             type=float, default=10.0,
                             help='Scanning duration')
+        parser.add_argument('-p', '--max-points',
+                            type=int, default=360,
+                            help='Max points to plot per scan, 0 for all')
+        parser.add_argument('-m', '--map-name',
+                            type=str, default='',
+                            help='Map name, builds an occupancy grid')
+        parser.add_argument('-g', '--grid-file',
+                            type=str, default='occupancy_grid.png',
+                            help='Where to save the occupancy grid')
         parser.set_defaults(feature=True)
         args = parser.parse_args()
         self.spin_ena = args.spin
         self.duration = args.duration
+        self.max_points = args.max_points
+        self.map_name = args.map_name
+        self.grid_file = args.grid_file
 
 
     async def loop(self):
         # Get data
         raw_data = self.lidar.get_raw_data()
-        theta = np.linspace(self.lidar_info['angle_min'], 
-                            self.lidar_info['angle_max'], 
-                            len(raw_data))
-        # Plot
-        self.ax1.clear()
-        self.ax1.scatter(x=-np.array(theta)-1.578, y=raw_data, s=2)
-        self.ax1.set_ylim(0.0, 10.0)
-        plt.pause(0.001) # Needed for real time plotting
-        # Check obstacle
-        if self.lidar.check_obstacle(lower_angle=0, upper_angle=45,
-                                     upper_distance=2.0, ang_unit=ANG_UNIT.DEG):
+        theta = self.sectors.angles(len(raw_data))
+        # Plot, only the points are redrawn
+        self.plot.update(theta, raw_data)
+        if self.grid is None:
+            self.history.append(raw_data)
+        else:
+            pose = await self.nav.get_position(pos_unit=POS_UNIT.METERS,
+                                               ang_unit=self.history.ang_unit)
+            self.history.append(raw_data, pose=pose)
+            self.grid.integrate(raw_data, theta, self.history.latest()[2])
+        # Check obstacles, all the sectors at once
+        min_ranges, hits = self.sectors.evaluate(
+                                    self.history.median(FILTER_SCANS))
+        if hits[0]:
             self.obstacle_counter += 1
-            self.log.info(f'Obstacle {self.obstacle_counter}')
+            self.log.info(f'Obstacle {self.obstacle_counter}, '
+                          f'at {min_ranges[0]:.2f} m')
+        blocked_sectors = np.flatnonzero(hits[1:]).tolist()
+        if blocked_sectors != self.blocked_sectors:
+            self.blocked_sectors = blocked_sectors
+            self.log.info(f'Sectors closer than {RING_DISTANCE} m: '
+                          f'{blocked_sectors}')
         # Wait
         await self.sleep(LOOP_PERIOD)
         if self.spin_ena:
@@ -75,6 +136,11 @@ class RayaApplication(RayaApplicationBase):
         
 
     async def finish(self):
-        if self.spin_ena and self.motion.is_moving():
+        if self.motion is not None and self.motion.is_moving():
             await self.motion.cancel_motion()
+        self.plot.close()
+        if self.grid is not None and self.grid.scans:
+            matplotlib.image.imsave(self.grid_file, self.grid.to_image())
+            self.log.info(f'Occupancy grid of {self.grid.scans} scans '
+                          f'saved in {self.grid_file}')
         self.log.info('App finished')
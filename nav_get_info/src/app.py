@@ -4,11 +4,16 @@ from raya.application_base import RayaApplicationBase
 from raya.controllers.navigation_controller import POS_UNIT, ANG_UNIT
 from raya.exceptions import RayaNavZonesNotFound
 
+from common.map_cache import MapCache
+from common.units import MapFrame
+
 class RayaApplication(RayaApplicationBase):
 
     async def setup(self):
         self.get_args()
         self.nav = await self.enable_controller('navigation')
+        # Zones and locations are read once and kept on disk
+        self.map_cache = MapCache(self.nav, refresh=self.refresh_cache)
         if not await self.nav.set_map(self.map_name, 
                                       wait_localization=True, 
                                       timeout=3.0):
@@ -18,21 +23,30 @@ class RayaApplication(RayaApplicationBase):
         self.status = await self.nav.get_status()
         self.log.info(f'status: {self.status}')
 
-        self.zones = await self.nav.get_zones(self.map_name)
+        self.zones = await self.map_cache.get_zones(self.map_name)
         self.log.info(f'zones: {self.zones}')
 
-        self.locations = await self.nav.get_locations(self.map_name)
+        self.locations = await self.map_cache.get_locations(self.map_name)
         self.log.info(f'locations: {self.locations}')
 
-        self.zones_list = await self.nav.get_zones_list(self.map_name)
+        self.zones_list = await self.map_cache.get_zones_list(self.map_name)
         self.log.info(f'zones_list: {self.zones_list}')
 
-        self.locations_list = await self.nav.get_locations_list(self.map_name)
+        self.locations_list = await self.map_cache.get_locations_list(self.map_name)
         self.log.info(f'locations_list: {self.locations_list}')
 
-        self.location = await self.nav.get_location('kitchen', POS_UNIT.PIXEL)
+        # Pixels are computed locally from the map info
+        _, map_info = await self.map_cache.get_map(self.map_name)
+        self.map_frame = MapFrame(map_info)
+        location = self.locations['kitchen']
+        x, y = self.map_frame.to_pixel([location['x'], location['y']])
+        self.location = {'x': int(x), 'y': int(y), 'angle': location['angle']}
         self.log.info(f'kitchen: {self.location}')
 
+        self.zones_pixels = {zone: self.map_frame.to_pixel(points).tolist()
+                             for zone, points in self.zones.items()}
+        self.log.info(f'zones (pixels): {self.zones_pixels}')
+
         self.zone_center = await self.nav.get_zone_center('kitchen', POS_UNIT.PIXEL)
         self.log.info(f'kitchen center: {self.zone_center}')
         
@@ -41,25 +55,25 @@ class RayaApplication(RayaApplicationBase):
         self.log.info(f'kitchen first point: {self.zone_center}')
 
         try:
-            if await self.nav.delete_zone(map_name=self.map_name,
+            if await self.map_cache.delete_zone(map_name=self.map_name,
                                     location_name='test001'):
                 print(f'zone test001 deleted successfully')
         except RayaNavZonesNotFound:
             self.log.info((f'Location not found'))
         try:
-            if await self.nav.delete_location(map_name=self.map_name,
+            if await self.map_cache.delete_location(map_name=self.map_name,
                                     location_name= 'test001'):
                 print(f'location test001 deleted successfully')
         except RayaNavZonesNotFound:
             self.log.info((f'Location not found'))
-        if not await self.nav.save_location( 
+        if not await self.map_cache.save_location( 
                 location_name='test001', x=1.0, y=0.5, angle=1.0, 
                 pos_unit = POS_UNIT.METERS, ang_unit = ANG_UNIT.RAD
                 ):
             self.log.info((f'Unable to save location'))
             self.finish_app()
         self.log.info((f'Location saved successfully'))
-        if not await self.nav.save_zone( 
+        if not await self.map_cache.save_zone( 
                 zone_name='test001', 
                 points=[[0, 1],[1, 1],[1, 0],[0, 0]], 
                 pos_unit = POS_UNIT.METERS
@@ -85,9 +99,12 @@ class RayaApplication(RayaApplicationBase):
                             type=str,
                             default='', required=True,
                             help='Map name')
+        parser.add_argument('-r', '--refresh-cache', action='store_true',
+                            help='Read the map again instead of using the local cache')
 
         args = parser.parse_args()
 
         self.map_name = args.map_name
+        self.refresh_cache = args.refresh_cache
         
         
@@ -9,14 +9,16 @@ from raya.controllers.navigation_controller import POS_UNIT, ANG_UNIT
 from raya.exceptions import RayaNavNotNavigating, RayaNavInvalidGoal
 import matplotlib.pyplot as plt
 
-
-def angle_between_points(p1, p2):
-    return math.atan2(p2[1]-p1[1], p2[0]-p1[0])
+from common.map_cache import MapCache
+from common.map_overlay import MapOverlay
+from common.units import image_angle
+from common.pose import PoseStream
 
 
 class RayaApplication(RayaApplicationBase):
 
     async def setup(self):
+        self.poses = None
         self.flag = False
         if not self.get_args():
             self.finish_app()
@@ -34,8 +36,14 @@ class RayaApplication(RayaApplicationBase):
             self.finish_app()
             return
         self.log.info(f'Using map \'{self.map_name}\'')
-        self.map_image, self.map_info = await self.nav.get_map(
+        # One position request every 100 ms, whatever the frame rate
+        self.poses = PoseStream(self.nav, rate=10.0, pos_unit=POS_UNIT.PIXEL,
+                                ang_unit=ANG_UNIT.RAD).start()
+        # The map is only transferred the first time the app runs
+        self.map_cache = MapCache(self.nav, refresh=self.refresh_cache)
+        self.map_image, self.map_info = await self.map_cache.get_map(
                                                     self.map_name)
+        self.overlay = MapOverlay(self.map_image, scale=self.scale)
         
         cv2.namedWindow('map')
         cv2.setMouseCallback('map',self.get_click_coordinates)
@@ -61,8 +69,10 @@ class RayaApplication(RayaApplicationBase):
 
 
     async def loop(self):
-        robot_position = await self.nav.get_position(
-                    pos_unit = POS_UNIT.PIXEL, ang_unit = ANG_UNIT.RAD)
+        # Last pose extrapolated to now, the marker moves smoothly
+        robot_position = self.poses.predict()
+        if robot_position is None:
+            robot_position = await self.poses.next()
         img = self.draw(robot_position)
         cv2.imshow("map", img)
         key = cv2.waitKey(20) & 0xFF
@@ -99,6 +109,8 @@ class RayaApplication(RayaApplicationBase):
 
 
     async def finish(self):
+        if self.poses is not None:
+            await self.poses.stop()
         try:
             await self.nav.cancel_navigation()
         except (RayaNavNotNavigating, AttributeError):
@@ -112,29 +124,34 @@ class RayaApplication(RayaApplicationBase):
                             type=str,
                             default='', required=True,
                             help='Map name')
+        parser.add_argument('-s', '--scale',
+                            type=float,
+                            default=1.0, required=False,
+                            help='Scale of the map window, below 1 for big maps')
+        parser.add_argument('-r', '--refresh-cache', action='store_true',
+                            help='Read the map again instead of using the local cache')
         try:
             args = parser.parse_args()
         except:
             return False
         self.map_name = args.map_name
+        self.scale = args.scale
+        self.refresh_cache = args.refresh_cache
         return True
 
     
     def draw(self, robot_position):
-        img = self.map_image.copy()
-        x_pixel  = robot_position["x"]
-        y_pixel  = robot_position["y"]
-        rotation = robot_position["angle"]
-        x_line   =  x_pixel + int(7 * math.cos(-rotation))
-        y_line   =  y_pixel + int(7 * math.sin(-rotation))
-        cv2.circle(img, (x_pixel, y_pixel), 8, (255,0,0), 2)      
-        cv2.line(img, (x_pixel, y_pixel), (x_line, y_line), (0,0,255), 4)
+        # Only the areas around the previous and the new robot marker and
+        # arrow are repainted
+        arrow = None
         if self.click_down:
-            cv2.arrowedLine(img, self.point_down, self.point_mouse, (0,150,0), 3)
-        return img
+            arrow = (self.point_down, self.point_mouse)
+        return self.overlay.draw(robot_position["x"], robot_position["y"],
+                                 robot_position["angle"], arrow)
 
 
     def get_click_coordinates(self, event, x, y, flags, param):
+        x, y = self.overlay.to_map((x, y))
         if event == cv2.EVENT_LBUTTONDOWN:
             self.point_down = (x, y)
             self.point_mouse = (x, y)
@@ -143,7 +160,7 @@ class RayaApplication(RayaApplicationBase):
             self.new_goal = (
                     self.point_down[0],
                     self.point_down[1],
-                    -angle_between_points(self.point_down, self.point_mouse)
+                    image_angle(self.point_down, self.point_mouse)
                 )
             self.new_flag = True
             self.click_down = False
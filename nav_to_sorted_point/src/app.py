@@ -5,10 +5,13 @@ from raya.controllers.navigation_controller import POS_UNIT, ANG_UNIT
 from raya.exceptions import RayaNavNotNavigating, RayaNavZoneAlreadyExist
 import matplotlib.pyplot as plt
 
+from common.pose import PoseStream
+
 
 class RayaApplication(RayaApplicationBase):
 
     async def setup(self):
+        self.poses = None
         self.get_args()
         self.nav = await self.enable_controller('navigation')
         self.log.info((f'Setting map: {self.map_name}. '
@@ -21,6 +24,9 @@ class RayaApplication(RayaApplicationBase):
             return
 
         self.log.info(f'Using map \'{self.map_name}\'')
+        # Polled only once the loop runs
+        self.poses = PoseStream(self.nav, rate=10.0, pos_unit=POS_UNIT.PIXEL,
+                                ang_unit=ANG_UNIT.RAD)
         zone_name = self.zone_name
         try:
             if not await self.nav.save_zone( 
@@ -66,12 +72,13 @@ class RayaApplication(RayaApplicationBase):
 
 
     async def loop(self):
-        robot_position = await self.nav.get_position(
-                    pos_unit = POS_UNIT.PIXEL, ang_unit = ANG_UNIT.RAD)
+        robot_position = await self.poses.start().next()
         #self.log.warn(f'Robot_position {robot_position}')
 
 
     async def finish(self):
+        if self.poses is not None:
+            await self.poses.stop()
         try:
             await self.nav.cancel_navigation()
         except RayaNavNotNavigating:
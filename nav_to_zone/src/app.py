@@ -5,10 +5,15 @@ from raya.controllers.navigation_controller import POS_UNIT, ANG_UNIT
 from raya.exceptions import RayaNavNotNavigating
 import matplotlib.pyplot as plt
 
+from common.map_cache import MapCache
+from common.zones import ZoneIndex
+from common.pose import PoseStream
+
 
 class RayaApplication(RayaApplicationBase):
 
     async def setup(self):
+        self.poses = None
         self.get_args()
         self.nav = await self.enable_controller('navigation')        
         self.log.info((f'Setting map: {self.map_name}. '
@@ -20,6 +25,14 @@ class RayaApplication(RayaApplicationBase):
             self.finish_app()
             return
 
+        # Zone checks run locally, the zones are read once
+        map_cache = MapCache(self.nav, refresh=self.refresh_cache)
+        self.zones = await ZoneIndex.from_map(map_cache, self.map_name,
+                                              on_enter=self.cb_zone_enter,
+                                              on_exit=self.cb_zone_exit)
+
+        self.poses = PoseStream(self.nav, rate=1.0 / 0.3).start()
+
         self.goal_zone = self.zone_name
         self.log.warn(f'New goal received zone {self.goal_zone}')
         await self.nav.navigate_to_zone( 
@@ -40,15 +53,25 @@ class RayaApplication(RayaApplicationBase):
         print(f'cb_nav_feedback {state} {distance_to_goal} {speed}')
 
 
-    async def loop(self):
-        if await self.nav.is_in_zone(zone_name=self.goal_zone):
+    def cb_zone_enter(self, zone_name):
+        if zone_name == self.goal_zone:
             self.log.warn(f'Robot in zone')
         else:
-            self.log.info((f'Robot not in zone'))
-        await self.sleep(0.3)
+            self.log.info(f'Robot entered zone {zone_name}')
+
+
+    def cb_zone_exit(self, zone_name):
+        self.log.info(f'Robot left zone {zone_name}')
+
+
+    async def loop(self):
+        position = await self.poses.next()
+        self.zones.update(position['x'], position['y'])
 
 
     async def finish(self):
+        if self.poses is not None:
+            await self.poses.stop()
         try:
             await self.nav.cancel_navigation()
         except RayaNavNotNavigating:
@@ -68,11 +91,14 @@ class RayaApplication(RayaApplicationBase):
                             help='Zone name')
         parser.add_argument('-c', '--go-center', action='store_true', 
                             help='Spins while scanning')
+        parser.add_argument('-r', '--refresh-cache', action='store_true',
+                            help='Read the map again instead of using the local cache')
 
         args = parser.parse_args()
 
         self.map_name = args.map_name
         self.zone_name = args.zone_name
         self.go_center = args.go_center
+        self.refresh_cache = args.refresh_cache
 
 
@@ -0,0 +1,91 @@
+import sys
+import json
+import logging
+import argparse
+
+from offline_runtime.profile import load_profile
+from offline_runtime.runner import (run_app, run_apps, format_reports,
+                                    list_app_dirs, DEFAULT_MAX_DURATION)
+from offline_runtime.benchmarks import (BENCHMARKS, run_benchmark,
+                                        format_benchmark)
+
+
+def get_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='offline_runtime',
+        description='Run and benchmark the example apps against an '
+                    'in-process fake Ra-Ya runtime')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    apps = subparsers.add_parser('apps', help='Benchmark app directories')
+    apps.add_argument('apps', nargs='*',
+                      help='App directories, all of them by default')
+    apps.add_argument('--json', action='store_true',
+                      help='Print the full reports as json')
+    apps.add_argument('-v', '--verbose', action='store_true',
+                      help='Show the apps output')
+
+    run = subparsers.add_parser('run', help='Run a single app in-process')
+    run.add_argument('app', help='App directory')
+    run.add_argument('--report', type=str, default=None,
+                     help='Write the json report to this file')
+    run.add_argument('--log-level', type=str, default='INFO',
+                     help='Log level of the app logger')
+    run.add_argument('app_args', nargs=argparse.REMAINDER,
+                     help='Arguments for the app, after \'--\' (options of '
+                          'this command go before the app directory)')
+
+    bench = subparsers.add_parser('bench',
+                                  help='Run benchmarks of the shared helpers')
+    bench.add_argument('benchmarks', nargs='*',
+                       help=f'Benchmarks to run: {", ".join(BENCHMARKS)}. '
+                            'All of them by default')
+    bench.add_argument('--json', action='store_true',
+                       help='Print the full reports as json')
+
+    for sub in (apps, run, bench):
+        sub.add_argument('-p', '--profile', type=str, default='default',
+                         help='Profile name or path')
+        sub.add_argument('--set', dest='overrides', action='append',
+                         default=[], metavar='KEY=VALUE',
+                         help='Override a profile value, e.g. '
+                              'controllers.lidar.scan_rate=40')
+        sub.add_argument('-t', '--max-duration', type=float, default=None,
+                         help='Stop the app after this many seconds')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = get_args(sys.argv[1:] if argv is None else argv)
+    if args.command == 'run':
+        app_args = args.app_args
+        if app_args and app_args[0] == '--':
+            app_args = app_args[1:]
+        profile = load_profile(args.profile, args.overrides)
+        report = run_app(args.app, app_args, profile,
+                         args.max_duration or DEFAULT_MAX_DURATION,
+                         getattr(logging, args.log_level.upper()))
+        if args.report:
+            with open(args.report, 'w') as f:
+                json.dump(report, f)
+        else:
+            print(json.dumps(report, indent=2))
+    elif args.command == 'apps':
+        reports = run_apps(args.apps or list_app_dirs(), args.profile,
+                           args.overrides, args.max_duration, args.verbose)
+        if args.json:
+            print(json.dumps(reports, indent=2))
+        else:
+            print(format_reports(reports))
+    elif args.command == 'bench':
+        profile = load_profile(args.profile, args.overrides)
+        reports = [run_benchmark(name, profile)
+                   for name in args.benchmarks or BENCHMARKS]
+        if args.json:
+            print(json.dumps(reports, indent=2))
+        else:
+            print('\n\n'.join(format_benchmark(r) for r in reports))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import sys
+import importlib
+
+from offline_runtime.runner import FAKE_SDK_DIR, REPO_DIR
+
+
+# Module name in this package of every benchmark, each one exposes
+# `run(profile)` returning a report with a list of `rows`
+BENCHMARKS = ['completion', 'lidar_sectors', 'lidar_plot',
+              'occupancy_grid', 'obstacle_dispatcher', 'frame_buffer',
+              'display_worker', 'object_index', 'object_tracker', 'tour',
+              'map_cache', 'map_overlay', 'units', 'zone_index',
+              'pose_stream', 'arm_jobs', 'arm_checks', 'arm_info',
+              'arm_overlap', 'grasp_retries', 'detection_cache',
+              'cv_scheduler']
+
+
+def use_fake_sdk():
+    """Make the fake SDK and the shared helpers (common/) importable."""
+    for path in (REPO_DIR, FAKE_SDK_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def run_benchmark(name, profile):
+    if name not in BENCHMARKS:
+        raise ValueError(f'Unknown benchmark \'{name}\', available: '
+                         f'{", ".join(BENCHMARKS)}')
+    use_fake_sdk()
+    module = importlib.import_module(f'offline_runtime.benchmarks.{name}')
+    report = module.run(profile)
+    report['benchmark'] = name
+    return report
+
+
+def format_benchmark(report):
+    rows = report.get('rows', [])
+    lines = [f'## {report["benchmark"]}']
+    if report.get('description'):
+        lines.append(report['description'])
+    if rows:
+        columns = list(rows[0])
+        widths = [max(len(c), *(len(_cell(r.get(c))) for r in rows))
+                  for c in columns]
+        lines.append(' '.join(f'{c:>{w}}' for c, w in zip(columns, widths)))
+        lines.append('-' * (sum(widths) + len(widths) - 1))
+        for row in rows:
+            lines.append(' '.join(f'{_cell(row.get(c)):>{w}}'
+                                  for c, w in zip(columns, widths)))
+    return '\n'.join(lines)
+
+
+def _cell(value):
+    if value is None:
+        return '-'
+    if isinstance(value, float):
+        return f'{value:.2f}'
+    return str(value)
@@ -0,0 +1,89 @@
+import time
+import random
+import asyncio
+
+from offline_runtime.runtime import start_runtime
+
+
+CANDIDATES = 20
+QUATERNION = {'qx': 0.48961, 'qy': 0.51048, 'qz': 0.51019, 'qw': -0.48929}
+
+
+def run(profile):
+    """Validity of a batch of grasp candidates of the left arm: one
+    `is_pose_valid_q(..., wait=True)` after another, the checks started
+    together and `are_checkings_in_progress` polled every 0.5 s (as
+    arms_general did), and `common.arm_checks.ArmValidator` on the first
+    batch, again on the same candidates and on them moved 1 mm."""
+    rand = random.Random(profile.get('seed', 0))
+    candidates = [dict(x=rand.uniform(0.2, 0.9), y=rand.uniform(0.0, 0.5),
+                       z=rand.uniform(0.9, 1.5), **QUATERNION)
+                  for _ in range(CANDIDATES)]
+    rows = []
+    errors = []
+    verdicts = {}
+    for mode in ('sequential', 'polling', 'ArmValidator'):
+        row, mode_verdicts, mode_errors = _run_mode(profile, mode, candidates)
+        verdicts[mode] = mode_verdicts
+        rows += row
+        errors += mode_errors
+    for row in rows:
+        row['same'] = verdicts[row['mode']] == verdicts['sequential']
+    return {
+        'description': f'Seconds, {CANDIDATES} poses, fake arms controller',
+        'rows': rows,
+        'errors': errors,
+    }
+
+
+def _run_mode(profile, mode, candidates):
+    from raya.controllers.arms_controller import ArmsController
+    from common.arm_checks import ArmValidator
+
+    runtime = start_runtime(profile)
+    rows = []
+    valid = []
+
+    async def main():
+        arms = ArmsController(None, runtime, runtime.controller_config('arms'))
+        verdicts = [None] * len(candidates)
+
+        def store(i):
+            def callback(error, error_msg, distance):
+                verdicts[i] = error == 0
+            return callback
+
+        t0 = time.monotonic()
+        if mode == 'sequential':
+            for i, pose in enumerate(candidates):
+                await arms.is_pose_valid_q('left_arm', callback_finish=store(i),
+                                           wait=True, **pose)
+        elif mode == 'polling':
+            for i, pose in enumerate(candidates):
+                await arms.is_pose_valid_q('left_arm', callback_finish=store(i),
+                                           **pose)
+            while arms.are_checkings_in_progress():
+                await asyncio.sleep(0.5)
+        else:
+            checks = ArmValidator(arms)
+            verdicts = await checks.valid('left_arm', candidates)
+            rows.append(dict(mode=mode, batch='first',
+                             wall_s=time.monotonic() - t0,
+                             hits=checks.hits, misses=checks.misses))
+            jittered = [dict(pose, x=pose['x'] + 0.001) for pose in candidates]
+            for batch, poses in (('again', candidates), ('jittered', jittered)):
+                hits, misses = checks.hits, checks.misses
+                t0 = time.monotonic()
+                verdicts = await checks.valid('left_arm', poses)
+                rows.append(dict(mode=mode, batch=batch,
+                                 wall_s=time.monotonic() - t0,
+                                 hits=checks.hits - hits,
+                                 misses=checks.misses - misses))
+        if not rows:
+            rows.append(dict(mode=mode, batch='first',
+                             wall_s=time.monotonic() - t0,
+                             hits=0, misses=len(candidates)))
+        valid.extend(verdicts)
+
+    asyncio.run(main())
+    return rows, valid, list(runtime.metrics.errors)
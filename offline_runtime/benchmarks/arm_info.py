@@ -0,0 +1,73 @@
+import time
+import random
+
+from offline_runtime.runtime import start_runtime
+
+
+LOOKUPS = 2000
+VECTORS = 2000
+
+
+def run(profile):
+    """Arm metadata used over and over: the predefined pose check of
+    skills_arranging_the_home and the joint limits check of a batch of
+    joint vectors, asking the controller every time (limits compared
+    joint by joint) vs `common.arm_info.ArmInfo` (sets and one vectorized
+    comparison). The validity check requests avoided are the out of
+    limits vectors, each a `check_latency` round trip."""
+    from raya.enumerations import ANG_UNIT
+    from raya.controllers.arms_controller import ArmsController
+    from common.arm_info import ArmInfo
+
+    runtime = start_runtime(profile)
+    arms = ArmsController(None, runtime, runtime.controller_config('arms'))
+    rand = random.Random(profile.get('seed', 0))
+    arm = 'left_arm'
+    poses = arms.get_list_predefined_poses(arm) + ['unknown_pose']
+    lookups = [rand.choice(poses) for _ in range(LOOKUPS)]
+    names = arms.get_state_of_arm(arm)['name']
+    vectors = [[rand.uniform(-150.0, 150.0) for _ in names]
+               for _ in range(VECTORS)]
+
+    t0 = time.perf_counter()
+    info = ArmInfo(arms)
+    load_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    found = [pose in arms.get_list_predefined_poses(arm) for pose in lookups]
+    controller_lookup = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    cached = [info.has_predefined_pose(arm, pose) for pose in lookups]
+    info_lookup = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    inside = []
+    for vector in vectors:
+        limits = arms.get_limits_of_joints(arm, ANG_UNIT.DEG)
+        names = arms.get_state_of_arm(arm)['name']
+        inside.append(all(limits[name][0] <= value <= limits[name][1]
+                          for name, value in zip(names, vector)))
+    controller_limits = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    vectorized = info.within_limits(arm, vectors).tolist()
+    info_limits = time.perf_counter() - t0
+
+    latency = profile['controllers'].get('arms', {}).get('check_latency',
+                                                         0.15)
+    rejected = VECTORS - sum(vectorized)
+    rows = [
+        {'check': 'predefined_pose', 'controller_us':
+         controller_lookup / LOOKUPS * 1e6, 'ArmInfo_us':
+         info_lookup / LOOKUPS * 1e6, 'same': found == cached},
+        {'check': 'joint_limits', 'controller_us':
+         controller_limits / VECTORS * 1e6, 'ArmInfo_us':
+         info_limits / VECTORS * 1e6, 'same': inside == vectorized},
+    ]
+    return {
+        'description': (f'Per check, ArmInfo loaded in '
+                        f'{load_time * 1000:.2f} ms, {rejected} of {VECTORS} '
+                        f'vectors rejected locally ({latency * 1000:.0f} ms '
+                        'validity check each)'),
+        'rows': rows,
+        'errors': list(runtime.metrics.errors),
+    }
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+from offline_runtime.runtime import start_runtime
+
+
+ARMS = [('left_arm', 'left', 0.25621), ('right_arm', 'right', -0.25621)]
+QUATERNION = {'qx': 0.48961, 'qy': 0.51048, 'qz': 0.51019, 'qw': -0.48929}
+
+
+def run(profile):
+    """The moves of arms_general, and a handover where the right arm waits
+    for the left one halfway, each move awaited one after another
+    (`wait=True`) vs `common.arm_jobs.ArmScheduler`. Reports the wall
+    clock time against the sum of the durations of the moves."""
+    rows = []
+    errors = []
+    for scenario in ('arms_general', 'handover'):
+        for mode in ('sequential', 'ArmScheduler'):
+            row, mode_errors = _run_mode(profile, scenario, mode)
+            rows.append(dict(scenario=scenario, mode=mode, **row))
+            errors += mode_errors
+    return {
+        'description': 'Seconds, fake arms controller of the profile',
+        'rows': rows,
+        'errors': errors,
+    }
+
+
+def _jobs(scenario):
+    # (name, arm, action, args, kwargs, after)
+    jobs = []
+    for arm, side, y in ARMS:
+        joint = [f'arm_{side}_shoulder_FR_joint']
+        after = ['left_arm_up'] if (scenario == 'handover'
+                                    and arm == 'right_arm') else []
+        jobs += [
+            (f'{arm}_pose', arm, 'set_pose_q', (),
+             dict(x=0.38661, y=y, z=1.18, **QUATERNION), []),
+            (f'{arm}_back', arm, 'set_pose_q', (),
+             dict(x=0.28661, y=y, z=1.18, cartesian_path=True, **QUATERNION),
+             []),
+            (f'{arm}_up', arm, 'set_pose_q', (),
+             dict(x=0.28661, y=y, z=1.48, cartesian_path=True, **QUATERNION),
+             after),
+            (f'{arm}_home', arm, 'set_predefined_pose', (f'{arm}_home',), {},
+             []),
+            (f'{arm}_shoulder', arm, 'set_joints_position', (joint, [15]),
+             {}, []),
+        ]
+    return jobs
+
+
+def _run_mode(profile, scenario, mode):
+    from raya.controllers.arms_controller import ArmsController
+    from common.arm_jobs import ArmScheduler
+
+    runtime = start_runtime(profile)
+    result = {}
+
+    async def main():
+        arms = ArmsController(None, runtime, runtime.controller_config('arms'))
+        jobs = _jobs(scenario)
+        if mode == 'sequential':
+            moves = 0.0
+            t0 = time.monotonic()
+            for name, arm, action, args, kwargs, _ in jobs:
+                t_move = time.monotonic()
+                await getattr(arms, action)(arm, *args, wait=True, **kwargs)
+                moves += time.monotonic() - t_move
+            result['wall_s'] = time.monotonic() - t0
+            result['moves_s'] = moves
+        else:
+            scheduler = ArmScheduler(arms)
+            for name, arm, action, args, kwargs, after in jobs:
+                scheduler.add(name, arm, action, *args, after=after, **kwargs)
+            report = await scheduler.run()
+            result['wall_s'] = report['wall_time']
+            result['moves_s'] = report['sum_of_moves']
+        result['speedup'] = result['moves_s'] / result['wall_s']
+
+    asyncio.run(main())
+    return result, list(runtime.metrics.errors)
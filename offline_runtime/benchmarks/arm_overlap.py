@@ -0,0 +1,80 @@
+import time
+import asyncio
+
+from offline_runtime.runtime import start_runtime
+
+
+# (cycle, arm, predefined pose reached while backing away)
+CYCLES = [('pick', 'right_arm', 'nav_with_object2'),
+          ('place', 'right_arm', 'right_arm_home')]
+CLEARANCES = [0.1, 0.0]
+
+
+def run(profile):
+    """The end of a pick and of a place cycle of skills_arranging_the_home:
+    backing away 0.3 m and then moving the arm to a predefined pose
+    (followed by the 0.5 s pause of `go_to_pose`, as the app did) vs
+    `common.overlap.MotionOverlap` running the pose while backing away,
+    once the robot moved `clearance` meters, and with the base blocked
+    (the pose runs after it). Reports the time saved per cycle."""
+    rows = []
+    errors = []
+    for cycle, arm, pose in CYCLES:
+        sequential = None
+        modes = [('sequential', None, False)]
+        modes += [('MotionOverlap', clearance, False)
+                  for clearance in CLEARANCES]
+        modes += [('MotionOverlap, blocked', CLEARANCES[0], True)]
+        for mode, clearance, blocked in modes:
+            wall, overlapped, mode_errors = _run_mode(profile, arm, pose,
+                                                      clearance, blocked)
+            if sequential is None:
+                sequential = wall
+            rows.append({'cycle': cycle, 'mode': mode,
+                         'clearance_m': clearance, 'overlapped': overlapped,
+                         'wall_s': wall, 'saved_s': sequential - wall})
+            errors += mode_errors
+    return {
+        'description': 'Seconds per cycle, fake motion and arms controllers',
+        'rows': rows,
+        'errors': errors,
+    }
+
+
+def _run_mode(profile, arm, pose, clearance, blocked):
+    from raya.controllers.arms_controller import ArmsController
+    from raya.controllers.motion_controller import MotionController
+    from raya.controllers.navigation_controller import NavigationController
+    from common.completion import run_until_finished, run_until_stopped
+    from common.overlap import MotionOverlap
+
+    runtime = start_runtime(profile)
+
+    async def main():
+        arms = ArmsController(None, runtime, runtime.controller_config('arms'))
+        motion = MotionController(None, runtime,
+                                  runtime.controller_config('motion'))
+        nav = NavigationController(None, runtime,
+                                   runtime.controller_config('navigation'))
+        if blocked:
+            # Commanded for as long as backing away, but not moving
+            base = run_until_stopped(motion.set_velocity, x_velocity=0.0,
+                                     y_velocity=0.0, angular_velocity=0.0,
+                                     duration=1.0)
+        else:
+            base = run_until_stopped(motion.move_linear, distance=-0.3,
+                                     x_velocity=0.3)
+        t0 = time.monotonic()
+        if clearance is None:
+            await base
+            await run_until_finished(arms.set_predefined_pose, arm, pose)
+            await asyncio.sleep(0.5)
+            overlapped = False
+        else:
+            overlap = MotionOverlap(arms, {arm: {pose}}, clearance=clearance,
+                                    get_position=nav.get_position)
+            overlapped = (await overlap.run(base, [(arm, pose)]))['overlapped']
+        return time.monotonic() - t0, overlapped
+
+    wall, overlapped = asyncio.run(main())
+    return wall, overlapped, list(runtime.metrics.errors)
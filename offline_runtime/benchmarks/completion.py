@@ -0,0 +1,132 @@
+import time
+import asyncio
+
+from offline_runtime.runner import PACKAGE_DIR
+from offline_runtime.runtime import start_runtime
+
+
+POLL_PERIOD = 0.1
+MAP_NAME = 'unity_apartment'
+PLACE_POINT = [-1.0, 2.0, 0.8]
+
+# (step, controller, method, kwargs), a full pick-and-place run as done by
+# the skills apps
+STEPS = [
+    ('navigate_to_kitchen', 'navigation', 'navigate_to_location',
+     {'zone_name': 'kitchen'}),
+    ('pick', 'grasping', 'pick_object',
+     {'detector_model': 'coral_efficientdet_lite0_320_coco',
+      'source': 'head_front', 'object_name': 'cup', 'arms': ['right_arm']}),
+    ('move_backward', 'motion', 'move_linear',
+     {'distance': -0.3, 'x_velocity': 0.3}),
+    ('arm_nav_pose', 'arms', 'set_predefined_pose',
+     {'arm': 'right_arm', 'predefined_pose': 'nav_with_object2'}),
+    ('navigate_to_place', 'navigation', 'navigate_close_to_position',
+     {'x': PLACE_POINT[0], 'y': PLACE_POINT[1]}),
+    ('place', 'grasping', 'place_object_with_point',
+     {'point_to_place': PLACE_POINT, 'height_object': 0.1,
+      'arm': 'right_arm'}),
+    ('move_backward_2', 'motion', 'move_linear',
+     {'distance': -0.3, 'x_velocity': 0.3}),
+    ('arm_home', 'arms', 'set_predefined_pose',
+     {'arm': 'right_arm', 'predefined_pose': 'right_arm_home'}),
+]
+
+
+def run(profile):
+    """Run the same pick-and-place sequence waiting every step with the
+    sleep-polling loops of the apps and with `common.completion`, and
+    compare the time from each finish callback until the step resumes."""
+    polling = _run_mode(profile, 'polling')
+    completion = _run_mode(profile, 'completion')
+    rows = []
+    for step, _, _, _ in STEPS:
+        before = polling['steps'].get(step)
+        after = completion['steps'].get(step)
+        rows.append(_row(step, before, after))
+    rows.append(_row('total_resume', sum(polling['steps'].values()),
+                     sum(completion['steps'].values())))
+    rows.append(_row('run_wall', polling['wall'], completion['wall'],
+                     unit=1.0))
+    return {
+        'description': ('Resume latency after each finish callback (ms), '
+                        f'polling every {POLL_PERIOD} s vs completions. '
+                        'run_wall in seconds.'),
+        'rows': rows,
+        'errors': polling['errors'] + completion['errors'],
+    }
+
+
+def _row(step, before, after, unit=1000.0):
+    saved = None
+    if before is not None and after is not None:
+        saved = (before - after) * unit
+    return {
+        'step': step,
+        'polling': None if before is None else before * unit,
+        'completion': None if after is None else after * unit,
+        'saved': saved,
+    }
+
+
+def _run_mode(profile, mode):
+    from raya.application_base import RayaApplicationBase
+    from common.completion import Completion
+
+    class PickAndPlace(RayaApplicationBase):
+
+        async def setup(self):
+            self.steps = {}
+            self.ctlrs = {}
+            for name in ('navigation', 'motion', 'grasping', 'arms'):
+                self.ctlrs[name] = await self.enable_controller(name)
+            await self.ctlrs['navigation'].set_map(MAP_NAME,
+                                                   wait_localization=True,
+                                                   timeout=3.0)
+
+
+        async def loop(self):
+            for step, controller, method, kwargs in STEPS:
+                action = getattr(self.ctlrs[controller], method)
+                if mode == 'polling':
+                    resume = await self.poll(controller, action, kwargs)
+                else:
+                    resume = await self.complete(controller, action, kwargs)
+                self.steps[step] = resume
+            self.finish_app()
+
+
+        async def poll(self, controller, action, kwargs):
+            finished = []
+            def finish(*args):
+                finished.append(time.monotonic())
+            await action(wait=False, **self.callbacks(controller, finish),
+                         **kwargs)
+            while not finished:
+                await self.sleep(POLL_PERIOD)
+            return time.monotonic() - finished[0]
+
+
+        async def complete(self, controller, action, kwargs):
+            completion = Completion()
+            await action(wait=False,
+                         **self.callbacks(controller, completion.finish),
+                         **kwargs)
+            await completion
+            return time.monotonic() - completion.finished
+
+
+        def callbacks(self, controller, finish):
+            if controller == 'motion':
+                return {'callback': finish}
+            return {'callback_finish': finish}
+
+    runtime = start_runtime(profile, max_duration=300.0)
+    app = PickAndPlace(PACKAGE_DIR)
+    t0 = time.monotonic()
+    asyncio.run(app._run())
+    return {
+        'steps': getattr(app, 'steps', {}),
+        'wall': time.monotonic() - t0,
+        'errors': list(runtime.metrics.errors),
+    }
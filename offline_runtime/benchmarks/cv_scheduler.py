@@ -0,0 +1,111 @@
+import copy
+import math
+import time
+import asyncio
+import tempfile
+
+from offline_runtime.runtime import start_runtime
+
+
+CAMERA = 'head_front'
+MODEL = 'apartment_objects'
+OBJECT = 'cup'
+STILL = 4.0
+TURN = 180.0
+TURN_SPEED = 60.0
+# Seconds to load the model, fast and slower than the still periods
+LOAD_TIMES = [0.5, 3.0]
+
+
+def run(profile):
+    """cv_object_non_blocking looking for the cup: the robot stands still
+    with its back to the cup, turns 180 degrees towards it and stands
+    still again, with the detector enabled all the time vs scheduled by
+    `common.cv_scheduler.DetectorScheduler`, with a model that loads
+    fast and one that loads too slowly to be worth pausing. Reports the
+    inferences of the model, its duty, the pauses and when the cup was
+    found after the turn started."""
+    rows = []
+    errors = []
+    for load_time in LOAD_TIMES:
+        load_profile = copy.deepcopy(profile)
+        load_profile['controllers'].setdefault('cv', {})[
+            'model_load_time'] = load_time
+        for mode in ('detector', 'DetectorScheduler'):
+            row, mode_errors = _run_mode(load_profile, mode)
+            rows.append(dict(load_s=load_time, mode=mode, **row))
+            errors += mode_errors
+    rate = profile['controllers'].get('cv', {}).get('inference_rate', 8.0)
+    return {
+        'description': (f'{STILL} s still, {TURN:.0f} deg turn at '
+                        f'{TURN_SPEED:.0f} deg/s, {STILL} s still, '
+                        f'detector at {rate:.0f} Hz'),
+        'rows': rows,
+        'errors': errors,
+    }
+
+
+def _run_mode(profile, mode):
+    from raya.application_base import RayaApplicationBase
+    from common.cv_scheduler import DetectorScheduler
+
+    runtime = start_runtime(profile)
+    world = runtime.world
+    cup = next(obj for obj in world.objects if obj['name'] == OBJECT)
+    world.x, world.y, world.yaw = cup['x'] - 0.8, cup['y'], math.pi
+    found = {'at': None}
+    result = {}
+
+    async def main():
+        app = RayaApplicationBase(tempfile.gettempdir())
+        cameras = await app.enable_controller('cameras')
+        cv = await app.enable_controller('cv')
+        motion = await app.enable_controller('motion')
+        await cameras.enable_color_camera(CAMERA)
+        model = dict(model='detectors', type='object', name=MODEL,
+                     source=CAMERA)
+        if mode == 'detector':
+            detector = await cv.enable_model(**model)
+            on_frame = None
+        else:
+            detector = await DetectorScheduler(cv, motion=motion).enable(
+                **model)
+            on_frame = detector.on_frame
+        t_turn = None
+
+        def callback(detection):
+            if found['at'] is None and t_turn is not None:
+                found['at'] = time.monotonic() - t_turn
+
+        def listener(img):
+            if on_frame is not None:
+                on_frame(img)
+            detector.get_current_detections()
+
+        cameras.create_color_frame_listener(CAMERA, listener)
+        await detector.find_objects([OBJECT], callback)
+        await asyncio.sleep(STILL)
+        t_turn = time.monotonic()
+        await motion.rotate(TURN, TURN_SPEED, wait=True)
+        await asyncio.sleep(STILL)
+        cameras._shutdown()
+        detector.cancel_find_objects()
+        if mode == 'detector':
+            await cv.disable_model(model='detectors', type='object')
+        else:
+            await detector.disable()
+            stats = detector.stats()
+            result['duty'] = round(stats['duty'], 3)
+            result['pauses'] = stats['pauses']
+
+    t0 = time.monotonic()
+    asyncio.run(main())
+    return {
+        'wall_s': round(time.monotonic() - t0, 2),
+        'cv_inferences': runtime.metrics.counters['cv_inferences'],
+        'duty': result.get('duty', 1.0),
+        'pauses': result.get('pauses', 0),
+        'found': found['at'] is not None,
+        'found_after_s': (None if found['at'] is None
+                          else round(found['at'], 2)),
+    }, list(runtime.metrics.errors)
@@ -0,0 +1,95 @@
+import time
+import asyncio
+import tempfile
+
+from offline_runtime.runtime import start_runtime
+from offline_runtime.metrics import LatencyStats
+
+
+CAMERA = 'head_front'
+MODEL = 'apartment_objects'
+OBJECT = 'cup'
+DURATION = 3.0
+VERIFY_PERIOD = 0.25
+
+
+def run(profile):
+    """The consumers of skills_find_and_place_object in front of the cup:
+    the drawing and the tracker read the detector on every camera frame,
+    and a verification (`find_objects(..., wait=True)`) runs every
+    0.25 s, each asking the detector vs all of them reading
+    `common.detections.DetectionCache`. Reports the
+    reads of the detector and how long a verification waits."""
+    rows = []
+    errors = []
+    for mode in ('detector', 'DetectionCache'):
+        row, mode_errors = _run_mode(profile, mode)
+        rows.append(dict(mode=mode, **row))
+        errors += mode_errors
+    rate = profile['controllers'].get('cv', {}).get('inference_rate', 8.0)
+    return {
+        'description': (f'{DURATION} s, detector at {rate:.0f} Hz, '
+                        'results fresh for 0.5 s'),
+        'rows': rows,
+        'errors': errors,
+    }
+
+
+def _run_mode(profile, mode):
+    from raya.application_base import RayaApplicationBase
+    from common.detections import DetectionCache
+    from common.tracker import ObjectTracker
+
+    runtime = start_runtime(profile)
+    world = runtime.world
+    cup = next(obj for obj in world.objects if obj['name'] == OBJECT)
+    world.x, world.y, world.yaw = cup['x'] - 0.8, cup['y'], 0.0
+    counts = {'frames': 0, 'reads': 0}
+    verify = LatencyStats()
+    tracker = ObjectTracker()
+
+    async def main():
+        app = RayaApplicationBase(tempfile.gettempdir())
+        cameras = await app.enable_controller('cameras')
+        cv = await app.enable_controller('cv')
+        await cameras.enable_color_camera(CAMERA)
+        detector = await cv.enable_model(model='detectors', type='object',
+                                         name=MODEL, source=CAMERA)
+        read = detector.get_current_detections
+
+        def counted_read():
+            counts['reads'] += 1
+            return read()
+
+        detector.get_current_detections = counted_read
+        cache = DetectionCache(detector, max_age=0.5)
+
+        def on_frame(img):
+            counts['frames'] += 1
+            if mode == 'detector':
+                # The drawing and the tracker read it each
+                detector.get_current_detections()
+                tracker.update(detector.get_current_detections())
+            elif cache.on_frame(img):
+                tracker.update(cache.detections, cache.stamp)
+
+        cameras.create_color_frame_listener(CAMERA, on_frame)
+        await asyncio.sleep(0.5)
+        source = detector if mode == 'detector' else cache
+        t_end = time.monotonic() + DURATION
+        while time.monotonic() < t_end:
+            t0 = time.monotonic()
+            await source.find_objects([OBJECT], wait=True, timeout=0.5)
+            verify.add(time.monotonic() - t0)
+            await asyncio.sleep(VERIFY_PERIOD)
+        cameras._shutdown()
+        await cv.disable_model(model='detectors', type='object')
+
+    asyncio.run(main())
+    summary = verify.summary()
+    return {
+        'frames': counts['frames'],
+        'detector_reads': counts['reads'],
+        'verify_p50_ms': summary['p50_ms'],
+        'verify_max_ms': summary['max_ms'],
+    }, list(runtime.metrics.errors)
@@ -0,0 +1,93 @@
+import time
+import asyncio
+
+import numpy as np
+
+from offline_runtime.runtime import start_runtime
+from offline_runtime.metrics import LatencyStats
+
+
+CAMERA = 'head_front'
+# Time a GUI takes to show one frame (imshow + waitKey), the fake
+# show_image does nothing
+SHOW_TIME = 0.015
+SCALES = [1.0, 0.5]
+TICK = 0.01
+DURATION = 3.0
+
+
+def run(profile):
+    """Event loop lag while a camera listener draws the detections and
+    shows every frame inside the callback vs handing the frames to
+    `common.display.DisplayWorker`. The lag is how late a 10 ms timer,
+    standing for navigation and grasping callbacks, fires."""
+    rows = []
+    errors = []
+    for scale in SCALES:
+        for mode in ('in callback', 'DisplayWorker'):
+            row, mode_errors = _run_mode(profile, mode, scale)
+            rows.append(dict(mode=mode, scale=scale, **row))
+            errors += mode_errors
+    return {
+        'description': (f'Camera frames shown in {SHOW_TIME * 1000:.0f} ms '
+                        f'each, {DURATION} s per run'),
+        'rows': rows,
+        'errors': errors,
+    }
+
+
+def _run_mode(profile, mode, scale):
+    import cv2
+    from raya.controllers.cameras_controller import CamerasController
+    from common.display import DisplayWorker, annotate
+
+    runtime = start_runtime(profile)
+    detections = [{'object_name': 'cup', 'x_min': 200, 'y_min': 150,
+                   'x_max': 320, 'y_max': 270}]
+    shown = []
+    lag = LatencyStats()
+
+    def show(img, title='Image', scale=1.0):
+        if scale != 1.0:
+            img = cv2.resize(img, None, fx=scale, fy=scale)
+        time.sleep(SHOW_TIME)
+        shown.append(img.shape)
+
+    # `show` doesn't open windows, it can run in the thread with any
+    # HighGUI backend
+    worker = DisplayWorker('benchmark', scale=scale, show=show,
+                           threaded=True)
+
+    def in_callback(img):
+        show(annotate(img, detections), 'benchmark', scale=scale)
+
+    def to_worker(img):
+        worker.submit(img, detections)
+
+    async def main():
+        cameras = CamerasController(None, runtime,
+                                    runtime.controller_config('cameras'))
+        await cameras.enable_color_camera(CAMERA)
+        if mode == 'DisplayWorker':
+            worker.start()
+            cameras.create_color_frame_listener(CAMERA, to_worker)
+        else:
+            cameras.create_color_frame_listener(CAMERA, in_callback)
+        t_end = time.monotonic() + DURATION
+        due = time.monotonic()
+        while due < t_end:
+            due += TICK
+            await asyncio.sleep(max(0.0, due - time.monotonic()))
+            lag.add(max(0.0, time.monotonic() - due))
+        cameras._shutdown()
+        worker.stop()
+
+    asyncio.run(main())
+    summary = lag.summary()
+    return {
+        'shown_fps': len(shown) / DURATION,
+        'dropped': worker.dropped,
+        'lag_p50_ms': summary['p50_ms'],
+        'lag_p99_ms': summary['p99_ms'],
+        'lag_max_ms': summary['max_ms'],
+    }, list(runtime.metrics.errors)
@@ -0,0 +1,77 @@
+import time
+import asyncio
+
+import numpy as np
+
+from offline_runtime.runtime import start_runtime
+
+
+CAMERA = 'head_front'
+WORK_TIMES = [0.02, 0.05, 0.1]
+DURATION = 4.0
+
+
+def run(profile):
+    """A consumer that needs `work` seconds per frame, waiting for frames
+    with `get_next_frame` vs taking them from `common.frames.FrameBuffer`.
+    Reports the frames processed per second and the age of the frames
+    when processing starts."""
+    rows = []
+    errors = []
+    for work in WORK_TIMES:
+        for mode in ('get_next_frame', 'FrameBuffer'):
+            row, mode_errors = _run_mode(profile, mode, work)
+            rows.append(dict(mode=mode, work_ms=work * 1000.0, **row))
+            errors += mode_errors
+    fps = profile['controllers'].get('cameras', {}).get('fps', 15.0)
+    return {
+        'description': (f'Camera at {fps} fps, {DURATION} s per run. '
+                        'listener_us is the time spent in the camera '
+                        'callback per frame'),
+        'rows': rows,
+        'errors': errors,
+    }
+
+
+def _run_mode(profile, mode, work):
+    from raya.controllers.cameras_controller import CamerasController
+    from common.frames import FrameBuffer
+
+    runtime = start_runtime(profile)
+    ages = []
+    listener_time = []
+
+    async def main():
+        cameras = CamerasController(None, runtime,
+                                    runtime.controller_config('cameras'))
+        await cameras.enable_color_camera(CAMERA)
+        frames = None
+        if mode == 'FrameBuffer':
+            frames = FrameBuffer.listen(cameras, CAMERA)
+            append = frames.append
+
+            def timed_append(frame):
+                t0 = time.perf_counter()
+                append(frame)
+                listener_time.append(time.perf_counter() - t0)
+            cameras.create_color_frame_listener(CAMERA, timed_append)
+        t_end = time.monotonic() + DURATION
+        while time.monotonic() < t_end:
+            if frames is None:
+                await cameras.get_next_frame(CAMERA)
+                stamp = cameras.latest_frame(CAMERA)[0]
+            else:
+                _, stamp = await frames.next()
+            ages.append(time.monotonic() - stamp)
+            # Processing of the frame, off the event loop
+            await asyncio.sleep(work)
+        cameras._shutdown()
+
+    asyncio.run(main())
+    return {
+        'processed_fps': len(ages) / DURATION,
+        'age_p50_ms': float(np.percentile(ages, 50)) * 1000.0,
+        'age_max_ms': float(np.max(ages)) * 1000.0,
+        'listener_us': (float(np.mean(listener_time)) * 1e6
+                        if listener_time else None),
+    }, list(runtime.metrics.errors)
@@ -0,0 +1,111 @@
+import copy
+import time
+import asyncio
+import tempfile
+
+from offline_runtime.runtime import start_runtime
+
+
+CAMERA = 'head_front'
+MODEL = 'apartment_objects'
+OBJECT = 'cup'
+ARM = 'right_arm'
+TRIES = 3
+RUNS = 4
+# (scenario, grasp success rate, cup in the world)
+SCENARIOS = [('flaky grasp', 0.5, True), ('object gone', 1.0, False)]
+
+
+def run(profile):
+    """Picking the cup in front of the robot, with the retries of
+    hello_world (3 tries, 0.5 s sleep before each) vs
+    `common.grasp.GraspPipeline` (pre-checks of a fresh detection, a
+    free arm and the reach, then 3 tries with 0.5 s, 1 s backoff), when
+    half of the grasps fail and when the cup is not there anymore.
+    Reports the mean per pick over several seeds and the latencies of
+    the attempts of the pipeline."""
+    rows = []
+    errors = []
+    for scenario, success_rate, present in SCENARIOS:
+        for mode in ('fixed_sleep', 'GraspPipeline'):
+            results = []
+            for seed in range(RUNS):
+                scenario_profile = copy.deepcopy(profile)
+                scenario_profile['seed'] = seed
+                scenario_profile['controllers'].setdefault('grasping', {})[
+                    'success_rate'] = success_rate
+                result, run_errors = _run_mode(scenario_profile, mode,
+                                               present)
+                results.append(result)
+                errors += run_errors
+            row = {'scenario': scenario, 'mode': mode,
+                   'picked': f'{sum(r["picked"] for r in results)}/{RUNS}'}
+            for key in ('attempts', 'picks', 'wall_s'):
+                row[key] = sum(r[key] for r in results) / RUNS
+            row['attempt_p90_s'] = results[-1].get('attempt_p90_s')
+            rows.append(row)
+    return {
+        'description': (f'Means of {RUNS} runs, one pick each, '
+                        f'{TRIES} tries'),
+        'rows': rows,
+        'errors': errors,
+    }
+
+
+def _run_mode(profile, mode, present):
+    from raya.application_base import RayaApplicationBase
+    from raya.exceptions import RayaGraspingException
+    from common.grasp import GraspPipeline
+    from common.retry import RetryBudget
+
+    runtime = start_runtime(profile)
+    world = runtime.world
+    cup = next(obj for obj in world.objects if obj['name'] == OBJECT)
+    # Facing the cup, 0.8 m away
+    world.x, world.y, world.yaw = cup['x'] - 0.8, cup['y'], 0.0
+    if not present:
+        world.objects = [obj for obj in world.objects if obj is not cup]
+    result = {'picked': False, 'attempts': 0, 'picks': 0}
+
+    async def main():
+        app = RayaApplicationBase(tempfile.gettempdir())
+        cameras = await app.enable_controller('cameras')
+        cv = await app.enable_controller('cv')
+        grasp = await app.enable_controller('grasping')
+        arms = await app.enable_controller('arms')
+        nav = await app.enable_controller('navigation')
+        await cameras.enable_color_camera(CAMERA)
+        detector = await cv.enable_model(model='detectors', type='object',
+                                         name=MODEL, source=CAMERA)
+        t0 = time.monotonic()
+        if mode == 'fixed_sleep':
+            for _ in range(TRIES):
+                result['attempts'] += 1
+                result['picks'] += 1
+                try:
+                    await asyncio.sleep(0.5)
+                    await grasp.pick_object(detector_model=MODEL,
+                                            source=CAMERA, object_name=OBJECT,
+                                            wait=True, arms=[ARM])
+                    result['picked'] = True
+                    break
+                except RayaGraspingException:
+                    continue
+        else:
+            picker = GraspPipeline(grasp, arms, detector, nav=nav,
+                                   budget=RetryBudget(max_tries=TRIES,
+                                                      base_delay=0.5))
+            error, _, _ = await picker.pick(OBJECT, detector_model=MODEL,
+                                            source=CAMERA, arms=[ARM])
+            report = picker.report()
+            result['picked'] = error == 0
+            result['attempts'] = report['attempt']['count']
+            result['picks'] = report['pick']['count']
+            result['attempt_p90_s'] = report['attempt']['p90']
+        result['wall_s'] = time.monotonic() - t0
+        await cv.disable_model(model='detectors', type='object')
+        for controller in app._controllers.values():
+            controller._shutdown()
+
+    asyncio.run(main())
+    return result, list(runtime.metrics.errors)
@@ -0,0 +1,61 @@
+import time
+
+import numpy as np
+
+from offline_runtime.runtime import start_runtime
+
+
+MAX_POINTS = [None, 360, 180]
+DURATION = 2.0
+
+
+def run(profile):
+    """Frames per second of the lidar_scan plot, clearing and redrawing
+    the whole figure every scan vs `common.lidar_plot.LidarPlot`, headless
+    on the Agg backend."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from raya.enumerations import ANG_UNIT
+    from raya.controllers.lidar_controller import LidarController
+    from common.lidar_plot import LidarPlot
+
+    runtime = start_runtime(profile)
+    lidar = LidarController(None, runtime, runtime.controller_config('lidar'))
+    info = lidar.get_laser_info(ang_unit=ANG_UNIT.RAD)
+    raw_data = lidar.get_raw_data()
+    theta = np.linspace(info['angle_min'], info['angle_max'], len(raw_data))
+    rows = []
+
+    fig = plt.figure()
+    ax = fig.add_subplot(111, projection='polar')
+    def redraw():
+        ax.clear()
+        ax.scatter(x=-np.array(theta)-1.578, y=raw_data, s=2)
+        ax.set_ylim(0.0, 10.0)
+        fig.canvas.draw()
+    rows.append({'plot': 'clear + scatter', 'points': len(raw_data),
+                 'fps': _fps(redraw)})
+    plt.close(fig)
+
+    for max_points in MAX_POINTS:
+        plot = LidarPlot(range_max=info['range_max'], max_points=max_points)
+        rows.append({'plot': 'LidarPlot (blit)',
+                     'points': min(len(raw_data), max_points or len(raw_data)),
+                     'fps': _fps(lambda: plot.update(theta, raw_data))})
+        plot.close()
+    return {
+        'description': ('Lidar plot frames per second, Agg backend, '
+                        f'{len(raw_data)} rays per scan'),
+        'rows': rows,
+        'errors': list(runtime.metrics.errors),
+    }
+
+
+def _fps(draw):
+    frames = 0
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < DURATION:
+        draw()
+        frames += 1
+    return frames / (time.perf_counter() - t0)
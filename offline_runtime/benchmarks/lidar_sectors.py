@@ -0,0 +1,67 @@
+import time
+
+import numpy as np
+
+from offline_runtime.runtime import start_runtime
+
+
+SECTOR_COUNTS = [1, 8, 36, 72]
+UPPER_DISTANCE = 1.0
+DURATION = 0.5
+
+
+def run(profile):
+    """Time the check of `n` lidar sectors per scan, calling
+    `check_obstacle` once per sector (plus the `np.linspace` of the angles
+    that lidar_scan rebuilt every loop) vs one `LidarSectors.evaluate`."""
+    from raya.enumerations import ANG_UNIT
+    from raya.controllers.lidar_controller import LidarController
+    from common.lidar import LidarSectors
+
+    runtime = start_runtime(profile)
+    lidar = LidarController(None, runtime, runtime.controller_config('lidar'))
+    info = lidar.get_laser_info(ang_unit=ANG_UNIT.RAD)
+    rows = []
+    for count in SECTOR_COUNTS:
+        raw_data = lidar.get_raw_data()
+        sectors = LidarSectors.uniform(info, count, UPPER_DISTANCE,
+                                       laser_info_unit=ANG_UNIT.RAD)
+
+        def per_sector():
+            np.linspace(info['angle_min'], info['angle_max'], len(raw_data))
+            return [lidar.check_obstacle(lower, upper, distance)
+                    for lower, upper, distance in sectors.sectors]
+
+        def vectorized():
+            return sectors.evaluate(raw_data)[1]
+
+        # The fake lidar publishes a new scan every scan period
+        expected = per_sector()
+        if (lidar.get_raw_data() == raw_data
+                and list(vectorized()) != expected):
+            runtime.metrics.errors.append(f'{count} sectors: hits differ')
+        before = _time_per_call(per_sector)
+        after = _time_per_call(vectorized)
+        rows.append({
+            'sectors': count,
+            'check_obstacle_us': before * 1e6,
+            'evaluate_us': after * 1e6,
+            'speedup': before / after,
+        })
+    return {
+        'description': ('Time to check all the sectors of one scan '
+                        f'({len(raw_data)} rays), in microseconds. '
+                        'check_obstacle runs locally here, without the '
+                        'round trip of the real controller'),
+        'rows': rows,
+        'errors': list(runtime.metrics.errors),
+    }
+
+
+def _time_per_call(func):
+    calls = 0
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < DURATION:
+        func()
+        calls += 1
+    return (time.perf_counter() - t0) / calls
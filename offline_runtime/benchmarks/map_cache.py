@@ -0,0 +1,68 @@
+import time
+import asyncio
+import tempfile
+
+from offline_runtime.runtime import start_runtime
+
+
+MAP = 'unity_apartment'
+LAUNCHES = 3
+
+
+def run(profile):
+    """What the navigation apps read at startup (the map image and info,
+    the zones and locations and their lists), with a request per item vs
+    `common.map_cache.MapCache`: the first launch fills the cache, the
+    next ones read it from disk and only check the zone and location
+    lists. Every launch uses a new controller."""
+    from raya.controllers.navigation_controller import NavigationController
+    from common.map_cache import MapCache
+
+    runtime = start_runtime(profile)
+    config = runtime.controller_config('navigation')
+    rows = []
+
+    async def direct(nav):
+        image, _ = await nav.get_map(MAP)
+        await nav.get_zones(MAP)
+        await nav.get_locations(MAP)
+        await nav.get_zones_list(MAP)
+        await nav.get_locations_list(MAP)
+        return image
+
+    async def cached(cache):
+        image, _ = await cache.get_map(MAP)
+        await cache.get_zones(MAP)
+        await cache.get_locations(MAP)
+        await cache.get_zones_list(MAP)
+        await cache.get_locations_list(MAP)
+        return image
+
+    async def launch(mode, directory):
+        nav = NavigationController(None, runtime, config)
+        calls = runtime.metrics.counters['navigation_calls']
+        t0 = time.perf_counter()
+        if mode == 'requests':
+            image = await direct(nav)
+        else:
+            image = await cached(MapCache(nav, directory))
+        elapsed = time.perf_counter() - t0
+        return {
+            'ms': elapsed * 1000.0,
+            'requests': runtime.metrics.counters['navigation_calls'] - calls,
+            'map_kb': image.nbytes / 1024.0,
+        }
+
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in ('requests', 'MapCache'):
+            for i in range(LAUNCHES):
+                row = asyncio.run(launch(mode, directory))
+                rows.append(dict(mode=mode, launch=i + 1, **row))
+    return {
+        'description': (f'Map \'{MAP}\', {config.get("call_latency", 0.0)} s '
+                        'per request and '
+                        f'{config.get("map_transfer_rate", 0.0)} MB/s for '
+                        'the map transfer'),
+        'rows': rows,
+        'errors': list(runtime.metrics.errors),
+    }
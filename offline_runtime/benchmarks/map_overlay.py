@@ -0,0 +1,61 @@
+import math
+import time
+
+import numpy as np
+
+
+MAP_SIZES = [(480, 400), (2000, 2000), (4000, 4000)]
+VIEWPORT_SCALE = 0.25
+FRAMES = 200
+
+
+def run(profile):
+    """Time to draw a frame of nav_to_click, the robot driving around the
+    map and the goal arrow shown half of the time: copying the whole map
+    and drawing on it (the original `draw()`) vs `common.map_overlay.
+    MapOverlay`, full size and as a downscaled viewport."""
+    import cv2
+    from common.map_overlay import MapOverlay
+
+    rows = []
+    for width, height in MAP_SIZES:
+        map_image = np.full((height, width, 3), 254, np.uint8)
+        poses = [(int(width / 2 + width / 3 * math.cos(i / 20.0)),
+                  int(height / 2 + height / 3 * math.sin(i / 20.0)),
+                  i / 20.0 + math.pi / 2) for i in range(FRAMES)]
+        arrow = ((width // 4, height // 4), (width // 4 + 60, height // 4 + 30))
+
+        def original(x, y, angle, click):
+            img = map_image.copy()
+            x_line = x + int(7 * math.cos(-angle))
+            y_line = y + int(7 * math.sin(-angle))
+            cv2.circle(img, (x, y), 8, (255, 0, 0), 2)
+            cv2.line(img, (x, y), (x_line, y_line), (0, 0, 255), 4)
+            if click:
+                cv2.arrowedLine(img, click[0], click[1], (0, 150, 0), 3)
+            return img
+
+        modes = [('copy', original, None)]
+        for scale in (1.0, VIEWPORT_SCALE):
+            t0 = time.perf_counter()
+            overlay = MapOverlay(map_image, scale=scale)
+            modes.append((f'MapOverlay x{scale}', overlay.draw,
+                          time.perf_counter() - t0))
+        for mode, draw, init in modes:
+            t0 = time.perf_counter()
+            for i, (x, y, angle) in enumerate(poses):
+                frame = draw(x, y, angle, arrow if (i // 10) % 2 else None)
+            elapsed = time.perf_counter() - t0
+            rows.append({
+                'map': f'{width}x{height}',
+                'mode': mode,
+                'frame_ms': elapsed / FRAMES * 1000.0,
+                'setup_ms': (init or 0.0) * 1000.0,
+                'frame_kb': frame.nbytes / 1024.0,
+            })
+    return {
+        'description': (f'{FRAMES} frames per run, nav_to_click shows a '
+                        'frame every 20 ms'),
+        'rows': rows,
+        'errors': [],
+    }
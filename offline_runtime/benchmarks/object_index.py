@@ -0,0 +1,81 @@
+import math
+import time
+import random
+
+import numpy as np
+
+
+OBJECT_COUNTS = [2, 20, 200]
+DETECTIONS = 2000
+NOISE = 0.05
+RADIUS = 1.0
+
+
+def run(profile):
+    """Deduplication of a stream of noisy detections of the same objects,
+    comparing every detection with every stored point (the original
+    check_objects_to_clean) vs `common.object_index.ObjectIndex`."""
+    from common.object_index import ObjectIndex
+
+    rows = []
+    for count in OBJECT_COUNTS:
+        rand = random.Random(profile.get('seed', 0))
+        # Objects on a grid 2 radius apart, so they never merge
+        side = math.ceil(math.sqrt(count))
+        objects = [(2.0 * RADIUS * (i % side), 2.0 * RADIUS * (i // side),
+                    0.8) for i in range(count)]
+        stream = []
+        for _ in range(DETECTIONS):
+            x, y, z = rand.choice(objects)
+            stream.append([x + rand.gauss(0.0, NOISE),
+                           y + rand.gauss(0.0, NOISE), z])
+
+        t0 = time.perf_counter()
+        points = _pairwise(stream)
+        before = time.perf_counter() - t0
+
+        index = ObjectIndex(radius=RADIUS)
+        t0 = time.perf_counter()
+        for point in stream:
+            index.add('cup', point)
+        after = time.perf_counter() - t0
+
+        error = max(math.dist(obj.position, _closest(objects, obj.position))
+                    for obj in index.objects())
+        first_error = max(math.dist(p, _closest(objects, p)) for p in points)
+        rows.append({
+            'objects': count,
+            'pairwise_us': before / DETECTIONS * 1e6,
+            'index_us': after / DETECTIONS * 1e6,
+            'pairwise_found': len(points),
+            'index_found': len(index),
+            'pairwise_err_cm': first_error * 100.0,
+            'index_err_cm': error * 100.0,
+        })
+    return {
+        'description': (f'Microseconds per detection, {DETECTIONS} '
+                        f'detections with {NOISE * 100:.0f} cm of noise. '
+                        'err_cm is the worst distance from a stored '
+                        'position to its object'),
+        'rows': rows,
+        'errors': [],
+    }
+
+
+def _pairwise(stream):
+    # As check_objects_to_clean did it, keeps the first detection
+    points = []
+    for point in stream:
+        add_obj = True
+        for stored in points:
+            p1 = np.array(point)
+            p2 = np.array(stored)
+            if np.sqrt(np.sum((p1 - p2) ** 2, axis=0)) < RADIUS:
+                add_obj = False
+        if add_obj:
+            points.append(point)
+    return points
+
+
+def _closest(objects, position):
+    return min(objects, key=lambda obj: math.dist(obj, position))
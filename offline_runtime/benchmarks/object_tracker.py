@@ -0,0 +1,82 @@
+import math
+import time
+import random
+
+
+OBJECT_COUNTS = [3, 10, 30]
+FRAMES = 180
+# Degrees the camera turns between two inferences and its field of view
+TURN = 2.0
+HFOV = 60.0
+WIDTH = 640
+BOX_NOISE = 4.0
+MAP_NOISE = 0.05
+MISS_RATE = 0.1
+
+
+def run(profile):
+    """A 360 degrees sweep of objects at random bearings, with noisy boxes
+    and map positions and missed detections. Compares the detections the
+    skills apps handled one by one vs the births and deaths reported by
+    `common.tracker.ObjectTracker`, and how many tracks each object got."""
+    from common.tracker import ObjectTracker
+
+    rows = []
+    for count in OBJECT_COUNTS:
+        rand = random.Random(profile.get('seed', 0))
+        objects = [(i, rand.uniform(0.0, 360.0), rand.uniform(1.0, 4.0))
+                   for i in range(count)]
+        frames = [_frame(rand, objects, i * TURN) for i in range(FRAMES)]
+
+        births, deaths, identities = [], [], {}
+        tracker = ObjectTracker()
+        t0 = time.perf_counter()
+        for detections in frames:
+            born, dead = tracker.update(detections)
+            births += born
+            deaths += dead
+        elapsed = time.perf_counter() - t0
+        for track in tracker.tracks(include_dead=True):
+            identities.setdefault(track.detection['truth'], set()).add(
+                track.id)
+
+        raw = sum(len(detections) for detections in frames)
+        rows.append({
+            'objects': count,
+            'raw_detections': raw,
+            'events': len(births) + len(deaths),
+            'found': len(identities),
+            'tracks_per_object': len(births) / max(len(identities), 1),
+            'update_us': elapsed / FRAMES * 1e6,
+        })
+    return {
+        'description': (f'{FRAMES} inferences, {TURN} deg apart, '
+                        f'{MISS_RATE * 100:.0f}% of the detections '
+                        'missed'),
+        'rows': rows,
+        'errors': [],
+    }
+
+
+def _frame(rand, objects, heading):
+    detections = []
+    for i, bearing, distance in objects:
+        offset = (bearing - heading + 180.0) % 360.0 - 180.0
+        if abs(offset) > HFOV / 2 or rand.random() < MISS_RATE:
+            continue
+        u = WIDTH / 2 + offset / (HFOV / 2) * WIDTH / 2
+        half = 120.0 / distance
+        x = distance * math.cos(math.radians(bearing))
+        y = distance * math.sin(math.radians(bearing))
+        detections.append({
+            'truth': i,
+            'object_name': 'cup' if i % 2 else 'bottle',
+            'confidence': 0.9,
+            'x_min': u - half + rand.gauss(0.0, BOX_NOISE),
+            'y_min': 240 - half + rand.gauss(0.0, BOX_NOISE),
+            'x_max': u + half + rand.gauss(0.0, BOX_NOISE),
+            'y_max': 240 + half + rand.gauss(0.0, BOX_NOISE),
+            'center_point_map': [x + rand.gauss(0.0, MAP_NOISE),
+                                 y + rand.gauss(0.0, MAP_NOISE), 0.8],
+        })
+    return detections
@@ -0,0 +1,86 @@
+import time
+import asyncio
+
+from offline_runtime.runtime import start_runtime
+
+
+SECTORS = 36
+UPPER_DISTANCE = 1.0
+DURATION = 6.0
+# Close to a wall, spinning, so sectors keep entering and leaving the
+# obstacle distance
+START_POSE = (4.2, 0.0, 0.0)
+SPIN_VELOCITY = 1.0
+
+
+def run(profile):
+    """Callbacks fired and CPU used while the robot spins near a wall with
+    one obstacle listener per sector, using `create_obstacle_listener` vs
+    `common.obstacles.ObstacleDispatcher`."""
+    modes = [
+        ('create_obstacle_listener', None),
+        ('dispatcher, edges only', {}),
+        ('dispatcher, hysteresis', {'clear_distance': UPPER_DISTANCE + 0.2,
+                                    'debounce': 2}),
+        ('dispatcher, repeat 1 s', {'clear_distance': UPPER_DISTANCE + 0.2,
+                                    'debounce': 2, 'repeat': True,
+                                    'min_interval': 1.0}),
+    ]
+    rows = []
+    errors = []
+    for name, options in modes:
+        row, mode_errors = _run_mode(profile, options)
+        rows.append(dict(mode=name, **row))
+        errors += mode_errors
+    return {
+        'description': (f'{SECTORS} sectors at {UPPER_DISTANCE} m, robot '
+                        f'spinning at {SPIN_VELOCITY} rad/s next to a wall '
+                        f'for {DURATION} s'),
+        'rows': rows,
+        'errors': errors,
+    }
+
+
+def _run_mode(profile, options):
+    from raya.controllers.lidar_controller import LidarController
+    from common.obstacles import ObstacleDispatcher
+
+    runtime = start_runtime(profile)
+    world = runtime.world
+    world.x, world.y, world.yaw = START_POSE
+    fired = []
+
+    def callback():
+        fired.append(time.monotonic())
+
+    async def main():
+        lidar = LidarController(None, runtime,
+                                runtime.controller_config('lidar'))
+        width = 360.0 / SECTORS
+        dispatcher = None
+        if options is None:
+            for i in range(SECTORS):
+                lidar.create_obstacle_listener(f'sector_{i}', callback,
+                                               i * width, (i + 1) * width,
+                                               UPPER_DISTANCE)
+        else:
+            dispatcher = ObstacleDispatcher(lidar)
+            for i in range(SECTORS):
+                dispatcher.create_obstacle_listener(
+                    f'sector_{i}', callback, i * width, (i + 1) * width,
+                    UPPER_DISTANCE, **options)
+            dispatcher.start()
+        world.set_velocity(0.0, 0.0, SPIN_VELOCITY, DURATION)
+        await asyncio.sleep(DURATION)
+        if dispatcher is not None:
+            await dispatcher.stop()
+        lidar._shutdown()
+
+    cpu = time.process_time()
+    asyncio.run(main())
+    cpu = time.process_time() - cpu
+    return {
+        'callbacks': len(fired),
+        'callbacks_per_s': len(fired) / DURATION,
+        'cpu_ms_per_s': cpu * 1000.0 / DURATION,
+    }, list(runtime.metrics.errors)
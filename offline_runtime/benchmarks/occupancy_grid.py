@@ -0,0 +1,62 @@
+import math
+import time
+
+import numpy as np
+
+from offline_runtime.runtime import start_runtime
+
+
+MAP_NAME = 'unity_apartment'
+SPIN_SCANS = 36
+RAY_STEPS = [1, 2, 4]
+DURATION = 2.0
+
+
+def run(profile):
+    """Scans per second `common.occupancy.OccupancyGrid` fuses while the
+    robot spins in place, compared with the lidar scan rate."""
+    from common.occupancy import OccupancyGrid
+
+    runtime = start_runtime(profile)
+    world = runtime.world
+    config = runtime.controller_config('lidar')
+    angles = np.linspace(config.get('angle_min', -math.pi),
+                         config.get('angle_max', math.pi),
+                         config.get('num_points', 720))
+    range_max = config.get('range_max', 10.0)
+    x, y, yaw = world.pose()
+    # A full turn in place, rotating the rays is the same as rotating the
+    # robot
+    scans = []
+    for i in range(SPIN_SCANS):
+        turn = 2.0 * math.pi * i / SPIN_SCANS
+        scans.append((world.lidar_ranges(angles + turn, range_max,
+                                         config.get('noise', 0.0)),
+                      (x, y, yaw + turn)))
+    map_info = world.maps[MAP_NAME]
+    scan_rate = config.get('scan_rate', 10.0)
+    rows = []
+    for ray_step in RAY_STEPS:
+        grid = OccupancyGrid(map_info, max_range=range_max)
+        rays = angles[::ray_step]
+        t0 = time.perf_counter()
+        while time.perf_counter() - t0 < DURATION:
+            ranges, pose = scans[grid.scans % SPIN_SCANS]
+            grid.integrate(ranges[::ray_step], rays, pose)
+        rate = grid.scans / (time.perf_counter() - t0)
+        image = grid.to_image()
+        rows.append({
+            'rays': len(rays),
+            'ms_per_scan': 1000.0 / rate,
+            'scans_per_s': rate,
+            'lidar_rate': scan_rate,
+            'occupied_px': int(np.count_nonzero(image[..., 0] == 0)),
+            'free_px': int(np.count_nonzero(image[..., 0] == 254)),
+        })
+    return {
+        'description': (f'Occupancy grid {map_info["width"]}x'
+                        f'{map_info["height"]} at {map_info["resolution"]} '
+                        'm, robot spinning in place, one core'),
+        'rows': rows,
+        'errors': list(runtime.metrics.errors),
+    }
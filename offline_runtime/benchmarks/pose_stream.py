@@ -0,0 +1,82 @@
+import math
+import time
+import asyncio
+
+from offline_runtime.runtime import start_runtime
+
+
+MAP = 'unity_apartment'
+GOAL = (3.0, 2.5)
+DURATION = 4.0
+# nav_to_click waits 20 ms for a key per frame and draws the extrapolated
+# pose, nav_to_sorted_point does nothing else and waits for the next pose
+CONSUMERS = [('nav_to_click', 0.02), ('nav_to_sorted_point', None)]
+STREAM_RATE = 10.0
+
+
+def run(profile):
+    """Navigation app loops that need the robot pose every iteration while
+    the robot drives: a `get_position` request per iteration vs reading
+    `common.pose.PoseStream` polled at a fixed rate. Reports the requests
+    per second, the loop rate and how far the pose used is from the real
+    one (the stream extrapolates it with the estimated velocity)."""
+    rows = []
+    errors = []
+    for app, work in CONSUMERS:
+        for mode in ('get_position', 'PoseStream'):
+            row, mode_errors = _run_mode(profile, mode, work)
+            rows.append(dict(app=app, mode=mode, **row))
+            errors += mode_errors
+    latency = profile['controllers'].get('navigation', {}).get(
+        'call_latency', 0.0)
+    return {
+        'description': (f'{DURATION} s driving, {latency * 1000:.0f} ms per '
+                        f'request, stream at {STREAM_RATE:.0f} Hz'),
+        'rows': rows,
+        'errors': errors,
+    }
+
+
+def _run_mode(profile, mode, work):
+    from raya.controllers.navigation_controller import NavigationController
+    from common.pose import PoseStream
+
+    runtime = start_runtime(profile)
+    pose_errors = []
+    iterations = 0
+
+    async def main():
+        nonlocal iterations
+        nav = NavigationController(None, runtime,
+                                   runtime.controller_config('navigation'))
+        await nav.set_map(MAP)
+        await nav.navigate_to_position(GOAL[0], GOAL[1], 0.0)
+        poses = PoseStream(nav, rate=STREAM_RATE)
+        if mode == 'PoseStream':
+            await poses.start().next()
+        calls = runtime.metrics.counters['navigation_calls']
+        t_end = time.monotonic() + DURATION
+        while time.monotonic() < t_end:
+            if mode == 'get_position':
+                pose = await nav.get_position()
+            elif work is None:
+                pose = await poses.next()
+            else:
+                pose = poses.predict()
+            real_x, real_y, _ = runtime.world.pose()
+            pose_errors.append(math.hypot(pose['x'] - real_x,
+                                          pose['y'] - real_y))
+            iterations += 1
+            if work is not None:
+                await asyncio.sleep(work)
+        await poses.stop()
+        return runtime.metrics.counters['navigation_calls'] - calls
+
+    requests = asyncio.run(main())
+    pose_errors.sort()
+    return {
+        'requests_s': requests / DURATION,
+        'loop_hz': iterations / DURATION,
+        'err_p50_cm': pose_errors[len(pose_errors) // 2] * 100.0,
+        'err_max_cm': pose_errors[-1] * 100.0,
+    }, list(runtime.metrics.errors)
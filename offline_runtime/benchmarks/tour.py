@@ -0,0 +1,54 @@
+import time
+import random
+
+
+TARGET_COUNTS = [3, 10, 30, 60]
+CLASSES = ['cup', 'bottle', 'bowl']
+# Size in meters of the area the objects are found in
+WIDTH = 12.0
+HEIGHT = 9.0
+TRIALS = 20
+
+
+def run(profile):
+    """Length of a tour picking objects scattered in the map and ending at
+    the place point, visiting them class by class in the order they were
+    found (the iteration order of skills_arranging_the_home) vs the order
+    of `common.tour.plan_tour`, with nearest neighbour only and with 2-opt.
+    Straight line distances, averaged over random layouts."""
+    from common.tour import plan_tour, tour_length
+
+    rows = []
+    rand = random.Random(profile.get('seed', 0))
+    for count in TARGET_COUNTS:
+        totals = {'found': 0.0, 'nearest': 0.0, 'two_opt': 0.0}
+        elapsed = {'nearest': 0.0, 'two_opt': 0.0}
+        for _ in range(TRIALS):
+            start = [rand.uniform(0.0, WIDTH), rand.uniform(0.0, HEIGHT)]
+            end = [rand.uniform(0.0, WIDTH), rand.uniform(0.0, HEIGHT)]
+            points = [[rand.uniform(0.0, WIDTH), rand.uniform(0.0, HEIGHT)]
+                      for _ in range(count)]
+            classes = [rand.choice(CLASSES) for _ in range(count)]
+            found = sorted(range(count),
+                           key=lambda i: CLASSES.index(classes[i]))
+            totals['found'] += tour_length(start, points, found, end)
+            for name, rounds in (('nearest', 0), ('two_opt', 100)):
+                t0 = time.perf_counter()
+                order = plan_tour(start, points, end=end, max_rounds=rounds)
+                elapsed[name] += time.perf_counter() - t0
+                totals[name] += tour_length(start, points, order, end)
+        rows.append({
+            'targets': count,
+            'found_order_m': totals['found'] / TRIALS,
+            'nearest_m': totals['nearest'] / TRIALS,
+            'two_opt_m': totals['two_opt'] / TRIALS,
+            'saved_pct': 100.0 * (1.0 - totals['two_opt'] / totals['found']),
+            'nearest_ms': elapsed['nearest'] / TRIALS * 1000.0,
+            'two_opt_ms': elapsed['two_opt'] / TRIALS * 1000.0,
+        })
+    return {
+        'description': (f'Objects in a {WIDTH:.0f} x {HEIGHT:.0f} m area, '
+                        f'mean of {TRIALS} layouts'),
+        'rows': rows,
+        'errors': [],
+    }
@@ -0,0 +1,55 @@
+import time
+import random
+
+import numpy as np
+
+
+POINT_COUNTS = [4, 100, 10000]
+MAP_INFO = {'resolution': 0.025, 'origin': [-5.0, -4.0, 0.0],
+            'width': 400, 'height': 320}
+REPEAT = 20
+
+
+def run(profile):
+    """Meters to pixels and back for polygons and paths of `n` points,
+    converting point by point in Python (as the apps do by hand) vs
+    `common.units.MapFrame` on the whole array. A conversion through the
+    controller would cost a request per point on top."""
+    from common.units import MapFrame
+
+    frame = MapFrame(MAP_INFO)
+    res = MAP_INFO['resolution']
+    ox, oy = MAP_INFO['origin'][:2]
+    height = MAP_INFO['height']
+
+    def per_point(points):
+        pixels = [(int(round((x - ox) / res)),
+                   int(round(height - (y - oy) / res))) for x, y in points]
+        return [(u * res + ox, (height - v) * res + oy) for u, v in pixels]
+
+    def vectorized(points):
+        return frame.to_meters(frame.to_pixel(points))
+
+    rows = []
+    rand = random.Random(profile.get('seed', 0))
+    for count in POINT_COUNTS:
+        points = [(rand.uniform(-5.0, 5.0), rand.uniform(-4.0, 4.0))
+                  for _ in range(count)]
+        array = np.array(points)
+        row = {'points': count}
+        for name, convert, data in (('loop', per_point, points),
+                                    ('MapFrame', vectorized, array)):
+            t0 = time.perf_counter()
+            for _ in range(REPEAT):
+                convert(data)
+            row[f'{name}_us'] = (time.perf_counter() - t0) / REPEAT * 1e6
+        row['max_diff_m'] = float(np.abs(vectorized(points)
+                                         - np.array(per_point(points))).max())
+        row['speedup'] = row['loop_us'] / row['MapFrame_us']
+        rows.append(row)
+    return {
+        'description': ('Round trip meters -> pixels -> meters, lists of '
+                        'tuples for the loop and arrays for MapFrame'),
+        'rows': rows,
+        'errors': [],
+    }
@@ -0,0 +1,61 @@
+import math
+import time
+import random
+
+
+ZONE_COUNTS = [3, 30, 300]
+POINTS = 2000
+
+
+def run(profile):
+    """Which zones contain a robot position: a `nav.is_in_zone` request
+    per zone (only its latency, `request_ms`), the even-odd test of the
+    controller in Python for every zone, and `common.zones.ZoneIndex` for
+    one position at a time and for a batch of positions."""
+    from raya.controllers.navigation_controller import point_in_polygon
+    from common.zones import ZoneIndex
+
+    latency = profile['controllers'].get('navigation', {}).get(
+        'call_latency', 0.0)
+    rows = []
+    for count in ZONE_COUNTS:
+        rand = random.Random(profile.get('seed', 0))
+        zones = {f'zone{i}': _polygon(rand) for i in range(count)}
+        points = [(rand.uniform(-20.0, 20.0), rand.uniform(-20.0, 20.0))
+                  for _ in range(POINTS)]
+        index = ZoneIndex(zones)
+
+        t0 = time.perf_counter()
+        loop = [[point_in_polygon(x, y, polygon)
+                 for polygon in zones.values()] for x, y in points]
+        loop_time = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for x, y in points:
+            index.zones_at(x, y)
+        single_time = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        batch = index.contains(points)
+        batch_time = time.perf_counter() - t0
+
+        rows.append({
+            'zones': count,
+            'request_ms': latency * count * 1000.0,
+            'loop_us': loop_time / POINTS * 1e6,
+            'ZoneIndex_us': single_time / POINTS * 1e6,
+            'batch_us': batch_time / POINTS * 1e6,
+            'same': bool((batch == loop).all()),
+        })
+    return {
+        'description': (f'Per robot position, {POINTS} random positions '
+                        'over 40 x 40 m, zones of 3 to 12 vertices'),
+        'rows': rows,
+        'errors': [],
+    }
+
+
+def _polygon(rand):
+    cx, cy = rand.uniform(-18.0, 18.0), rand.uniform(-18.0, 18.0)
+    angles = sorted(rand.uniform(0.0, 2.0 * math.pi)
+                    for _ in range(rand.randint(3, 12)))
+    return [[cx + r * math.cos(a), cy + r * math.sin(a)]
+            for a in angles for r in [rand.uniform(0.5, 3.0)]]
@@ -0,0 +1,2 @@
+# Offline stand-in for the Ra-Ya SDK, see offline_runtime/README.md.
+# Only the API surface used by the examples in this repository is provided.
@@ -0,0 +1,139 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import traceback
+
+from raya.exceptions import RayaNotAvailableController
+from raya.controllers import CONTROLLERS
+from offline_runtime.runtime import get_runtime
+
+
+FINISH_TIMEOUT = 10.0
+
+
+class AppLogger:
+
+    def __init__(self, name):
+        self._logger = logging.getLogger(name)
+
+
+    def debug(self, msg, *args):
+        self._logger.debug(msg, *args)
+
+
+    def info(self, msg, *args):
+        self._logger.info(msg, *args)
+
+
+    def warning(self, msg, *args):
+        self._logger.warning(msg, *args)
+
+    warn = warning
+
+
+    def error(self, msg, *args):
+        self._logger.error(msg, *args)
+
+
+class RayaApplicationBase:
+
+    def __init__(self, app_path):
+        self.app_path = app_path
+        self.app_id = os.path.basename(os.path.normpath(app_path))
+        settings_path = os.path.join(app_path, 'exec_settings.json')
+        if os.path.isfile(settings_path):
+            with open(settings_path, 'r') as f:
+                self.app_id = json.load(f).get('app-id', self.app_id)
+        self.log = AppLogger(self.app_id)
+        self._runtime = get_runtime()
+        self._controllers = {}
+        self._finish_requested = False
+
+
+    async def setup(self):
+        pass
+
+
+    async def loop(self):
+        pass
+
+
+    async def finish(self):
+        pass
+
+
+    async def enable_controller(self, ctlr_name):
+        if ctlr_name not in CONTROLLERS:
+            raise RayaNotAvailableController(
+                f'Controller \'{ctlr_name}\' is not available offline')
+        if ctlr_name in self._controllers:
+            return self._controllers[ctlr_name]
+        t0 = time.monotonic()
+        config = self._runtime.controller_config(ctlr_name)
+        await asyncio.sleep(config.get('enable_latency', 0.0))
+        controller = CONTROLLERS[ctlr_name](self, self._runtime, config)
+        self._controllers[ctlr_name] = controller
+        self._runtime.metrics.controllers[ctlr_name] = time.monotonic() - t0
+        return controller
+
+
+    async def sleep(self, sleep_time):
+        await asyncio.sleep(sleep_time)
+
+
+    def finish_app(self):
+        self._finish_requested = True
+
+
+    ## Lifecycle
+    async def _run(self):
+        metrics = self._runtime.metrics
+        max_duration = self._runtime.max_duration
+        loop = asyncio.get_running_loop()
+        main = asyncio.ensure_future(self._main())
+        if max_duration is not None:
+            # Soft stop first, then cancel apps stuck inside an await
+            loop.call_later(max_duration, self.finish_app)
+            loop.call_later(max_duration + 2.0, main.cancel)
+        try:
+            await main
+        except asyncio.CancelledError:
+            metrics.counters['cancelled'] = 1
+        t0 = time.monotonic()
+        try:
+            await asyncio.wait_for(self.finish(), FINISH_TIMEOUT)
+        except Exception as e:
+            self._record_error('finish', e)
+        metrics.finish_time = time.monotonic() - t0
+        for controller in self._controllers.values():
+            controller._shutdown()
+
+
+    async def _main(self):
+        metrics = self._runtime.metrics
+        t0 = time.monotonic()
+        try:
+            await self.setup()
+        except Exception as e:
+            self._record_error('setup', e)
+            self._finish_requested = True
+        metrics.setup_time = time.monotonic() - t0
+        t0 = time.monotonic()
+        try:
+            while not self._finish_requested:
+                await self.loop()
+                metrics.loop_iterations += 1
+                # Give callbacks a chance to run on apps with empty loops
+                await asyncio.sleep(0)
+        except Exception as e:
+            self._record_error('loop', e)
+        finally:
+            metrics.loop_time = time.monotonic() - t0
+
+
+    def _record_error(self, stage, error):
+        self._runtime.metrics.errors.append(f'{stage}: {error!r}')
+        traceback.print_exc(file=sys.stderr)
@@ -0,0 +1,22 @@
+from raya.controllers.arms_controller import ArmsController
+from raya.controllers.cameras_controller import CamerasController
+from raya.controllers.communication_controller import CommunicationController
+from raya.controllers.cv_controller import CVController
+from raya.controllers.grasping_controller import GraspingController
+from raya.controllers.lidar_controller import LidarController
+from raya.controllers.motion_controller import MotionController
+from raya.controllers.navigation_controller import NavigationController
+from raya.controllers.sensors_controller import SensorsController
+
+
+CONTROLLERS = {
+    'arms': ArmsController,
+    'cameras': CamerasController,
+    'communication': CommunicationController,
+    'cv': CVController,
+    'grasping': GraspingController,
+    'lidar': LidarController,
+    'motion': MotionController,
+    'navigation': NavigationController,
+    'sensors': SensorsController,
+}
@@ -0,0 +1,243 @@
+import math
+import time
+import asyncio
+
+import numpy as np
+
+from raya.enumerations import ANG_UNIT
+from raya.exceptions import (RayaArmsException, RayaArmsInvalidArmName,
+                             RayaArmsInvalidPredefinedPose)
+from raya.controllers.base_controller import BaseController
+
+
+ERROR_INVALID_JOINTS = 1
+ERROR_UNREACHABLE = 2
+
+
+class ArmsController(BaseController):
+    """Arms are simulated at the end effector position level only, the
+    orientation of poses is accepted as is."""
+    _name = 'arms'
+
+    def __init__(self, app, runtime, config):
+        super().__init__(app, runtime, config)
+        self._arms = config.get('arms', {})
+        self._positions = {arm: np.zeros(len(c['joints']))
+                           for arm, c in self._arms.items()}
+        self._end_effector = {arm: np.array(c['shoulder']) + [0.0, 0.0, -0.6]
+                              for arm, c in self._arms.items()}
+        self._executions = {}
+        self._checkings = set()
+
+
+    ## Information
+    def get_list_of_arms(self):
+        return list(self._arms)
+
+
+    def get_list_predefined_poses(self, arm):
+        return list(self._arm(arm)['predefined_poses'])
+
+
+    def get_state_of_arm(self, arm):
+        config = self._arm(arm)
+        return {
+            'name': list(config['joints']),
+            'position': self._positions[arm].tolist(),
+            'velocity': [0.0] * len(config['joints']),
+        }
+
+
+    def get_limits_of_joints(self, arm, units=ANG_UNIT.DEG):
+        config = self._arm(arm)
+        limits = {}
+        for name, (lower, upper) in zip(config['joints'], config['limits']):
+            if units == ANG_UNIT.RAD:
+                lower, upper = math.radians(lower), math.radians(upper)
+            limits[name] = [lower, upper]
+        return limits
+
+
+    def is_arm_in_execution(self, arm):
+        task = self._executions.get(arm)
+        return task is not None and not task.done()
+
+
+    def are_checkings_in_progress(self):
+        return any(not task.done() for task in self._checkings)
+
+
+    ## Validation
+    async def are_joints_position_valid(self, arm, name_joints, angle_joints,
+                                        units=ANG_UNIT.DEG,
+                                        callback_finish=None, wait=False):
+        target = self._joint_target(arm, name_joints, angle_joints, units)
+        await self._check(self._joints_verdict(arm, target), callback_finish,
+                          wait)
+
+
+    async def is_pose_valid(self, arm, x, y, z, roll, pitch, yaw,
+                            units=ANG_UNIT.DEG, callback_finish=None,
+                            wait=False):
+        self._arm(arm)
+        await self._check(self._pose_verdict(arm, (x, y, z)), callback_finish,
+                          wait)
+
+
+    async def is_pose_valid_q(self, arm, x, y, z, qx, qy, qz, qw,
+                              callback_finish=None, wait=False):
+        self._arm(arm)
+        await self._check(self._pose_verdict(arm, (x, y, z)), callback_finish,
+                          wait)
+
+
+    ## Execution
+    async def set_pose(self, arm, x, y, z, roll, pitch, yaw,
+                       units=ANG_UNIT.DEG, cartesian_path=False,
+                       callback_feedback=None, callback_finish=None,
+                       wait=False):
+        await self._move_pose(arm, (x, y, z), cartesian_path,
+                              callback_feedback, callback_finish, wait)
+
+
+    async def set_pose_q(self, arm, x, y, z, qx, qy, qz, qw,
+                         cartesian_path=False, callback_feedback=None,
+                         callback_finish=None, wait=False):
+        await self._move_pose(arm, (x, y, z), cartesian_path,
+                              callback_feedback, callback_finish, wait)
+
+
+    async def set_joints_position(self, arm, name_joints, angle_joints,
+                                  units=ANG_UNIT.DEG, callback_feedback=None,
+                                  callback_finish=None, wait=False):
+        target = self._joint_target(arm, name_joints, angle_joints, units)
+        verdict = self._joints_verdict(arm, target)
+        await self._execute(arm, verdict, target, None, 1.0,
+                            callback_feedback, callback_finish, wait)
+
+
+    async def set_predefined_pose(self, arm, predefined_pose,
+                                  callback_feedback=None, callback_finish=None,
+                                  wait=False):
+        poses = self._arm(arm)['predefined_poses']
+        if predefined_pose not in poses:
+            raise RayaArmsInvalidPredefinedPose(
+                f'Predefined pose \'{predefined_pose}\' not found')
+        target = np.radians(poses[predefined_pose])
+        await self._execute(arm, (0, '', 0.0), target, None, 1.0,
+                            callback_feedback, callback_finish, wait)
+
+
+    async def set_gripper_open(self, arm, callback_finish=None, wait=False):
+        await self._gripper(arm, 'open', callback_finish, wait)
+
+
+    async def set_gripper_close(self, arm, desired_pressure=None, width=None,
+                                callback_finish=None, wait=False):
+        await self._gripper(arm, 'close', callback_finish, wait)
+
+
+    ## Helpers
+    def _arm(self, arm):
+        if arm not in self._arms:
+            raise RayaArmsInvalidArmName(f'Arm \'{arm}\' not found')
+        return self._arms[arm]
+
+
+    def _joint_target(self, arm, name_joints, angle_joints, units):
+        joints = self._arm(arm)['joints']
+        target = self._positions[arm].copy()
+        for name, value in zip(name_joints, angle_joints):
+            if name not in joints:
+                return None
+            if units == ANG_UNIT.DEG:
+                value = math.radians(value)
+            target[joints.index(name)] = value
+        return target
+
+
+    def _joints_verdict(self, arm, target):
+        if target is None:
+            return (ERROR_INVALID_JOINTS, 'Unknown joint name', '')
+        limits = np.radians(self._arm(arm)['limits'])
+        if np.any(target < limits[:, 0]) or np.any(target > limits[:, 1]):
+            return (ERROR_INVALID_JOINTS, 'Joint values out of limits', '')
+        return (0, '', float(np.linalg.norm(target - self._positions[arm])))
+
+
+    def _pose_verdict(self, arm, position):
+        position = np.asarray(position, float)
+        shoulder = np.asarray(self._arm(arm)['shoulder'])
+        if np.linalg.norm(position - shoulder) > self._config.get('reach', 0.75):
+            return (ERROR_UNREACHABLE, 'Pose out of reach', '')
+        return (0, '', float(np.linalg.norm(position - self._end_effector[arm])))
+
+
+    async def _check(self, verdict, callback_finish, wait):
+        task = self._spawn(self._run_check(verdict, callback_finish))
+        self._checkings.add(task)
+        task.add_done_callback(self._checkings.discard)
+        if wait:
+            await asyncio.shield(task)
+
+
+    async def _run_check(self, verdict, callback_finish):
+        latency = self._config.get('check_latency', 0.15)
+        due = time.monotonic() + latency
+        await asyncio.sleep(latency)
+        self._dispatch(callback_finish, *verdict, due=due)
+
+
+    async def _move_pose(self, arm, position, cartesian_path,
+                         callback_feedback, callback_finish, wait):
+        verdict = self._pose_verdict(arm, position)
+        factor = self._config.get('cartesian_factor', 1.5) if cartesian_path \
+            else 1.0
+        await self._execute(arm, verdict, None, np.asarray(position, float),
+                            factor, callback_feedback, callback_finish, wait)
+
+
+    async def _execute(self, arm, verdict, joints, position, factor,
+                       callback_feedback, callback_finish, wait):
+        await self._call()
+        if self.is_arm_in_execution(arm):
+            raise RayaArmsException(f'Arm \'{arm}\' already in execution')
+        self._executions[arm] = self._spawn(self._run_execution(
+            arm, verdict, joints, position, factor, callback_feedback,
+            callback_finish))
+        if wait:
+            await asyncio.shield(self._executions[arm])
+
+
+    async def _run_execution(self, arm, verdict, joints, position, factor,
+                             callback_feedback, callback_finish):
+        if verdict[0] != 0:
+            self._dispatch(callback_finish, verdict[0], verdict[1])
+            return
+        duration = self._config.get('move_duration', 1.5) * factor
+        steps = max(1, int(duration * self._config.get('feedback_rate', 4.0)))
+        t_end = time.monotonic() + duration
+        for step in range(1, steps + 1):
+            await asyncio.sleep(duration / steps)
+            if step < steps:
+                self._dispatch(callback_feedback, arm, 100.0 * step / steps)
+        if joints is not None:
+            self._positions[arm] = joints
+        if position is not None:
+            self._end_effector[arm] = position
+        self._dispatch(callback_finish, 0, '', due=t_end)
+
+
+    async def _gripper(self, arm, action, callback_finish, wait):
+        self._arm(arm)
+        await self._call()
+        duration = self._config.get('gripper_duration', 0.5)
+        due = time.monotonic() + duration
+
+        async def run():
+            await asyncio.sleep(duration)
+            self._dispatch(callback_finish, 0, '', arm, action, due=due)
+
+        task = self._spawn(run())
+        if wait:
+            await asyncio.shield(task)
@@ -0,0 +1,46 @@
+import time
+import asyncio
+
+
+class BaseController:
+
+    def __init__(self, app, runtime, config):
+        self._app = app
+        self._runtime = runtime
+        self._config = config
+        self._world = runtime.world
+        self._tasks = set()
+
+
+    async def _call(self, latency=None):
+        # Simulated round trip to the robot
+        if latency is None:
+            latency = self._config.get('call_latency', 0.0)
+        self._runtime.metrics.counters[f'{self._name}_calls'] += 1
+        if latency > 0.0:
+            await asyncio.sleep(latency)
+
+
+    def _spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+
+    def _dispatch(self, callback, *args, due=None):
+        self._runtime.dispatch(callback, *args, due=due)
+
+
+    async def _periodic(self, period, step):
+        # Runs `step(due)` on a fixed schedule without drifting
+        due = time.monotonic()
+        while True:
+            due += period
+            await asyncio.sleep(max(0.0, due - time.monotonic()))
+            step(due)
+
+
+    def _shutdown(self):
+        for task in list(self._tasks):
+            task.cancel()
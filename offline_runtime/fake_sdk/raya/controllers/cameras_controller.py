@@ -0,0 +1,120 @@
+import math
+import asyncio
+
+import numpy as np
+
+from raya.exceptions import RayaCameraInvalidName, RayaCameraNotEnabled
+from raya.controllers.base_controller import BaseController
+
+
+class CamerasController(BaseController):
+    _name = 'cameras'
+
+    def __init__(self, app, runtime, config):
+        super().__init__(app, runtime, config)
+        self._width = config.get('width', 640)
+        self._height = config.get('height', 480)
+        self._hfov = math.radians(config.get('hfov', 60.0))
+        self._panorama = None
+        self._enabled = {}
+        self._listeners = {}
+        self._waiters = {}
+        self._latest = {}
+
+
+    def available_color_cameras(self):
+        return list(self._config.get('names', []))
+
+
+    async def enable_color_camera(self, camera_name):
+        if camera_name not in self._config.get('names', []):
+            raise RayaCameraInvalidName(f'Camera \'{camera_name}\' not found')
+        await self._call()
+        if camera_name not in self._enabled:
+            period = 1.0 / self._config.get('fps', 15.0)
+            self._enabled[camera_name] = self._spawn(self._periodic(
+                period, lambda due: self._publish(camera_name, due)))
+
+
+    def disable_color_camera(self, camera_name):
+        task = self._enabled.pop(camera_name, None)
+        if task is not None:
+            task.cancel()
+        self._listeners.pop(camera_name, None)
+        self._latest.pop(camera_name, None)
+
+
+    def create_color_frame_listener(self, camera_name, callback):
+        if camera_name not in self._enabled:
+            raise RayaCameraNotEnabled(f'Camera \'{camera_name}\' not enabled')
+        self._listeners[camera_name] = callback
+
+
+    def delete_color_frame_listener(self, camera_name):
+        self._listeners.pop(camera_name, None)
+
+
+    async def get_next_frame(self, camera_name):
+        if camera_name not in self._enabled:
+            raise RayaCameraNotEnabled(f'Camera \'{camera_name}\' not enabled')
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(camera_name, []).append(waiter)
+        return await waiter
+
+
+    def is_enabled(self, camera_name):
+        return camera_name in self._enabled
+
+
+    def latest_frame(self, camera_name):
+        return self._latest.get(camera_name)
+
+
+    def _publish(self, camera_name, due):
+        frame = self._render()
+        self._latest[camera_name] = (due, frame)
+        self._runtime.metrics.counters['camera_frames'] += 1
+        for waiter in self._waiters.pop(camera_name, []):
+            if not waiter.done():
+                waiter.set_result(frame)
+        callback = self._listeners.get(camera_name)
+        if callback is not None:
+            self._dispatch(callback, frame, due=due)
+
+
+    def _render(self):
+        # The image is a window over a 360 degrees panorama that depends on
+        # the robot heading, with a box drawn for every visible object.
+        if self._panorama is None:
+            self._panorama = self._build_panorama()
+        _, _, yaw = self._world.pose()
+        cols_per_rad = self._width / self._hfov
+        offset = int((-yaw % (2.0 * math.pi)) * cols_per_rad)
+        offset %= self._panorama.shape[1] - self._width
+        frame = self._panorama[:, offset:offset + self._width].copy()
+        for obj, distance, bearing in self._world.visible_objects(
+                self._hfov, self._runtime.controller_config('cv').get(
+                    'max_range', 4.0)):
+            x_min, y_min, x_max, y_max = self.project(distance, bearing)
+            frame[y_min:y_max, x_min:x_max] = (40, 40, 200)
+        return frame
+
+
+    def project(self, distance, bearing):
+        cx = int(self._width / 2.0 - bearing / (self._hfov / 2.0)
+                 * self._width / 2.0)
+        half = int(40.0 / max(distance, 0.3))
+        cy = self._height // 2 + 40
+        return (max(cx - half, 0), max(cy - half, 0),
+                min(cx + half, self._width - 1),
+                min(cy + half, self._height - 1))
+
+
+    def _build_panorama(self):
+        width = int(round(2.0 * math.pi * self._width / self._hfov))
+        cols = np.arange(width + self._width) % width
+        row = np.stack([cols * 255 // width,
+                        (cols * 7) % 256,
+                        255 - cols * 255 // width], axis=1).astype(np.uint8)
+        shade = np.linspace(0.6, 1.0, self._height)[:, None, None]
+        return (row[None, :, :] * shade).astype(np.uint8)
@@ -0,0 +1,30 @@
+from raya.controllers.base_controller import BaseController
+
+
+class CommunicationController(BaseController):
+    _name = 'communication'
+
+    def __init__(self, app, runtime, config):
+        super().__init__(app, runtime, config)
+        self._callback = None
+        self.sent_messages = []
+
+
+    def create_incoming_msg_listener(self, callback):
+        first_listener = self._callback is None
+        self._callback = callback
+        if first_listener:
+            # Messages are forwarded to whichever listener is current
+            for incoming in self._config.get('incoming', []):
+                self._runtime.dispatch_later(incoming['delay'], self._incoming,
+                                             incoming['msg'])
+
+
+    async def send_msg(self, msg):
+        await self._call()
+        self.sent_messages.append(msg)
+
+
+    def _incoming(self, msg):
+        if self._callback is not None:
+            self._callback(msg)
@@ -0,0 +1,136 @@
+import math
+import asyncio
+
+from raya.exceptions import (RayaCVAlreadyEnabledType, RayaCVNotActiveType,
+                             RayaCVInvalidModel)
+from raya.controllers.base_controller import BaseController
+
+
+class DetectionObjectsHandler:
+
+    def __init__(self, controller, name, source, model_params):
+        self._controller = controller
+        self._runtime = controller._runtime
+        self.name = name
+        self.source = source
+        self.model_params = model_params
+        self._detections = []
+        self._find_objects = None
+        self._detections_callback = None
+        self._waiters = []
+        period = 1.0 / controller._config.get('inference_rate', 8.0)
+        self._task = controller._spawn(controller._periodic(period, self._infer))
+
+
+    def get_objects_names(self):
+        return list(self._controller._config.get('labels', []))
+
+
+    def get_current_detections(self):
+        return self._detections
+
+
+    async def find_objects(self, objects, callback=None, wait=False,
+                           timeout=0.0):
+        if not wait:
+            self._find_objects = (list(objects), callback)
+            return None
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (list(objects), waiter)
+        self._waiters.append(entry)
+        try:
+            return await asyncio.wait_for(waiter, timeout or None)
+        except asyncio.TimeoutError:
+            return []
+        finally:
+            if entry in self._waiters:
+                self._waiters.remove(entry)
+
+
+    def cancel_find_objects(self):
+        self._find_objects = None
+
+
+    def set_detections_callback(self, callback, as_dict=False,
+                                call_without_detections=False):
+        # Called after every inference
+        self._detections_callback = (
+            None if callback is None else (callback, call_without_detections))
+
+
+    def _stop(self):
+        self._task.cancel()
+        for _, waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result([])
+
+
+    def _infer(self, due):
+        cameras = self._controller._app._controllers.get('cameras')
+        if cameras is None or not cameras.is_enabled(self.source):
+            return
+        self._runtime.metrics.counters['cv_inferences'] += 1
+        config = self._controller._config
+        hfov = math.radians(self._runtime.controller_config('cameras').get(
+            'hfov', 60.0))
+        detections = []
+        for obj, distance, bearing in self._controller._world.visible_objects(
+                hfov, config.get('max_range', 4.0)):
+            x_min, y_min, x_max, y_max = cameras.project(distance, bearing)
+            detections.append({
+                'object_name': obj['name'],
+                'confidence': 0.9,
+                'x_min': x_min, 'y_min': y_min,
+                'x_max': x_max, 'y_max': y_max,
+                'center_point': [(x_min + x_max) // 2, (y_min + y_max) // 2],
+                'distance': distance,
+                'center_point_map': [obj['x'], obj['y'], obj['z']],
+            })
+        self._detections = detections
+        for objects, waiter in list(self._waiters):
+            found = [d for d in detections if d['object_name'] in objects]
+            if found and not waiter.done():
+                waiter.set_result(found)
+        if self._detections_callback is not None:
+            callback, call_without_detections = self._detections_callback
+            if detections or call_without_detections:
+                self._controller._dispatch(callback, list(detections),
+                                           due=due)
+        if self._find_objects is not None:
+            objects, callback = self._find_objects
+            found = [d for d in detections if d['object_name'] in objects]
+            if found:
+                self._controller._dispatch(callback, found[0], due=due)
+
+
+class CVController(BaseController):
+    _name = 'cv'
+
+    def __init__(self, app, runtime, config):
+        super().__init__(app, runtime, config)
+        self._handlers = {}
+
+
+    def get_available_models(self):
+        return self._config.get('models', {})
+
+
+    async def enable_model(self, model, type, name, source, model_params={}):
+        if (model, type) in self._handlers:
+            raise RayaCVAlreadyEnabledType(
+                f'A model of type \'{model}/{type}\' is already enabled')
+        if name not in self._config.get('models', {}).get(model, {}).get(
+                type, []):
+            raise RayaCVInvalidModel(f'Model \'{name}\' not available')
+        await self._call(self._config.get('model_load_time', 0.0))
+        handler = DetectionObjectsHandler(self, name, source, model_params)
+        self._handlers[(model, type)] = handler
+        return handler
+
+
+    async def disable_model(self, model, type):
+        handler = self._handlers.pop((model, type), None)
+        if handler is None:
+            raise RayaCVNotActiveType(f'No model of type \'{model}/{type}\'')
+        handler._stop()
+        await self._call()
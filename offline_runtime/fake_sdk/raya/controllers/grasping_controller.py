@@ -0,0 +1,122 @@
+import time
+import asyncio
+
+from raya.exceptions import RayaGraspingException, RayaGraspingNotGrasping
+from raya.controllers.base_controller import BaseController
+
+
+PICK_STATES = ['detecting', 'planning', 'approaching', 'grasping', 'lifting']
+PLACE_STATES = ['planning', 'approaching', 'releasing', 'retreating']
+ERROR_OBJECT_NOT_FOUND = 1
+ERROR_GRASP_FAILED = 2
+ERROR_ARM_EMPTY = 3
+
+
+class GraspingController(BaseController):
+    _name = 'grasping'
+
+    def __init__(self, app, runtime, config):
+        super().__init__(app, runtime, config)
+        self._grasping = None
+        self._held = {}
+
+
+    async def pick_object(self, detector_model, source, object_name, arms=[],
+                          callback_feedback=None, callback_finish=None,
+                          wait=False):
+        await self._call()
+        arms = [a for a in (arms or ['right_arm', 'left_arm'])
+                if a not in self._held]
+        await self._start(self._pick(object_name, arms), PICK_STATES,
+                          self._config.get('pick_duration', 3.0),
+                          callback_feedback, callback_finish, wait)
+
+
+    async def place_object_with_point(self, point_to_place, height_object, arm,
+                                      callback_feedback=None,
+                                      callback_finish=None, wait=False):
+        await self._call()
+        await self._start(self._place(arm, point_to_place), PLACE_STATES,
+                          self._config.get('place_duration', 2.5),
+                          callback_feedback, callback_finish, wait)
+
+
+    async def place_object_with_reference(self, detector_model, source,
+                                          object_name, height_object, distance,
+                                          arm, callback_feedback=None,
+                                          callback_finish=None, wait=False):
+        await self._call()
+        reference = self._world.object_near(
+            object_name, self._config.get('pick_range', 1.2))
+        point = None
+        if reference is not None:
+            obj = reference[0]
+            point = [obj['x'], obj['y'] + distance, obj['z']]
+        await self._start(self._place(arm, point), PLACE_STATES,
+                          self._config.get('place_duration', 2.5),
+                          callback_feedback, callback_finish, wait)
+
+
+    def is_grasping(self):
+        return self._grasping is not None and not self._grasping.done()
+
+
+    async def cancel_grasping(self):
+        if not self.is_grasping():
+            raise RayaGraspingNotGrasping('No grasping in execution')
+        self._grasping.cancel()
+        await self._call()
+
+
+    async def _start(self, outcome, states, duration, callback_feedback,
+                     callback_finish, wait):
+        if self.is_grasping():
+            outcome.close()
+            raise RayaGraspingException('A grasping action is in execution')
+        self._grasping = self._spawn(self._run(outcome, states, duration,
+                                               callback_feedback,
+                                               callback_finish))
+        if wait:
+            result = await asyncio.shield(self._grasping)
+            if result[0] != 0:
+                raise RayaGraspingException(result[1])
+
+
+    async def _run(self, outcome, states, duration, callback_feedback,
+                   callback_finish):
+        t_end = time.monotonic() + duration
+        for state in states:
+            self._dispatch(callback_feedback, state)
+            await asyncio.sleep(duration / len(states))
+        result = await outcome
+        self._dispatch(callback_finish, *result, due=t_end)
+        return result
+
+
+    async def _pick(self, object_name, arms):
+        failed = {'arm_pick': '', 'height_object': 0.0}
+        if not arms:
+            return (ERROR_GRASP_FAILED, 'No arm available', failed)
+        found = self._world.object_near(object_name,
+                                        self._config.get('pick_range', 1.2))
+        if found is None:
+            return (ERROR_OBJECT_NOT_FOUND,
+                    f'Object \'{object_name}\' not found', failed)
+        if self._runtime.random.random() > self._config.get('success_rate', 1.0):
+            return (ERROR_GRASP_FAILED, 'Grasp failed', failed)
+        obj = found[0]
+        self._world.objects.remove(obj)
+        self._held[arms[0]] = obj
+        return (0, '', {'arm_pick': arms[0], 'height_object': obj['height']})
+
+
+    async def _place(self, arm, point):
+        obj = self._held.get(arm)
+        if obj is None:
+            return (ERROR_ARM_EMPTY, f'Arm \'{arm}\' is not holding an object')
+        if point is None:
+            return (ERROR_OBJECT_NOT_FOUND, 'Reference object not found')
+        del self._held[arm]
+        self._world.objects.append(dict(obj, x=point[0], y=point[1],
+                                        z=point[2]))
+        return (0, '')
@@ -0,0 +1,101 @@
+import math
+import time
+
+import numpy as np
+
+from raya.enumerations import ANG_UNIT
+from raya.exceptions import RayaListenerAlreadyCreated, RayaListenerUnknown
+from raya.controllers.base_controller import BaseController
+
+
+class LidarController(BaseController):
+    _name = 'lidar'
+
+    def __init__(self, app, runtime, config):
+        super().__init__(app, runtime, config)
+        self._angles = np.linspace(config.get('angle_min', -math.pi),
+                                   config.get('angle_max', math.pi),
+                                   config.get('num_points', 720))
+        self._period = 1.0 / config.get('scan_rate', 10.0)
+        self._t0 = time.monotonic()
+        self._scan_index = -1
+        self._scan = None
+        self._listeners = {}
+        self._listeners_task = None
+
+
+    def get_laser_info(self, ang_unit=ANG_UNIT.DEG):
+        info = {
+            'angle_min': float(self._angles[0]),
+            'angle_max': float(self._angles[-1]),
+            'angle_increment': float(self._angles[1] - self._angles[0]),
+            'range_min': self._config.get('range_min', 0.05),
+            'range_max': self._config.get('range_max', 10.0),
+            'scan_time': self._period,
+        }
+        if ang_unit == ANG_UNIT.DEG:
+            for key in ('angle_min', 'angle_max', 'angle_increment'):
+                info[key] = math.degrees(info[key])
+        return info
+
+
+    def get_raw_data(self):
+        return self._latest_scan().tolist()
+
+
+    def check_obstacle(self, lower_angle, upper_angle, upper_distance,
+                       ang_unit=ANG_UNIT.DEG):
+        mask = self._sector_mask(lower_angle, upper_angle, ang_unit)
+        return bool(np.any(self._latest_scan()[mask] <= upper_distance))
+
+
+    def create_obstacle_listener(self, listener_name, callback, lower_angle,
+                                 upper_angle, upper_distance,
+                                 ang_unit=ANG_UNIT.DEG):
+        if listener_name in self._listeners:
+            raise RayaListenerAlreadyCreated(
+                f'Listener \'{listener_name}\' already exist')
+        mask = self._sector_mask(lower_angle, upper_angle, ang_unit)
+        self._listeners[listener_name] = (callback, mask, upper_distance)
+        if self._listeners_task is None:
+            self._listeners_task = self._spawn(
+                self._periodic(self._period, self._check_listeners))
+
+
+    def delete_listener(self, listener_name):
+        if listener_name not in self._listeners:
+            raise RayaListenerUnknown(f'Listener \'{listener_name}\' unknown')
+        del self._listeners[listener_name]
+
+
+    def _check_listeners(self, due):
+        scan = self._latest_scan()
+        for callback, mask, upper_distance in list(self._listeners.values()):
+            if np.any(scan[mask] <= upper_distance):
+                self._dispatch(callback, due=due)
+
+
+    def _latest_scan(self):
+        # A new scan is published every scan period, like the real topic
+        index = int((time.monotonic() - self._t0) / self._period)
+        if index != self._scan_index:
+            self._scan_index = index
+            self._scan = self._world.lidar_ranges(
+                self._angles, self._config.get('range_max', 10.0),
+                self._config.get('noise', 0.0))
+            self._runtime.metrics.counters['lidar_scans'] += 1
+        return self._scan
+
+
+    def _sector_mask(self, lower_angle, upper_angle, ang_unit):
+        if ang_unit == ANG_UNIT.DEG:
+            lower_angle = math.radians(lower_angle)
+            upper_angle = math.radians(upper_angle)
+        if upper_angle - lower_angle >= 2.0 * math.pi:
+            return np.ones(self._angles.shape, bool)
+        angles = np.mod(self._angles, 2.0 * math.pi)
+        lower = lower_angle % (2.0 * math.pi)
+        upper = upper_angle % (2.0 * math.pi)
+        if lower <= upper:
+            return (angles >= lower) & (angles <= upper)
+        return (angles >= lower) | (angles <= upper)
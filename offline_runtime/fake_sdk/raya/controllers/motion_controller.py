@@ -0,0 +1,78 @@
+import math
+import time
+import asyncio
+
+from raya.enumerations import ANG_UNIT
+from raya.exceptions import RayaMotionNotMoving
+from raya.controllers.base_controller import BaseController
+
+
+class MotionController(BaseController):
+    _name = 'motion'
+
+    def __init__(self, app, runtime, config):
+        super().__init__(app, runtime, config)
+        self._motion = None
+
+
+    async def set_velocity(self, x_velocity, y_velocity, angular_velocity,
+                           duration, ang_unit=ANG_UNIT.DEG, callback=None,
+                           wait=False):
+        if ang_unit == ANG_UNIT.DEG:
+            angular_velocity = math.radians(angular_velocity)
+        await self._start(x_velocity, y_velocity, angular_velocity, duration,
+                          callback, wait)
+
+
+    async def move_linear(self, distance, x_velocity, callback=None,
+                          wait=False):
+        speed = math.copysign(abs(x_velocity), distance)
+        duration = abs(distance / x_velocity) if x_velocity else 0.0
+        await self._start(speed, 0.0, 0.0, duration, callback, wait)
+
+
+    async def rotate(self, angle, angular_velocity, ang_unit=ANG_UNIT.DEG,
+                     callback=None, wait=False):
+        if ang_unit == ANG_UNIT.DEG:
+            angle = math.radians(angle)
+            angular_velocity = math.radians(angular_velocity)
+        speed = math.copysign(abs(angular_velocity), angle)
+        duration = abs(angle / angular_velocity) if angular_velocity else 0.0
+        await self._start(0.0, 0.0, speed, duration, callback, wait)
+
+
+    def is_moving(self):
+        return self._motion is not None and not self._motion.done()
+
+
+    async def cancel_motion(self):
+        if not self.is_moving():
+            raise RayaMotionNotMoving('The robot is not moving')
+        self._motion.cancel()
+        self._world.stop()
+        await self._call()
+
+
+    async def await_until_stop(self):
+        while self.is_moving():
+            try:
+                await asyncio.shield(self._motion)
+            except asyncio.CancelledError:
+                if not self._motion.cancelled():
+                    raise
+
+
+    async def _start(self, vx, vy, w, duration, callback, wait):
+        await self._call()
+        if self.is_moving():
+            self._motion.cancel()
+        self._world.set_velocity(vx, vy, w, duration)
+        self._motion = self._spawn(self._run(duration, callback))
+        if wait:
+            await self.await_until_stop()
+
+
+    async def _run(self, duration, callback):
+        due = time.monotonic() + duration
+        await asyncio.sleep(duration)
+        self._dispatch(callback, due=due)
@@ -0,0 +1,356 @@
+import math
+import time
+import asyncio
+
+from raya.enumerations import ANG_UNIT, POS_UNIT
+from raya.exceptions import (RayaNavNotNavigating, RayaNavInvalidGoal,
+                             RayaNavZonesNotFound, RayaNavZoneAlreadyExist)
+from raya.controllers.base_controller import BaseController
+from offline_runtime.world import wrap_angle
+
+
+NAV_STATE_NAVIGATING = 1
+NAV_ERROR_CANCELED = 6
+
+
+def point_in_polygon(x, y, polygon):
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        xi, yi = polygon[i]
+        xj, yj = polygon[j]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+class NavigationController(BaseController):
+    _name = 'navigation'
+
+    def __init__(self, app, runtime, config):
+        super().__init__(app, runtime, config)
+        self._navigation = None
+        self._localized = False
+        self._sorted_points = []
+
+
+    ## Maps
+    async def get_list_of_maps(self):
+        await self._call()
+        return list(self._world.maps)
+
+
+    async def set_map(self, map_name, wait_localization=False, timeout=0.0):
+        await self._call()
+        if map_name not in self._world.maps:
+            return False
+        self._world.current_map = map_name
+        if wait_localization:
+            await asyncio.sleep(self._config.get('localization_time', 0.0))
+        self._localized = True
+        return True
+
+
+    async def is_localized(self):
+        await self._call()
+        return self._localized
+
+
+    async def get_status(self):
+        await self._call()
+        return {
+            'localized': self._localized,
+            'map_name': self._world.current_map,
+            'navigating': self.is_navigating(),
+        }
+
+
+    async def get_map(self, map_name):
+        image = self._world.map_image(map_name)
+        rate = self._config.get('map_transfer_rate', 0.0)
+        transfer = image.nbytes / (rate * 1e6) if rate else 0.0
+        await self._call(self._config.get('call_latency', 0.0) + transfer)
+        info = self._world.maps[map_name]
+        map_info = {
+            'resolution': info['resolution'],
+            'origin': list(info['origin']),
+            'width': info['width'],
+            'height': info['height'],
+        }
+        return image.copy(), map_info
+
+
+    ## Position
+    async def get_position(self, pos_unit=POS_UNIT.METERS,
+                           ang_unit=ANG_UNIT.DEG):
+        await self._call()
+        x, y, yaw = self._world.pose()
+        x, y = self._from_meters(x, y, pos_unit)
+        if ang_unit == ANG_UNIT.DEG:
+            yaw = math.degrees(yaw)
+        return {'x': x, 'y': y, 'angle': yaw}
+
+
+    ## Zones and locations
+    async def get_zones(self, map_name):
+        await self._call()
+        return {k: [list(p) for p in v]
+                for k, v in self._world.maps[map_name]['zones'].items()}
+
+
+    async def get_zones_list(self, map_name):
+        await self._call()
+        return list(self._world.maps[map_name]['zones'])
+
+
+    async def get_locations(self, map_name):
+        await self._call()
+        return {k: dict(v)
+                for k, v in self._world.maps[map_name]['locations'].items()}
+
+
+    async def get_locations_list(self, map_name):
+        await self._call()
+        return list(self._world.maps[map_name]['locations'])
+
+
+    async def get_location(self, location_name, pos_unit=POS_UNIT.METERS,
+                           ang_unit=ANG_UNIT.DEG):
+        await self._call()
+        location = self._get_location(location_name)
+        x, y = self._from_meters(location['x'], location['y'], pos_unit)
+        angle = location['angle']
+        if ang_unit == ANG_UNIT.RAD:
+            angle = math.radians(angle)
+        return {'x': x, 'y': y, 'angle': angle}
+
+
+    async def get_zone_center(self, zone_name, pos_unit=POS_UNIT.METERS):
+        await self._call()
+        x, y = self._zone_center(zone_name)
+        return list(self._from_meters(x, y, pos_unit))
+
+
+    async def is_in_zone(self, zone_name):
+        await self._call()
+        x, y, _ = self._world.pose()
+        return point_in_polygon(x, y, self._get_zone(zone_name))
+
+
+    async def order_zone_points(self, zone_name, from_robot_position=True):
+        await self._call()
+        polygon = self._get_zone(zone_name)
+        xs = [p[0] for p in polygon]
+        ys = [p[1] for p in polygon]
+        points = []
+        step = 0.5
+        x = min(xs) + step / 2.0
+        while x < max(xs):
+            y = min(ys) + step / 2.0
+            while y < max(ys):
+                if point_in_polygon(x, y, polygon):
+                    points.append((x, y))
+                y += step
+            x += step
+        if from_robot_position:
+            rx, ry, _ = self._world.pose()
+            points.sort(key=lambda p: math.hypot(p[0] - rx, p[1] - ry))
+        self._sorted_points = points
+        return [list(p) for p in points]
+
+
+    async def get_sorted_zone_point(self, pos_unit=POS_UNIT.METERS):
+        await self._call()
+        if not self._sorted_points:
+            raise RayaNavZonesNotFound('No sorted points, call order_zone_points')
+        x, y = self._sorted_points.pop(0)
+        x, y = self._from_meters(x, y, pos_unit)
+        return {'x': x, 'y': y}
+
+
+    async def save_zone(self, zone_name, points, pos_unit=POS_UNIT.METERS):
+        await self._call()
+        zones = self._world.map_config()['zones']
+        if zone_name in zones:
+            raise RayaNavZoneAlreadyExist(f'Zone \'{zone_name}\' already exist')
+        zones[zone_name] = [list(self._to_meters(p[0], p[1], pos_unit))
+                            for p in points]
+        return True
+
+
+    async def save_location(self, location_name, x, y, angle,
+                            pos_unit=POS_UNIT.METERS, ang_unit=ANG_UNIT.DEG):
+        await self._call()
+        x, y = self._to_meters(x, y, pos_unit)
+        if ang_unit == ANG_UNIT.RAD:
+            angle = math.degrees(angle)
+        self._world.map_config()['locations'][location_name] = {
+            'x': x, 'y': y, 'angle': angle}
+        return True
+
+
+    async def delete_zone(self, map_name, location_name):
+        await self._call()
+        zones = self._world.maps[map_name]['zones']
+        if location_name not in zones:
+            raise RayaNavZonesNotFound(f'Zone \'{location_name}\' not found')
+        del zones[location_name]
+        return True
+
+
+    async def delete_location(self, map_name, location_name):
+        await self._call()
+        locations = self._world.maps[map_name]['locations']
+        if location_name not in locations:
+            raise RayaNavZonesNotFound(
+                f'Location \'{location_name}\' not found')
+        del locations[location_name]
+        return True
+
+
+    ## Navigation
+    async def navigate_to_position(self, x, y, angle, pos_unit=POS_UNIT.METERS,
+                                   ang_unit=ANG_UNIT.DEG,
+                                   callback_feedback=None,
+                                   callback_finish=None, wait=False):
+        await self._call()
+        x, y = self._to_meters(x, y, pos_unit)
+        if ang_unit == ANG_UNIT.DEG:
+            angle = math.radians(angle)
+        await self._navigate((x, y, angle), callback_feedback, callback_finish,
+                             wait)
+
+
+    async def navigate_close_to_position(self, x, y, pos_unit=POS_UNIT.METERS,
+                                         callback_feedback=None,
+                                         callback_finish=None, wait=False):
+        await self._call()
+        x, y = self._to_meters(x, y, pos_unit)
+        rx, ry, _ = self._world.pose()
+        heading = math.atan2(y - ry, x - rx)
+        distance = self._config.get('close_distance', 0.6)
+        goal = (x - distance * math.cos(heading),
+                y - distance * math.sin(heading), heading)
+        await self._navigate(goal, callback_feedback, callback_finish, wait)
+
+
+    async def navigate_to_location(self, zone_name, callback_feedback=None,
+                                   callback_finish=None, wait=False):
+        await self._call()
+        location = self._get_location(zone_name)
+        goal = (location['x'], location['y'], math.radians(location['angle']))
+        await self._navigate(goal, callback_feedback, callback_finish, wait)
+
+
+    async def navigate_to_zone(self, zone_name, to_center=True,
+                               callback_feedback=None, callback_finish=None,
+                               wait=False):
+        await self._call()
+        x, y = self._zone_center(zone_name)
+        if not to_center:
+            rx, ry, _ = self._world.pose()
+            polygon = self._get_zone(zone_name)
+            # Stop halfway between the closest vertex and the center
+            vx, vy = min(polygon, key=lambda p: math.hypot(p[0] - rx, p[1] - ry))
+            x, y = (x + vx) / 2.0, (y + vy) / 2.0
+        rx, ry, _ = self._world.pose()
+        goal = (x, y, math.atan2(y - ry, x - rx))
+        await self._navigate(goal, callback_feedback, callback_finish, wait)
+
+
+    def is_navigating(self):
+        return self._navigation is not None and not self._navigation.done()
+
+
+    async def cancel_navigation(self):
+        if not self.is_navigating():
+            raise RayaNavNotNavigating('The robot is not navigating')
+        self._navigation.cancel()
+        await self._call()
+
+
+    async def wait_navigation_finished(self):
+        while self.is_navigating():
+            try:
+                await asyncio.shield(self._navigation)
+            except asyncio.CancelledError:
+                if not self._navigation.cancelled():
+                    raise
+
+
+    async def _navigate(self, goal, callback_feedback, callback_finish, wait):
+        if not self._localized:
+            raise RayaNavInvalidGoal('The robot is not localized')
+        xmin, ymin, xmax, ymax = self._world.walls
+        if not (xmin < goal[0] < xmax and ymin < goal[1] < ymax):
+            raise RayaNavInvalidGoal(f'Goal {goal[:2]} is out of the map')
+        if self.is_navigating():
+            self._navigation.cancel()
+        self._navigation = self._spawn(
+            self._run(goal, callback_feedback, callback_finish))
+        if wait:
+            await self.wait_navigation_finished()
+
+
+    async def _run(self, goal, callback_feedback, callback_finish):
+        x, y, yaw = self._world.pose()
+        distance = math.hypot(goal[0] - x, goal[1] - y)
+        linear_speed = self._config.get('linear_speed', 0.5)
+        angular_speed = math.radians(self._config.get('angular_speed', 60.0))
+        duration = (distance / linear_speed
+                    + abs(wrap_angle(goal[2] - yaw)) / angular_speed)
+        self._world.follow_path(goal, duration)
+        t_end = time.monotonic() + duration
+        period = 1.0 / self._config.get('feedback_rate', 2.0)
+        try:
+            while True:
+                remaining = t_end - time.monotonic()
+                if remaining <= 0.0:
+                    break
+                await asyncio.sleep(min(period, remaining))
+                if time.monotonic() < t_end:
+                    px, py, _ = self._world.pose()
+                    self._dispatch(callback_feedback, NAV_STATE_NAVIGATING,
+                                   math.hypot(goal[0] - px, goal[1] - py),
+                                   linear_speed)
+        except asyncio.CancelledError:
+            self._world.stop()
+            self._dispatch(callback_finish, NAV_ERROR_CANCELED,
+                           'Navigation canceled')
+            raise
+        self._dispatch(callback_finish, 0, '', due=t_end)
+
+
+    ## Helpers
+    def _get_zone(self, zone_name):
+        zones = self._world.map_config()['zones']
+        if zone_name not in zones:
+            raise RayaNavZonesNotFound(f'Zone \'{zone_name}\' not found')
+        return zones[zone_name]
+
+
+    def _get_location(self, location_name):
+        locations = self._world.map_config()['locations']
+        if location_name not in locations:
+            raise RayaNavZonesNotFound(
+                f'Location \'{location_name}\' not found')
+        return locations[location_name]
+
+
+    def _zone_center(self, zone_name):
+        polygon = self._get_zone(zone_name)
+        return (sum(p[0] for p in polygon) / len(polygon),
+                sum(p[1] for p in polygon) / len(polygon))
+
+
+    def _to_meters(self, x, y, pos_unit):
+        if pos_unit == POS_UNIT.PIXEL:
+            return self._world.pixel_to_meters(x, y)
+        return x, y
+
+
+    def _from_meters(self, x, y, pos_unit):
+        if pos_unit == POS_UNIT.PIXEL:
+            return self._world.meters_to_pixel(x, y)
+        return x, y
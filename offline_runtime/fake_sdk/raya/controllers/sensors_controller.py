@@ -0,0 +1,65 @@
+import math
+import time
+
+from raya.exceptions import RayaListenerAlreadyCreated, RayaListenerUnknown
+from raya.controllers.base_controller import BaseController
+
+
+SENSORS_PERIOD = 20.0
+
+
+class SensorsController(BaseController):
+    _name = 'sensors'
+
+    def __init__(self, app, runtime, config):
+        super().__init__(app, runtime, config)
+        self._t0 = time.monotonic()
+        self._listeners = {}
+        self._listeners_task = None
+
+
+    def get_all_sensors_values(self):
+        return self._values(time.monotonic())
+
+
+    def get_sensor_value(self, sensor_path):
+        return self._values(time.monotonic())[sensor_path]
+
+
+    def create_threshold_listener(self, listener_name, callback, sensors_paths,
+                                  lower_bound=None, upper_bound=None):
+        if listener_name in self._listeners:
+            raise RayaListenerAlreadyCreated(
+                f'Listener \'{listener_name}\' already exist')
+        self._listeners[listener_name] = (callback, list(sensors_paths),
+                                          lower_bound, upper_bound)
+        if self._listeners_task is None:
+            period = 1.0 / self._config.get('rate', 10.0)
+            self._listeners_task = self._spawn(
+                self._periodic(period, self._check_listeners))
+
+
+    def delete_listener(self, listener_name):
+        if listener_name not in self._listeners:
+            raise RayaListenerUnknown(f'Listener \'{listener_name}\' unknown')
+        del self._listeners[listener_name]
+
+
+    def _values(self, now):
+        # Every sensor oscillates around its mean, see profile 'sensors'
+        phase = 2.0 * math.pi * (now - self._t0) / SENSORS_PERIOD
+        return {path: mean + amplitude * math.sin(phase)
+                for path, (mean, amplitude) in self._world.sensors.items()}
+
+
+    def _check_listeners(self, due):
+        values = self._values(due)
+        for callback, paths, lower, upper in list(self._listeners.values()):
+            for path in paths:
+                value = values.get(path)
+                if value is None:
+                    continue
+                if (lower is None or value >= lower) and \
+                        (upper is None or value <= upper):
+                    self._dispatch(callback, due=due)
+                    break
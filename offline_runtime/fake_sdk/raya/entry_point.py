@@ -0,0 +1,7 @@
+import asyncio
+
+
+def entry_point(app_path, app_class):
+    app = app_class(app_path)
+    asyncio.run(app._run())
+    return app
@@ -0,0 +1,22 @@
+from enum import Enum
+
+
+class ANG_UNIT(Enum):
+    DEG = 0
+    RAD = 1
+
+
+class POS_UNIT(Enum):
+    METERS = 0
+    PIXEL = 1
+
+
+class MODAL_TYPE(Enum):
+    INFO = 0
+    SUCCESS = 1
+    ERROR = 2
+
+
+class THEME_TYPE(Enum):
+    LIGHT = 0
+    DARK = 1
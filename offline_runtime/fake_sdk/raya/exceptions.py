@@ -0,0 +1,101 @@
+class RayaException(Exception):
+    pass
+
+
+## Application
+class RayaApplicationException(RayaException):
+    pass
+
+class RayaNotAvailableController(RayaApplicationException):
+    pass
+
+
+## Navigation
+class RayaNavException(RayaException):
+    pass
+
+class RayaNavNotNavigating(RayaNavException):
+    pass
+
+class RayaNavInvalidGoal(RayaNavException):
+    pass
+
+class RayaNavUnknownMap(RayaNavException):
+    pass
+
+class RayaNavZonesNotFound(RayaNavException):
+    pass
+
+class RayaNavZoneAlreadyExist(RayaNavException):
+    pass
+
+
+## Motion
+class RayaMotionException(RayaException):
+    pass
+
+class RayaMotionNotMoving(RayaMotionException):
+    pass
+
+
+## Cameras
+class RayaCameraException(RayaException):
+    pass
+
+class RayaCameraInvalidName(RayaCameraException):
+    pass
+
+class RayaCameraNotEnabled(RayaCameraException):
+    pass
+
+
+## Computer vision
+class RayaCVException(RayaException):
+    pass
+
+class RayaCVAlreadyEnabledType(RayaCVException):
+    pass
+
+class RayaCVNotActiveType(RayaCVException):
+    pass
+
+class RayaCVInvalidModel(RayaCVException):
+    pass
+
+
+## Grasping
+class RayaGraspingException(RayaException):
+    pass
+
+class RayaGraspingNotGrasping(RayaGraspingException):
+    pass
+
+
+## Arms
+class RayaArmsException(RayaException):
+    pass
+
+class RayaArmsInvalidArmName(RayaArmsException):
+    pass
+
+class RayaArmsInvalidPredefinedPose(RayaArmsException):
+    pass
+
+
+## Communication
+class RayaCommException(RayaException):
+    pass
+
+class RayaCommNotRunningApp(RayaCommException):
+    pass
+
+
+## Sensors / Lidar
+class RayaListenerException(RayaException):
+    pass
+
+class RayaListenerAlreadyCreated(RayaListenerException):
+    pass
+
+class RayaListenerUnknown(RayaListenerException):
+    pass
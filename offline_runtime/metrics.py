@@ -0,0 +1,67 @@
+import math
+import resource
+from collections import Counter
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    idx = max(0, math.ceil(q / 100.0 * len(sorted_values)) - 1)
+    return sorted_values[idx]
+
+
+class LatencyStats:
+    """Collects latency samples (seconds) and reports percentiles in ms."""
+
+    def __init__(self):
+        self.samples = []
+
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+
+
+    def summary(self, quantiles=(50, 90, 99)):
+        values = sorted(self.samples)
+        summary = {'count': len(values)}
+        for q in quantiles:
+            value = percentile(values, q)
+            summary[f'p{q}_ms'] = None if value is None else value * 1000.0
+        summary['max_ms'] = values[-1] * 1000.0 if values else None
+        return summary
+
+
+class Metrics:
+
+    def __init__(self):
+        self.setup_time = None
+        self.loop_time = 0.0
+        self.loop_iterations = 0
+        self.finish_time = None
+        self.controllers = {}
+        self.callbacks = LatencyStats()
+        self.counters = Counter()
+        self.errors = []
+
+
+    def report(self):
+        loop_rate = None
+        if self.loop_time > 0.0:
+            loop_rate = self.loop_iterations / self.loop_time
+        return {
+            'setup_s': self.setup_time,
+            'loop_s': self.loop_time,
+            'loop_iterations': self.loop_iterations,
+            'loop_rate_hz': loop_rate,
+            'finish_s': self.finish_time,
+            'controllers_s': dict(self.controllers),
+            'callback_latency': self.callbacks.summary(),
+            'counters': dict(self.counters),
+            'errors': list(self.errors),
+            'peak_rss_mb': peak_rss_mb(),
+        }
+
+
+def peak_rss_mb():
+    # ru_maxrss is reported in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
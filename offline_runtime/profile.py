@@ -0,0 +1,37 @@
+import os
+import json
+
+
+PROFILES_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                            'profiles')
+
+
+def load_profile(name='default', overrides=()):
+    """Load a profile by name (from profiles/) or by path.
+
+    Overrides are 'dotted.key=value' strings, values are parsed as JSON when
+    possible, e.g. 'controllers.lidar.scan_rate=40'.
+    """
+    path = name
+    if not os.path.isfile(path):
+        path = os.path.join(PROFILES_DIR, f'{name}.json')
+    with open(path, 'r') as f:
+        profile = json.load(f)
+    for override in overrides:
+        apply_override(profile, override)
+    return profile
+
+
+def apply_override(profile, override):
+    key, sep, value = override.partition('=')
+    if not sep:
+        raise ValueError(f'Invalid override \'{override}\', expected key=value')
+    try:
+        value = json.loads(value)
+    except json.JSONDecodeError:
+        pass
+    node = profile
+    keys = key.split('.')
+    for k in keys[:-1]:
+        node = node.setdefault(k, {})
+    node[keys[-1]] = value
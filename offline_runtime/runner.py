@@ -0,0 +1,140 @@
+import os
+import sys
+import json
+import time
+import logging
+import tempfile
+import importlib
+import subprocess
+
+from offline_runtime.runtime import start_runtime
+from offline_runtime.metrics import peak_rss_mb
+
+
+PACKAGE_DIR = os.path.dirname(os.path.realpath(__file__))
+REPO_DIR = os.path.dirname(PACKAGE_DIR)
+FAKE_SDK_DIR = os.path.join(PACKAGE_DIR, 'fake_sdk')
+APPS_FILE = os.path.join(PACKAGE_DIR, 'apps.json')
+DEFAULT_MAX_DURATION = 30.0
+
+
+def load_apps():
+    with open(APPS_FILE, 'r') as f:
+        return json.load(f)
+
+
+def run_app(app_dir, app_args=(), profile=None, max_duration=None,
+            log_level=logging.WARNING):
+    """Run one app in this process against the fake SDK and return its
+    report. Must be called once per process, apps share the `src` package
+    name."""
+    app_dir = os.path.realpath(app_dir)
+    sys.path[:0] = [FAKE_SDK_DIR, REPO_DIR, app_dir]
+    sys.argv = [os.path.join(app_dir, '__main__.py')] + list(app_args)
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    if not os.environ.get('DISPLAY'):
+        _headless_highgui()
+    logging.basicConfig(level=log_level,
+                        format='%(asctime)s %(name)s %(levelname)s %(message)s')
+    runtime = start_runtime(profile, max_duration=max_duration)
+    report = {'app': os.path.basename(app_dir), 'status': 'ok'}
+    t0 = time.monotonic()
+    try:
+        app_module = importlib.import_module('src.app')
+        from raya.entry_point import entry_point
+        entry_point(app_dir, app_module.RayaApplication)
+    except SystemExit as e:
+        # argparse errors end up here
+        report['status'] = f'exit({e.code})'
+    except Exception as e:
+        report['status'] = 'error'
+        runtime.metrics.errors.append(f'{type(e).__name__}: {e}')
+    report['wall_s'] = time.monotonic() - t0
+    report.update(runtime.metrics.report())
+    if report['status'] == 'ok' and report['errors']:
+        report['status'] = 'error'
+    report['peak_rss_mb'] = peak_rss_mb()
+    return report
+
+
+def _headless_highgui():
+    # Apps that open their own OpenCV windows (nav_to_click) get the same
+    # treatment as `raya.tools.image.show_image`: no window, frames counted
+    try:
+        import cv2
+    except ImportError:
+        return
+    from offline_runtime.runtime import get_runtime
+
+    def imshow(winname, mat):
+        get_runtime().metrics.counters['show_image'] += 1
+
+    def wait_key(delay=0):
+        # Blocks like the real one, no key is ever pressed
+        time.sleep(max(delay, 0) / 1000.0)
+        return -1
+
+    cv2.namedWindow = lambda *args, **kwargs: None
+    cv2.setMouseCallback = lambda *args, **kwargs: None
+    cv2.destroyWindow = lambda *args, **kwargs: None
+    cv2.destroyAllWindows = lambda *args, **kwargs: None
+    cv2.imshow = imshow
+    cv2.waitKey = wait_key
+
+
+def run_apps(app_names, profile_name='default', overrides=(),
+             max_duration=None, verbose=False):
+    """Run every app in its own subprocess and collect their reports."""
+    apps = load_apps()
+    reports = []
+    for name in app_names:
+        settings = apps.get(name, {})
+        if 'unsupported' in settings:
+            # Apps using controllers the runtime doesn't fake
+            reports.append({'app': name, 'status': 'skipped',
+                            'reason': settings['unsupported']})
+            continue
+        duration = max_duration or settings.get('max_duration',
+                                                DEFAULT_MAX_DURATION)
+        with tempfile.NamedTemporaryFile(suffix='.json') as report_file:
+            cmd = [sys.executable, '-m', 'offline_runtime', 'run',
+                   '--profile', profile_name, '--max-duration', str(duration),
+                   '--report', report_file.name, '--log-level', 'WARNING']
+            for override in overrides:
+                cmd += ['--set', override]
+            cmd += [name, '--'] + settings.get('args', [])
+            output = None if verbose else subprocess.DEVNULL
+            proc = subprocess.run(cmd, cwd=REPO_DIR, stdout=output,
+                                  stderr=output)
+            try:
+                with open(report_file.name, 'r') as f:
+                    reports.append(json.load(f))
+            except (OSError, json.JSONDecodeError):
+                reports.append({'app': name,
+                                'status': f'crashed({proc.returncode})'})
+    return reports
+
+
+def format_reports(reports):
+    header = (f'{"app":32} {"status":10} {"setup_s":>8} {"loop_hz":>10} '
+              f'{"cb_p50":>8} {"cb_p90":>8} {"cb_p99":>8} {"rss_mb":>8}')
+    lines = [header, '-' * len(header)]
+    for r in reports:
+        latency = r.get('callback_latency', {})
+        lines.append(
+            f'{r["app"]:32} {r["status"]:10} {_fmt(r.get("setup_s")):>8} '
+            f'{_fmt(r.get("loop_rate_hz"), 1):>10} '
+            f'{_fmt(latency.get("p50_ms")):>8} {_fmt(latency.get("p90_ms")):>8} '
+            f'{_fmt(latency.get("p99_ms")):>8} '
+            f'{_fmt(r.get("peak_rss_mb"), 1):>8}')
+    return '\n'.join(lines)
+
+
+def _fmt(value, digits=2):
+    return '-' if value is None else f'{value:.{digits}f}'
+
+
+def list_app_dirs():
+    return sorted(d for d in os.listdir(REPO_DIR)
+                  if os.path.isfile(os.path.join(REPO_DIR, d, '__main__.py'))
+                  and os.path.isdir(os.path.join(REPO_DIR, d, 'src')))
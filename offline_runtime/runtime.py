@@ -0,0 +1,66 @@
+import time
+import random
+import asyncio
+import inspect
+import traceback
+
+from offline_runtime.world import World
+from offline_runtime.metrics import Metrics
+from offline_runtime.profile import load_profile
+
+
+_runtime = None
+
+
+class Runtime:
+    """State shared by the fake controllers of one offline app run."""
+
+    def __init__(self, profile, max_duration=None):
+        self.profile = profile
+        self.max_duration = max_duration
+        self.metrics = Metrics()
+        self.random = random.Random(profile.get('seed', 0))
+        self.world = World(profile['world'], seed=profile.get('seed', 0))
+
+
+    def controller_config(self, name):
+        return self.profile['controllers'].get(name, {})
+
+
+    def dispatch(self, callback, *args, due=None):
+        """Invoke an app callback, recording its latency from `due`."""
+        if callback is None:
+            return
+        due = time.monotonic() if due is None else due
+        try:
+            result = callback(*args)
+            if inspect.isawaitable(result):
+                asyncio.ensure_future(result)
+        except Exception as e:
+            name = getattr(callback, '__name__', repr(callback))
+            self.metrics.errors.append(f'callback {name}: {e!r}')
+            traceback.print_exc()
+        finally:
+            self.metrics.callbacks.add(time.monotonic() - due)
+            self.metrics.counters['callbacks'] += 1
+
+
+    def dispatch_later(self, delay, callback, *args):
+        due = time.monotonic() + delay
+        loop = asyncio.get_running_loop()
+        return loop.call_later(delay, lambda: self.dispatch(callback, *args,
+                                                            due=due))
+
+
+def start_runtime(profile=None, max_duration=None):
+    global _runtime
+    if profile is None:
+        profile = load_profile()
+    _runtime = Runtime(profile, max_duration=max_duration)
+    return _runtime
+
+
+def get_runtime():
+    if _runtime is None:
+        start_runtime()
+    return _runtime
@@ -0,0 +1,175 @@
+import math
+import time
+
+import numpy as np
+
+
+def wrap_angle(angle):
+    return (angle + math.pi) % (2.0 * math.pi) - math.pi
+
+
+class World:
+    """Kinematic robot in a rectangular room with pillars and objects.
+
+    The pose is integrated lazily from the active command whenever it is
+    read, so there is no background ticker.
+    """
+
+    def __init__(self, config, seed=0):
+        self.walls = config['walls']
+        self.pillars = config.get('pillars', [])
+        self.objects = config.get('objects', [])
+        self.sensors = config.get('sensors', {})
+        self.maps = config.get('maps', {})
+        self.current_map = None
+        self.rng = np.random.default_rng(seed)
+        self.x, self.y, self.yaw = config.get('start_pose', [0.0, 0.0, 0.0])
+        self._stamp = time.monotonic()
+        self._velocity = None
+        self._path = None
+        self._map_images = {}
+
+
+    ## Kinematics
+    def pose(self, now=None):
+        self._integrate(time.monotonic() if now is None else now)
+        return self.x, self.y, self.yaw
+
+
+    def set_velocity(self, vx, vy, w, duration):
+        now = time.monotonic()
+        self._integrate(now)
+        self._path = None
+        self._velocity = (vx, vy, w, now + duration)
+
+
+    def follow_path(self, goal, duration):
+        now = time.monotonic()
+        self._integrate(now)
+        self._velocity = None
+        self._path = ((self.x, self.y, self.yaw), goal, now, now + duration)
+
+
+    def stop(self):
+        self._integrate(time.monotonic())
+        self._velocity = None
+        self._path = None
+
+
+    def is_moving(self):
+        self._integrate(time.monotonic())
+        return self._velocity is not None or self._path is not None
+
+
+    def _integrate(self, now):
+        if self._velocity is not None:
+            vx, vy, w, t_end = self._velocity
+            dt = min(now, t_end) - self._stamp
+            if dt > 0.0:
+                th0 = self.yaw
+                th1 = th0 + w * dt
+                if abs(w) < 1e-9:
+                    self.x += (vx * math.cos(th0) - vy * math.sin(th0)) * dt
+                    self.y += (vx * math.sin(th0) + vy * math.cos(th0)) * dt
+                else:
+                    ds = math.sin(th1) - math.sin(th0)
+                    dc = math.cos(th1) - math.cos(th0)
+                    self.x += (vx * ds + vy * dc) / w
+                    self.y += (-vx * dc + vy * ds) / w
+                self.yaw = wrap_angle(th1)
+            if now >= t_end:
+                self._velocity = None
+        elif self._path is not None:
+            start, goal, t0, t1 = self._path
+            k = 1.0 if t1 <= t0 else min(1.0, (now - t0) / (t1 - t0))
+            self.x = start[0] + (goal[0] - start[0]) * k
+            self.y = start[1] + (goal[1] - start[1]) * k
+            self.yaw = wrap_angle(
+                start[2] + wrap_angle(goal[2] - start[2]) * k)
+            if k >= 1.0:
+                self._path = None
+        self._stamp = now
+
+
+    ## Sensing
+    def lidar_ranges(self, angles, range_max, noise=0.0):
+        x, y, yaw = self.pose()
+        theta = angles + yaw
+        dx = np.cos(theta)
+        dy = np.sin(theta)
+        xmin, ymin, xmax, ymax = self.walls
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tx = np.where(dx > 0, (xmax - x) / dx, (xmin - x) / dx)
+            ty = np.where(dy > 0, (ymax - y) / dy, (ymin - y) / dy)
+        ranges = np.fmin(np.abs(tx), np.abs(ty))
+        for pillar in self.pillars:
+            ox = pillar['x'] - x
+            oy = pillar['y'] - y
+            b = ox * dx + oy * dy
+            disc = b * b - (ox * ox + oy * oy - pillar['r'] ** 2)
+            hit = (disc >= 0.0) & (b > 0.0)
+            t = b - np.sqrt(np.where(hit, disc, 0.0))
+            ranges = np.where(hit & (t > 0.0) & (t < ranges), t, ranges)
+        if noise > 0.0:
+            ranges = ranges + self.rng.normal(0.0, noise, ranges.shape)
+        ranges[ranges > range_max] = np.inf
+        return ranges
+
+
+    def visible_objects(self, hfov, max_range):
+        x, y, yaw = self.pose()
+        visible = []
+        for obj in self.objects:
+            dx = obj['x'] - x
+            dy = obj['y'] - y
+            distance = math.hypot(dx, dy)
+            bearing = wrap_angle(math.atan2(dy, dx) - yaw)
+            if distance <= max_range and abs(bearing) <= hfov / 2.0:
+                visible.append((obj, distance, bearing))
+        return visible
+
+
+    def object_near(self, name, max_distance):
+        x, y, _ = self.pose()
+        best = None
+        for obj in self.objects:
+            if obj['name'] != name:
+                continue
+            distance = math.hypot(obj['x'] - x, obj['y'] - y)
+            if distance <= max_distance and (best is None or distance < best[1]):
+                best = (obj, distance)
+        return best
+
+
+    ## Maps
+    def map_config(self, map_name=None):
+        return self.maps[map_name or self.current_map]
+
+
+    def meters_to_pixel(self, x, y, map_name=None):
+        info = self.map_config(map_name)
+        res = info['resolution']
+        ox, oy = info['origin'][:2]
+        return int(round((x - ox) / res)), int(round(info['height'] - (y - oy) / res))
+
+
+    def pixel_to_meters(self, u, v, map_name=None):
+        info = self.map_config(map_name)
+        res = info['resolution']
+        ox, oy = info['origin'][:2]
+        return u * res + ox, (info['height'] - v) * res + oy
+
+
+    def map_image(self, map_name):
+        if map_name not in self._map_images:
+            info = self.maps[map_name]
+            img = np.full((info['height'], info['width'], 3), 205, np.uint8)
+            u0, v1 = self.meters_to_pixel(self.walls[0], self.walls[1], map_name)
+            u1, v0 = self.meters_to_pixel(self.walls[2], self.walls[3], map_name)
+            img[max(v0, 0):v1, max(u0, 0):u1] = 254
+            img[max(v0, 0):v1, max(u0, 0):max(u0, 0) + 2] = 0
+            img[max(v0, 0):v1, u1 - 2:u1] = 0
+            img[max(v0, 0):max(v0, 0) + 2, max(u0, 0):u1] = 0
+            img[v1 - 2:v1, max(u0, 0):u1] = 0
+            self._map_images[map_name] = img
+        return self._map_images[map_name]
@@ -1,7 +1,7 @@
 # Common Imports
-import cv2
+import asyncio
 import argparse
-import numpy as np
+import functools
 
 # Raya Imports
 from raya.application_base import RayaApplicationBase
@@ -13,11 +13,24 @@ from raya.controllers.arms_controller import ArmsController
 from raya.controllers.motion_controller import MotionController
 from raya.controllers.navigation_controller import NavigationController
 from raya.controllers.navigation_controller import POS_UNIT
-from raya.tools.image import show_image
 from raya.exceptions import RayaCVAlreadyEnabledType
 from raya.application_base import RayaApplicationBase
 from raya.exceptions import RayaNavNotNavigating
 
+# Shared Imports
+from common.startup import concurrent_setup
+from common.display import DisplayWorker
+from common.object_index import ObjectIndex
+from common.tracker import ObjectTracker
+from common.tour import plan_tour
+from common.arm_info import ArmInfo
+from common.overlap import MotionOverlap
+from common.grasp import GraspPipeline
+from common.retry import RetryBudget, RetriesExhausted
+from common.detections import DetectionCache
+from common.completion import (run_until_finished, run_until_stopped,
+                               motion_timeout)
+
 
 OBJECT_ZONES = {'kitchen': ['cup', 'bottle'], 'room01': []}
 
@@ -26,13 +39,14 @@ class RayaApplication(RayaApplicationBase):
     async def setup(self):
 
         ## Common Variables
-        self.arrived = False
-        self.grasped = False
-        self.retries = 0
+        self.display = None
         self.max_tries = 3
         self.detection = []
         self.arms_dict = {'right_arm' : [False, 0.0], 'left_arm' : [False, 0.0]}
-        self.objets_to_clean = {}
+        # Detections are followed across frames, only the new objects are
+        # checked. Objects closer than 1 meter are the same object
+        self.tracker = ObjectTracker(on_birth=self.cb_object_tracked)
+        self.objets_to_clean = ObjectIndex(radius=1.0)
         self.model_name = 'coral_efficientdet_lite0_320_coco'
         self.location_name2 = 'kitchen'
         self.predefined_pose_nav = 'nav_with_object2'
@@ -43,25 +57,42 @@ class RayaApplication(RayaApplicationBase):
         ## Get Arguments
         self.get_args()
 
-        ## Initialize neccesary Controllers
-        self.cameras: CamerasController = await self.enable_controller('cameras')
-        self.cv: CVController = await self.enable_controller('cv')
-        self.motion: MotionController = await self.enable_controller('motion')
-        self.nav: NavigationController = await self.enable_controller('navigation')
-        self.gsp: GraspingController = await self.enable_controller('grasping') 
-        self.arms: ArmsController = await self.enable_controller("arms") 
-
-        ## Enable Color Camera 
-        await self.cameras.enable_color_camera(self.camera_name)
-
-        ## Set navigation variables
+        ## Initialize neccesary Controllers, enable the color camera and set
+        ## the map, all concurrently
         self.log.info((f'Setting map: {self.map_name}. '
                        'Waiting for the robot to get localized'))
-        if not await self.nav.set_map(self.map_name, 
-                                      wait_localization=True, 
-                                      timeout=3.0):
+        startup = await concurrent_setup(self,
+                        controllers=['cameras', 'cv', 'motion', 'navigation',
+                                     'grasping', 'arms'],
+                        color_cameras=[self.camera_name],
+                        map_name=self.map_name,
+                        wait_localization=True,
+                        timeout=3.0)
+        startup.log_timings(self.log)
+        self.cameras: CamerasController = startup['cameras']
+        self.cv: CVController = startup['cv']
+        self.motion: MotionController = startup['motion']
+        self.nav: NavigationController = startup['navigation']
+        self.gsp: GraspingController = startup['grasping']
+        self.arms: ArmsController = startup['arms']
+        self.arm_info = ArmInfo(self.arms)
+        # The navigation pose and the home poses keep the arm inside the
+        # robot, the arm goes there while the robot backs away, once it
+        # is 10 cm away from the table
+        self.overlap = MotionOverlap(self.arms,
+                        nav_safe_poses={arm: {self.predefined_pose_nav,
+                                              f'{arm}_home'}
+                                        for arm in self.arms_dict},
+                        clearance=0.1,
+                        get_position=functools.partial(self.nav.get_position,
+                                                pos_unit=POS_UNIT.METERS),
+                        callback_feedback=self.callback_arm_feedback,
+                        callback_finish=self.callback_arm_finish)
+        if not startup.localized:
             self.log.info((f'Robot couldn\'t localize itself'))
             self.finish_app()
+        # Each object and each place point gets its own tries
+        self.nav_retries = RetryBudget(max_tries=self.max_tries)
         self.status = await self.nav.get_status()
         self.log.info(f'status: {self.status}')
 
@@ -69,7 +100,6 @@ class RayaApplication(RayaApplicationBase):
     ## Callbacks Navigation
     def cb_nav_finish(self, error, error_msg):
         print(f'cb_nav_finish {error} {error_msg}')
-        self.arrived = True
 
 
     def cb_nav_feedback(self, state, distance_to_goal, speed):
@@ -82,24 +112,19 @@ class RayaApplication(RayaApplicationBase):
 
 
     def callback_color_frame(self, img):
-        detections = self.detector.get_current_detections()
-        detection_names = []
-        for detection in detections:
-            img = cv2.rectangle(img, 
-                                (detection['x_min'], detection['y_min']), 
-                                (detection['x_max'], detection['y_max']), 
-                                (0, 255, 0), 
-                                2)
-            img = cv2.putText(img, detection['object_name'], (detection['x_min'], detection['y_min'] - 5), cv2.FONT_HERSHEY_SIMPLEX,
-			0.5, (0, 0, 255), 2)
-            detection_names.append(detection['object_name'])
-            self.check_objects_to_clean(detection)
-        show_image(img, 'Video from Gary\'s camera', scale = 0.5)
+        # The tracker only runs on new results, with their stamp
+        if self.detections.on_frame(img):
+            self.tracker.update(self.detections.detections,
+                                self.detections.stamp)
+        self.display.submit(img, self.detections.detections)
+
+
+    def cb_object_tracked(self, track):
+        self.log.info(f'New {track.object_name} (track {track.id})')
 
 
     ## Grasping Pick Callbacks
     def cb_grasping_pick_finish(self, error, error_msg, result):
-        self.grasped = True
         if error != 0:
             self.log.info(f'error: {error} {error_msg}')
             self.finish_app()
@@ -116,7 +141,6 @@ class RayaApplication(RayaApplicationBase):
 
     ## Grasping Place Callbacks
     def cb_grasping_place_finish(self, error, error_msg):
-        self.grasped = True
         if error != 0:
             self.log.info(f'error: {error} {error_msg}')
             self.finish_app()
@@ -162,26 +186,19 @@ class RayaApplication(RayaApplicationBase):
         self.camera_name = args.camera_name
 
 
-    def check_objects_to_clean(self, detection):
-        if detection['object_name'] not in self.objets_to_clean:
-            self.objets_to_clean[detection['object_name']] = [detection['center_point_map']]
-        else:
-            add_obj = True
-            for objects in self.objets_to_clean[detection['object_name']]:
-                p1 = np.array(detection['center_point_map'])
-                p2 = np.array(objects)
-                squared_dist = np.sum((p1-p2)**2, axis=0)
-                dist = np.sqrt(squared_dist)
-                if dist < 1:
-                    add_obj = False
-            if add_obj and detection['object_name'] in OBJECT_ZONES[self.location_name]:
-                self.objets_to_clean[detection['object_name']].append(detection['center_point_map'])
+    def check_objects_to_clean(self, track):
+        # Without depth the detections have no map position to go to
+        if track.center_point_map is None:
+            self.log.warn(f'{track.object_name} has no map position, '
+                          'skipped')
+            return
+        if track.object_name in OBJECT_ZONES[self.location_name]:
+            self.objets_to_clean.add(track.object_name,
+                                     track.center_point_map.tolist())
 
 
     def check_predefined_pose(self, pose, arm):
-        if not pose in self.arms.get_list_predefined_poses(
-            arm
-        ):
+        if not self.arm_info.has_predefined_pose(arm, pose):
             raise ValueError(
                 f"the predefined_pose {pose} is not avaliable for this arm"
             )
@@ -213,18 +230,37 @@ class RayaApplication(RayaApplicationBase):
         await self.sleep(0.5)
 
 
+    async def back_away_to_pose(self, pose, arm):
+        self.check_predefined_pose(pose, arm)
+        try:
+            cycle = await self.overlap.run(
+                        run_until_stopped(self.motion.move_linear,
+                                          distance=-0.3, x_velocity=0.3,
+                                          active=self.motion.is_moving,
+                                          timeout=motion_timeout(0.3, 0.3)),
+                        [(arm, pose)])
+        except asyncio.TimeoutError:
+            self.log.error('Motion command timed out')
+            if self.motion.is_moving():
+                await self.motion.cancel_motion()
+            # The pose may not have started with the base still moving
+            await self.go_to_pose(pose, arm)
+            return
+        self.log.info(f'Motion command and {pose} finished, '
+                      f'{cycle["saved"]:.2f} s saved')
+
+
     async def loop(self):
         ## Get location Point
         self.log.info(f'Goint to {self.location_name}')
 
         ## Navigate to location
-        await self.nav.navigate_to_location( 
+        await run_until_finished(self.nav.navigate_to_location,
             zone_name= self.location_name,
             callback_feedback = self.cb_nav_feedback,
             callback_finish = self.cb_nav_finish,
-            wait=False,
+            active = self.nav.is_navigating,
         )
-        while not self.arrived: await self.sleep(0.1)
         
         ## Enable detection model
         try:
@@ -242,21 +278,41 @@ class RayaApplication(RayaApplicationBase):
             self.finish_app()
             return
 
-        # Create camera listener
+        # The tracker and the drawing share each result of the detector
+        self.detections = DetectionCache(self.detector)
+
+        # Create camera listener, frames are drawn and shown in another thread
+        self.display = DisplayWorker('Video from Gary\'s camera',
+                                     scale=0.5).start()
         self.cameras.create_color_frame_listener(
                                         camera_name=self.camera_name,
                                         callback=self.callback_color_frame)  
+        # The camera is off once the objects are found, the pre-checks
+        # of the picks are the free arms and the distance to the object
+        self.picker = GraspPipeline(self.gsp, self.arms, self.detector,
+                        nav=self.nav, max_age=None,
+                        budget=RetryBudget(max_tries=self.max_tries),
+                        callback_feedback=self.cb_grasping_pick_feedback)
         self.log.info('Model and camera enabled')          
         self.log.info(f'Looking for objects')
 
         ## Rotate 360 degrees
-        await self.motion.rotate(angle=-360.0, angular_velocity=30.0, wait=False)
-        while self.motion.is_moving(): await self.sleep(0.1)
-        if self.motion.is_moving(): await self.motion.cancel_motion()
+        try:
+            await run_until_stopped(self.motion.rotate,
+                                    angle=-360.0, angular_velocity=30.0,
+                                    active=self.motion.is_moving,
+                                    timeout=motion_timeout(360.0, 30.0))
+        except asyncio.TimeoutError:
+            self.log.error('Motion command timed out')
+            if self.motion.is_moving():
+                await self.motion.cancel_motion()
 
         ## Disable Camera
         self.log.info('Disabling camera...')
         self.cameras.disable_color_camera(self.camera_name)
+        for track in self.tracker.tracks(include_dead=True):
+            self.check_objects_to_clean(track)
+        self.log.info(f'Objects to clean: {self.objets_to_clean.objects()}')
 
         ## Check Objects to clean
         if len(self.objets_to_clean) > 0:
@@ -265,115 +321,121 @@ class RayaApplication(RayaApplicationBase):
             # for arm in self.arms_dict:
             #     await self.go_to_pose(self.predefined_pose_pre_pick, arm)
                 
-            ## Loop in objects to clean    
-            for obj in self.objets_to_clean:
-                for point in self.objets_to_clean[obj]:
-
-                    ## Get X and Y point
-                    obj_x = point[0]
-                    obj_y = point[1]
-                    self.log.info(f'Object position in the map: x: {obj_x} y: {obj_y}')
-
-                    ## Navigate To Point
-                    while self.retries < self.max_tries:
-                        try:
-                            await self.nav.navigate_close_to_position(x=obj_x, y=obj_y, 
-                                                                    pos_unit=POS_UNIT.METERS,
-                                                                    wait=True)
-                        except:
-                            self.retries += 1
-                        else:
-                            self.log.info(f'Navigation succes!!')
-                            break
-                    
-                    ## Obtain available arms to pick
-                    available_arms = self.get_available_arms()
-
-                    ## Try to pick object
-                    self.grasped = False
-                    await self.gsp.pick_object(detector_model = self.model_name, 
-                        source = self.camera_name, object_name = obj, 
-                        arms = available_arms,
-                        callback_feedback = self.cb_grasping_pick_feedback,
-                        callback_finish = self.cb_grasping_pick_finish,
-                        wait=False,
-                    )
-                    self.log.info(f'Pick Object started...')     
-                    while (not self.grasped):await self.sleep(0.1) 
-
-                    ## Update arms state
-                    self.arms_dict[self.arm][0] = True
-                    self.arms_dict[self.arm][1] = self.real_height
-
-                    ## Move backward 0.3 meters at 0.3 m/s
-                    self.log.info('Moving backward 0.3 meters at 0.3 m/s')
-                    await self.motion.move_linear(distance=-0.3, x_velocity=0.3)
-                    while self.motion.is_moving(): await self.sleep(0.1)
-                    self.log.info('Motion command finished')
-
-                    ## Move arm to navigate pose
-                    await self.go_to_pose(self.predefined_pose_nav, self.arm)
+            ## Visit the objects to clean in the shortest order, ending
+            ## close to the place point
+            targets = self.objets_to_clean.objects()
+            position = await self.nav.get_position(pos_unit=POS_UNIT.METERS)
+            order = plan_tour([position['x'], position['y']],
+                              [target.position for target in targets],
+                              end=self.point)
+            for target in (targets[i] for i in order):
+                obj = target.name
+                point = target.position
+
+                ## Get X and Y point
+                obj_x = point[0]
+                obj_y = point[1]
+                self.log.info(f'Object position in the map: x: {obj_x} y: {obj_y}')
+
+                ## Navigate To Point
+                try:
+                    await self.nav_retries.run(('pick', obj, obj_x, obj_y),
+                                    self.nav.navigate_close_to_position,
+                                    x=obj_x, y=obj_y,
+                                    pos_unit=POS_UNIT.METERS, wait=True)
+                except RetriesExhausted as e:
+                    self.log.error(f'{e}, skipping the {obj}')
+                    continue
+                self.log.info(f'Navigation succes!!')
+                
+                ## Obtain available arms to pick
+                available_arms = self.get_available_arms()
+
+                ## Try to pick object, checking before each try that it's
+                ## in reach
+                self.log.info(f'Pick Object started...')
+                result = await self.picker.pick(obj,
+                                    detector_model=self.model_name,
+                                    source=self.camera_name,
+                                    arms=available_arms,
+                                    target=(obj, obj_x, obj_y),
+                                    position=point)
+                if result[0] != 0:
+                    self.log.error(f'Couldn\'t pick the {obj}: {result[1]}')
+                    continue
+                self.cb_grasping_pick_finish(*result)
+
+                ## Update arms state
+                self.arms_dict[self.arm][0] = True
+                self.arms_dict[self.arm][1] = self.real_height
+
+                ## Move backward 0.3 meters at 0.3 m/s while the arm goes to
+                ## the navigation pose
+                self.log.info('Moving backward 0.3 meters at 0.3 m/s')
+                await self.back_away_to_pose(self.predefined_pose_nav,
+                                             self.arm)
         else:
             self.log.error(f'Nothing to clean')
             self.finish_app()
             return
         
         ## Navigate to location
-        self.arrived = False
-        await self.nav.navigate_to_location( 
+        await run_until_finished(self.nav.navigate_to_location,
             zone_name= self.location_name2,
             callback_feedback = self.cb_nav_feedback,
             callback_finish = self.cb_nav_finish,
-            wait=False,
+            active = self.nav.is_navigating,
         )
-        while not self.arrived: await self.sleep(0.1)
 
         # ## Move arms to pre_place pose
         # for arm in self.arms_dict:
         #     await self.go_to_pose(self.predefined_pose_pre_pick, arm)
 
-        ## Loop to check arms state
+        ## Place points of the arms holding an object, visited in the
+        ## shortest order
+        places = []
         for arms_place in self.arms_dict:
-
-            ## If arm have an object
             if self.arms_dict[arms_place][0]:
-
-                ## Navigate To Point
-                self.log.info(f'Object position in the map: x: {self.point[0]} y: {self.point[1]}')
-                while self.retries < self.max_tries:
-                    try:
-                        await self.nav.navigate_close_to_position(x=self.point[0], y =self.point[1], 
-                                                                pos_unit=POS_UNIT.METERS,
-                                                                wait=True)
-                    except:
-                        self.retries += 1
-                    else:
-                        self.log.info(f'Navigation succes!!')
-                        break
-
-                ## Place Object    
-                self.log.info(f'Placing Object')
-                self.grasped = False
-                await self.gsp.place_object_with_point(point_to_place = self.point, 
-                    height_object = self.arms_dict[arms_place][1], arm = arms_place,
-                    callback_feedback = self.cb_grasping_place_feedback,
-                    callback_finish = self.cb_grasping_place_finish,
-                    wait=False,
-                )
-                while (not self.grasped): await self.sleep(0.1)
-                self.log.info(f'Place Object with point finished...')
-
+                places.append((arms_place, list(self.point)))
                 ## Move point to place another object
                 self.point[0] -= -0.25
+        position = await self.nav.get_position(pos_unit=POS_UNIT.METERS)
+        order = plan_tour([position['x'], position['y']],
+                          [point for _, point in places])
+        for arms_place, point in (places[i] for i in order):
+
+            ## Navigate To Point
+            self.log.info(f'Object position in the map: x: {point[0]} y: {point[1]}')
+            try:
+                await self.nav_retries.run(('place', arms_place),
+                                self.nav.navigate_close_to_position,
+                                x=point[0], y=point[1],
+                                pos_unit=POS_UNIT.METERS, wait=True)
+            except RetriesExhausted as e:
+                self.log.error(f'{e}, placing from here')
+            else:
+                self.log.info(f'Navigation succes!!')
+
+            ## Place Object    
+            self.log.info(f'Placing Object')
+            await run_until_finished(self.gsp.place_object_with_point,
+                point_to_place = point, 
+                height_object = self.arms_dict[arms_place][1], arm = arms_place,
+                callback_feedback = self.cb_grasping_place_feedback,
+                callback_finish = self.cb_grasping_place_finish,
+            )
+            self.log.info(f'Place Object with point finished...')
 
-                ## Move backward 0.3 meters at 0.3 m/s
-                self.log.info('Moving backward 0.3 meters at 0.3 m/s')
-                await self.motion.move_linear(distance=-0.3, x_velocity=0.3)
-                while self.motion.is_moving(): await self.sleep(0.1)
-                self.log.info('Motion command finished')
-                
-                ## Go to home pose
-                await self.go_to_pose(f'{arms_place}_home', arms_place)
+            ## Move backward 0.3 meters at 0.3 m/s while the arm goes
+            ## home
+            self.log.info('Moving backward 0.3 meters at 0.3 m/s')
+            await self.back_away_to_pose(f'{arms_place}_home', arms_place)
+
+        self.log.info(f'Pick attempts: {self.picker.report()["attempt"]}')
+        report = self.overlap.report()
+        self.log.info(f'Arm moves overlapped with the base in '
+                      f'{report["overlapped"]}/{report["cycles"]} cycles, '
+                      f'{report["saved"]:.2f} s saved')
 
         ## Finish app
         self.finish_app()
@@ -389,6 +451,8 @@ class RayaApplication(RayaApplicationBase):
                 self.cameras.disable_color_camera(self.camera_name)
         except RayaNavNotNavigating:
             pass
+        if self.display is not None:
+            self.display.stop()
         self.log.info('Finish app called')
 
 
@@ -1,6 +1,6 @@
 # Common Imports
 import json
-import cv2
+import asyncio
 import argparse
 
 # Raya Imports
@@ -11,23 +11,34 @@ from raya.controllers.motion_controller import MotionController
 from raya.controllers.cv_controller import DetectionObjectsHandler
 from raya.controllers.navigation_controller import NavigationController
 from raya.enumerations import POS_UNIT
-from raya.tools.image import show_image
 from raya.exceptions import RayaCVAlreadyEnabledType
 from raya.application_base import RayaApplicationBase
 from raya.controllers.navigation_controller import POS_UNIT, ANG_UNIT
 from raya.exceptions import RayaNavNotNavigating
 
+# Shared Imports
+from common.startup import concurrent_setup
+from common.display import DisplayWorker
+from common.completion import (Completion, run_until_finished,
+                               run_until_stopped, wait_first, motion_timeout)
+from common.retry import RetryBudget, RetriesExhausted
+from common.detections import DetectionCache
+from common.grasp import GraspPipeline
+
 
 OBJECT_ZONES = {'kitchen': ['cup', 'bottle'], 'room01': []}
+# Seconds to reach the first location
+NAV_TIMEOUT = 300.0
 
 
 class RayaApplication(RayaApplicationBase):
     async def setup(self):
+        self.display = None
         self.arrived = False
-        self.grasped = False
         self.arm_predefined = 'right_arm'
-        self.retries = 0
         self.max_tries = 3
+        # The object and the place point get their own tries
+        self.nav_retries = RetryBudget(max_tries=self.max_tries)
         self.detection = []
         self.objets_to_clean = []
         self.model_name = 'coral_efficientdet_lite0_320_coco'
@@ -37,18 +48,23 @@ class RayaApplication(RayaApplicationBase):
         self.predefined_pose_home = 'right_arm_home'
         self.point = [-2.18, 0.63, 0.8]
         self.get_args()
-        self.cameras: CamerasController = await self.enable_controller('cameras')
-        self.cv: CVController = await self.enable_controller('cv')
-        self.motion: MotionController = await self.enable_controller('motion')
-        self.nav: NavigationController = await self.enable_controller('navigation')
-        self.gsp = await self.enable_controller('grasping') 
-        self.arms = await self.enable_controller("arms")  
-        await self.cameras.enable_color_camera(self.camera_name)
         self.log.info((f'Setting map: {self.map_name}. '
                        'Waiting for the robot to get localized'))
-        if not await self.nav.set_map(self.map_name, 
-                                      wait_localization=True, 
-                                      timeout=3.0):
+        startup = await concurrent_setup(self,
+                        controllers=['cameras', 'cv', 'motion', 'navigation',
+                                     'grasping', 'arms'],
+                        color_cameras=[self.camera_name],
+                        map_name=self.map_name,
+                        wait_localization=True,
+                        timeout=3.0)
+        startup.log_timings(self.log)
+        self.cameras: CamerasController = startup['cameras']
+        self.cv: CVController = startup['cv']
+        self.motion: MotionController = startup['motion']
+        self.nav: NavigationController = startup['navigation']
+        self.gsp = startup['grasping']
+        self.arms = startup['arms']
+        if not startup.localized:
             self.log.info((f'Robot couldn\'t localize itself'))
             self.finish_app()
 
@@ -58,10 +74,12 @@ class RayaApplication(RayaApplicationBase):
         self.location = await self.nav.get_location(self.location_name, POS_UNIT.PIXEL)
         goal_x, goal_y, goal_yaw = self.location['x'], self.location['y'], 0.0
         self.log.warn(f'New goal received {goal_x, goal_y, goal_yaw}')
+        self.arrival = Completion(callback_feedback = self.cb_nav_feedback,
+                                  callback_finish = self.cb_nav_finish)
         await self.nav.navigate_to_location( 
             zone_name= self.location_name,
-            callback_feedback = self.cb_nav_feedback,
-            callback_finish = self.cb_nav_finish,
+            callback_feedback = self.arrival.feedback,
+            callback_finish = self.arrival.finish,
             wait=False,
         )
     
@@ -80,23 +98,14 @@ class RayaApplication(RayaApplicationBase):
 
 
     def callback_color_frame(self, img):
-        detections = self.detector.get_current_detections()
-        detection_names = []
-        for detection in detections:
-            img = cv2.rectangle(img, 
-                                (detection['x_min'], detection['y_min']), 
-                                (detection['x_max'], detection['y_max']), 
-                                (0, 255, 0), 
-                                2)
-            img = cv2.putText(img, detection['object_name'], (detection['x_min'], detection['y_min'] - 5), cv2.FONT_HERSHEY_SIMPLEX,
-			0.5, (0, 0, 255), 2)
-            detection_names.append(detection['object_name'])
-        self.log.info(f'Detections: {detection_names}')
-        show_image(img, 'Video from Gary\'s camera', scale = 0.4)
+        if self.detections.on_frame(img):
+            detection_names = [d['object_name']
+                               for d in self.detections.detections]
+            self.log.info(f'Detections: {detection_names}')
+        self.display.submit(img, self.detections.detections)
 
 
     def cb_grasping_pick_finish(self, error, error_msg, result):
-        self.grasped = True
         if error != 0:
             self.log.info(f'error: {error} {error_msg}')
             self.finish_app()
@@ -112,7 +121,6 @@ class RayaApplication(RayaApplicationBase):
 
 
     def cb_grasping_place_finish(self, error, error_msg):
-        self.grasped = True
         if error != 0:
             self.log.info(f'error: {error} {error_msg}')
             self.finish_app()
@@ -133,6 +141,20 @@ class RayaApplication(RayaApplicationBase):
             )
 
 
+    async def move_backward(self, distance, velocity=0.3):
+        self.log.info(f'Moving backward {distance} meters at {velocity} m/s')
+        try:
+            await run_until_stopped(self.motion.move_linear,
+                                    distance=-distance, x_velocity=velocity,
+                                    active=self.motion.is_moving,
+                                    timeout=motion_timeout(distance, velocity))
+        except asyncio.TimeoutError:
+            self.log.error('Motion command timed out')
+            if self.motion.is_moving():
+                await self.motion.cancel_motion()
+        self.log.info('Motion command finished'); self.log.info('')
+
+
     async def execute_predefined_pose(self, predefined_pose: str):
         print(f"\n Start the execution of the predefined pose {predefined_pose}\n")
 
@@ -156,6 +178,14 @@ class RayaApplication(RayaApplicationBase):
 
 
     async def loop(self):
+        try:
+            await self.arrival.wait(NAV_TIMEOUT, active=self.nav.is_navigating)
+        except asyncio.TimeoutError:
+            pass
+        if not self.arrived:
+            self.log.error(f'Couldn\'t reach {self.location_name}')
+            self.finish_app()
+            return
         if self.arrived:
             try:
                 self.log.info('Enabling model')
@@ -166,22 +196,33 @@ class RayaApplication(RayaApplicationBase):
                                 source=self.camera_name,
                                 model_params = {'depth': True})
                 self.log.info('Model and camera enabled')
+                # Drawing, verification and the pick pre-checks share the
+                # results of the detector, each read once per result
+                self.detections = DetectionCache(self.detector, max_age=0.5)
+                self.picker = GraspPipeline(self.gsp, self.arms,
+                                self.detections, nav=self.nav,
+                                budget=RetryBudget(max_tries=self.max_tries),
+                                callback_feedback=self.cb_grasping_pick_feedback)
             except RayaCVAlreadyEnabledType:
                 await self.cv.disable_model(model='detectors',type='object')
                 self.log.info('Run again...')
                 self.finish_app()
                 return
-            # Create listeners
+            # Create listeners, frames are drawn and shown in another thread
+            self.display = DisplayWorker('Video from Gary\'s camera',
+                                         scale=0.4).start()
             self.cameras.create_color_frame_listener(
                                             camera_name=self.camera_name,
                                             callback=self.callback_color_frame)            
             self.log.info(f'Looking for objects')
-            await self.motion.rotate(angle=-360.0, angular_velocity=30.0, wait=False)
+            rotation = Completion()
+            await self.motion.rotate(angle=-360.0, angular_velocity=30.0,
+                                     callback=rotation.finish, wait=False)
 
-
-            await self.detector.find_objects([self.object_name], callback=self.cb_object_detected)       
-            while (not self.detection) and (self.motion.is_moving()):
-                await self.sleep(0.1)
+            detected = Completion(callback_finish=self.cb_object_detected)
+            await self.detector.find_objects([self.object_name], callback=detected.finish)
+            await wait_first(detected, rotation,
+                             timeout=motion_timeout(360.0, 30.0))
 
             self.detector.cancel_find_objects()
 
@@ -193,9 +234,11 @@ class RayaApplication(RayaApplicationBase):
                 self.finish_app()
                 return
 
+            # Results from before the robot stopped don't verify anything
+            self.detections.invalidate()
             await self.sleep(0.5)
             # VERIFY
-            self.detection = await self.detector.find_objects([self.object_name], wait=True, timeout=0.5)
+            self.detection = await self.detections.find_objects([self.object_name], wait=True, timeout=0.5)
             if not self.detection:
                 self.log.error(f'Object {self.object_name} not found')
                 self.finish_app()
@@ -212,78 +255,62 @@ class RayaApplication(RayaApplicationBase):
             self.log.info(f'Object {self.object_name} found!!')
             self.log.info(f'Object position in the map: x: {obj_x} y: {obj_y}')
             
-            while self.retries < self.max_tries:
-                try:
-                    await self.nav.navigate_close_to_position(x=obj_x, y=obj_y, 
-                                                            pos_unit=POS_UNIT.METERS,
-                                                            wait=True)
-                except:
-                    self.retries += 1
-                else:
-                    self.log.info(f'Navigation succes!!')
-                    break
-
-            await self.gsp.pick_object(detector_model = self.model_name, 
-                    source = self.camera_name, object_name = self.object_name, 
-                    arms = [self.arm_predefined],
-                    callback_feedback = self.cb_grasping_pick_feedback,
-                    callback_finish = self.cb_grasping_pick_finish,
-                    wait=False,
-                )
-            self.log.info(f'Pick Object started...')
+            try:
+                await self.nav_retries.run('object',
+                                self.nav.navigate_close_to_position,
+                                x=obj_x, y=obj_y,
+                                pos_unit=POS_UNIT.METERS, wait=True)
+            except RetriesExhausted as e:
+                self.log.error(f'{e}')
+            else:
+                self.log.info(f'Navigation succes!!')
 
-            while (not self.grasped):
-                await self.sleep(0.1)
-            self.log.info('Moving backward 0.5 meters at 0.3 m/s')
-            await self.motion.move_linear(distance=-0.5, x_velocity=0.3)
-            while self.motion.is_moving(): await self.sleep(0.1)
-            self.log.info('Motion command finished'); self.log.info('')
+            self.log.info(f'Pick Object started...')
+            result = await self.picker.pick(self.object_name,
+                                detector_model=self.model_name,
+                                source=self.camera_name,
+                                arms=[self.arm_predefined])
+            if result[0] != 0:
+                self.log.error(f'Couldn\'t pick the object: {result[1]}')
+                self.finish_app()
+                return
+            self.cb_grasping_pick_finish(*result)
+            await self.move_backward(0.5)
 
             self.check_predefined_pose(self.predefined_pose_nav)
             await self.execute_predefined_pose(self.predefined_pose_nav)
             await self.sleep(0.5)
 
-            self.arrived = False
-            await self.nav.navigate_to_location( 
+            await run_until_finished(self.nav.navigate_to_location,
                 zone_name= self.location_name2,
                 callback_feedback = self.cb_nav_feedback,
                 callback_finish = self.cb_nav_finish,
-                wait=False,
+                active = self.nav.is_navigating,
             )
 
-            while not self.arrived:
-                await self.sleep(0.1)
-
             self.check_predefined_pose(self.predefined_pose_pre_pick)
             await self.execute_predefined_pose(self.predefined_pose_pre_pick)
             await self.sleep(0.5)
 
             self.log.info(f'Object position in the map: x: {self.point[0]} y: {self.point[1]}')
-            while self.retries < self.max_tries:
-                try:
-                    await self.nav.navigate_close_to_position(x=self.point[0], y =self.point[1], 
-                                                            pos_unit=POS_UNIT.METERS,
-                                                            wait=True)
-                except:
-                    self.retries += 1
-                else:
-                    self.log.info(f'Navigation succes!!')
-                    break
+            try:
+                await self.nav_retries.run('place',
+                                self.nav.navigate_close_to_position,
+                                x=self.point[0], y=self.point[1],
+                                pos_unit=POS_UNIT.METERS, wait=True)
+            except RetriesExhausted as e:
+                self.log.error(f'{e}')
+            else:
+                self.log.info(f'Navigation succes!!')
             self.log.info(f'Placing Object')
-            self.grasped = False
-            await self.gsp.place_object_with_point(point_to_place = self.point, 
+            await run_until_finished(self.gsp.place_object_with_point,
+                point_to_place = self.point, 
                 height_object = self.real_height, arm = self.arm_predefined,
                 callback_feedback = self.cb_grasping_place_feedback,
                 callback_finish = self.cb_grasping_place_finish,
-                wait=False,
             )
-            while (not self.grasped):
-                await self.sleep(0.1)
             self.log.info(f'Place Object with point finished...')
-            self.log.info('Moving backward 0.5 meters at 0.3 m/s')
-            await self.motion.move_linear(distance=-0.3, x_velocity=0.3)
-            while self.motion.is_moving(): await self.sleep(0.1)
-            self.log.info('Motion command finished'); self.log.info('')
+            await self.move_backward(0.3)
             self.check_predefined_pose(self.predefined_pose_home)
             await self.execute_predefined_pose(self.predefined_pose_home)
             await self.sleep(0.5)
@@ -300,6 +327,8 @@ class RayaApplication(RayaApplicationBase):
                 self.cameras.disable_color_camera(self.camera_name)
         except RayaNavNotNavigating:
             pass
+        if self.display is not None:
+            self.display.stop()
         self.log.info('Finish app called')
 
 
@@ -1,6 +1,5 @@
 # Common Imports
 import json
-import cv2
 import argparse
 
 # Raya Imports
@@ -14,26 +13,38 @@ from raya.enumerations import POS_UNIT
 from raya.tools.image import show_image
 from raya.exceptions import RayaCVAlreadyEnabledType
 
+# Shared Imports
+from common.startup import concurrent_setup
+from common.display import annotate
+from common.tracker import ObjectTracker
+from common.detections import DetectionCache
+from common.completion import Completion, wait_first
+from common.retry import RetryBudget, RetriesExhausted
+
 
 class RayaApplication(RayaApplicationBase):
     async def setup(self):
         self.get_args()
-        self.retries = 0
         self.max_tries = 3
+        self.nav_retries = RetryBudget(max_tries=self.max_tries)
         self.detection = []
+        self.found = Completion()
+        self.tracker = ObjectTracker(on_birth=self.cb_object_tracked)
 
-        self.cameras: CamerasController = await self.enable_controller('cameras')
-        self.cv: CVController = await self.enable_controller('cv')
-        self.motion: MotionController = await self.enable_controller('motion')
-        self.nav: NavigationController = await self.enable_controller('navigation')
-
-        await self.cameras.enable_color_camera(self.camera_name)
-        
         self.log.info((f'Setting map: {self.map_name}. '
                        'Waiting for the robot to get localized'))
-        if not await self.nav.set_map(self.map_name, 
-                                      wait_localization=True, 
-                                      timeout=3.0):
+        startup = await concurrent_setup(self,
+                        controllers=['cameras', 'cv', 'motion', 'navigation'],
+                        color_cameras=[self.camera_name],
+                        map_name=self.map_name,
+                        wait_localization=True,
+                        timeout=3.0)
+        startup.log_timings(self.log)
+        self.cameras: CamerasController = startup['cameras']
+        self.cv: CVController = startup['cv']
+        self.motion: MotionController = startup['motion']
+        self.nav: NavigationController = startup['navigation']
+        if not startup.localized:
             self.log.info(f'Robot couldn\'t localize itself')
             self.finish_app()
         else:
@@ -55,6 +66,7 @@ class RayaApplication(RayaApplicationBase):
 
 
 
+        self.detections = DetectionCache(self.detector)
         self.log.info('Model and camera enabled')
                 
         # Create listeners
@@ -65,45 +77,36 @@ class RayaApplication(RayaApplicationBase):
 
     async def loop(self):
         self.log.info(f'Looking for object {self.object_name}')
-        await self.motion.rotate(angle=-90.0, angular_velocity=10.0, wait=False)
-        await self.detector.find_objects([self.object_name], callback=self.cb_object_detected)
-
-        while (not self.detection) and (self.motion.is_moving()):
-            await self.sleep(0.1)
-        self.detector.cancel_find_objects()
+        rotation = Completion()
+        await self.motion.rotate(angle=-90.0, angular_velocity=10.0,
+                                 callback=rotation.finish, wait=False)
+        # A track is born once the object was seen in several frames, which
+        # already verifies the detection
+        await wait_first(self.found, rotation)
         if self.motion.is_moving():
             await self.motion.cancel_motion()
 
-        if not self.detection:
-            self.log.error(f'Object {self.object_name} not found')
-            self.finish_app()
-            return
-
-        await self.sleep(0.5)
-        # VERIFY
-        self.detection = await self.detector.find_objects([self.object_name], wait=True, timeout=0.5)
-        if not self.detection:
+        if not self.found.done():
             self.log.error(f'Object {self.object_name} not found')
             self.finish_app()
             return
 
+        self.detection = [self.tracker_target.as_detection()]
         obj_x = self.detection[0]['center_point_map'][0]
         obj_y = self.detection[0]['center_point_map'][1]
 
         self.log.info(f'Object {self.object_name} found!!')
         self.log.info(f'Object position in the map: x: {obj_x} y: {obj_y}')
         
-        while self.retries < self.max_tries:
-            try:
-                await self.nav.navigate_close_to_position(x=obj_x, y=obj_y, 
-                                                        pos_unit=POS_UNIT.METERS,
-                                                        wait=True)
-            except:
-                self.retries += 1
-            else:
-                self.log.info(f'Navigation succes!!')
-                self.finish_app()
-                break
+        try:
+            await self.nav_retries.run(self.object_name,
+                            self.nav.navigate_close_to_position,
+                            x=obj_x, y=obj_y,
+                            pos_unit=POS_UNIT.METERS, wait=True)
+        except RetriesExhausted as e:
+            self.log.error(f'{e}')
+        else:
+            self.log.info(f'Navigation succes!!')
         self.finish_app()
         
 
@@ -115,22 +118,19 @@ class RayaApplication(RayaApplicationBase):
         self.log.info('Ra-Ya application finished')
 
     
-    def cb_object_detected(self, detection):
-        self.detection = detection
+    def cb_object_tracked(self, track):
+        if track.object_name == self.object_name and not self.found.done():
+            self.tracker_target = track
+            self.found.finish()
 
 
     def callback_color_frame(self, img):
-        detections = self.detector.get_current_detections()
-        detection_names = []
-        for detection in detections:
-            img = cv2.rectangle(img, 
-                                (detection['x_min'], detection['y_min']), 
-                                (detection['x_max'], detection['y_max']), 
-                                (0, 255, 0), 
-                                2)
-            detection_names.append(detection['object_name'])
-        #self.log.info(f'Detections: {detection_names}')
-        show_image(img, 'Video from Gary\'s camera')
+        # The tracker only runs on new results of the detector
+        if self.detections.on_frame(img):
+            self.tracker.update(self.detections.detections,
+                                self.detections.stamp)
+        show_image(annotate(img, self.detections.detections),
+                   'Video from Gary\'s camera')
 
 
     def get_args(self):